@@ -3,8 +3,38 @@
 # agregar, actualizar, buscar, filtrar, ordenar y mostrar estadísticas.
 # ------------------------------------------------------------
 
+import argparse  # módulo para leer las opciones de la línea de comandos
+import atexit  # módulo para guardar las métricas al terminar el programa
+import bisect  # módulo para búsqueda binaria en listas ordenadas
+import contextlib  # módulo para armar el administrador de contexto del bloqueo
+import cProfile  # módulo para perfilar el programa completo (opcional)
 import csv  # módulo para leer/escribir CSV
+import functools  # módulo para envolver las funciones instrumentadas
+import heapq  # módulo para combinar listas ordenadas
+import inspect  # módulo para reconocer las funciones generadoras al instrumentarlas
+import io   # módulo para armar en memoria el texto a escribir
+import itertools  # módulo para acumular los inicios de los nombres
+import json  # módulo para guardar las estadísticas incrementales
+import math  # módulo para comparar números con tolerancia
+import mmap  # módulo para mapear la instantánea binaria en memoria al cargarla
 import os   # módulo para operaciones del sistema de archivos
+import re   # expresiones regulares para la búsqueda con un error de tipeo
+import struct  # módulo para el encabezado de la instantánea binaria
+import sys  # módulo para conocer el orden de bytes de la máquina
+import threading  # estado del bloqueo propio de cada hilo
+import time  # módulo para medir la duración de las funciones instrumentadas
+import tracemalloc  # módulo para medir la memoria reservada por las funciones instrumentadas
+import unicodedata  # módulo para quitar acentos al normalizar nombres
+import zlib  # módulo para la suma de verificación (CRC32) de la instantánea
+from array import array  # arreglos compactos de números para el almacén columnar
+from collections import OrderedDict  # orden de uso de las entradas de la caché de consultas
+from collections.abc import MutableMapping  # base de las vistas de fila del almacén columnar
+from concurrent.futures import ProcessPoolExecutor  # procesos para leer archivos muy grandes
+
+try:
+    import fcntl  # bloqueos entre procesos (no existe en Windows)
+except ImportError:
+    fcntl = None
 
 # Constantes
 # ----------------------------------------------------------------
@@ -17,25 +47,199 @@ COL_NOMBRE_PAIS = "NOMBRE"        # clave para el nombre del país en los diccio
 COL_POBLACION = "POBLACION"       # clave para la población
 COL_SUPERFICIE = "SUPERFICIE"     # clave para la superficie
 COL_CONTINENTE = "CONTINENTE"     # clave para el continente
+COLUMNAS_NUMERICAS = (COL_POBLACION, COL_SUPERFICIE)  # columnas con índice ordenado
+COLUMNAS = (COL_NOMBRE_PAIS, COL_POBLACION, COL_SUPERFICIE, COL_CONTINENTE)  # columnas del archivo
+PERCENTILES = (25, 50, 75, 90, 99)  # percentiles que se calculan en las estadísticas
+CONTINENTES_VALIDOS = ("america", "europa", "asia", "africa", "oceania")  # continentes aceptados
+
+# Las modificaciones de población y superficie se agregan a un registro de cambios
+# (un archivo aparte) y se vuelcan al CSV cuando el registro supera este tamaño
+TAMANIO_MAXIMO_REGISTRO_CAMBIOS = 1_000_000       # en bytes
+ENCABEZADO_REGISTRO_CAMBIOS = "#INODO"            # primera fila: archivo CSV al que se aplica el registro
+
+# Cantidad de países que se muestran por página en los listados
+TAMANIO_PAGINA = 20
+
+# Largo mínimo de una búsqueda por nombre para reintentarla admitiendo un error de tipeo:
+# con menos letras, un error alcanza para que coincida casi cualquier nombre
+LARGO_MINIMO_TOLERANCIA = 4
+
+# primeros_paises selecciona con un montículo mientras la página termine antes de esta
+# fracción de la lista; para páginas más profundas ordenar todo resulta más rápido
+PROPORCION_ORDEN_COMPLETO = 0.1
+
+# Si es True, los filtros del menú leen el archivo fila por fila en lugar de usar
+# el catálogo en memoria: solo se guarda la página que se está mostrando
+MODO_STREAMING = False
+
+# Con el almacén columnar, los archivos de este tamaño o más se leen por tramos que se
+# convierten directamente en columnas, repartidos entre varios procesos (None = uno por
+# núcleo; con uno solo no se crean procesos). La lista de diccionarios siempre se lee en un
+# solo proceso: armar cada diccionario en el proceso principal cuesta tanto como leer el
+# archivo, así que repartir la lectura no la acelera
+UMBRAL_LECTURA_PARALELA = 64 * 1024 * 1024        # en bytes
+PROCESOS_LECTURA = None
+TAMANIO_MINIMO_TRAMO = 4 * 1024 * 1024            # en bytes: tramos más chicos no compensan
+
+# Si es True, el catálogo se carga desde una instantánea binaria (gestion.paises.snapshot.bin)
+# que se genera junto al CSV; si la instantánea no corresponde al CSV actual se vuelve a crear.
+# También se activa con la opción --snapshot o con la variable de entorno GESTION_PAISES_SNAPSHOT=1
+VARIABLE_SNAPSHOT = "GESTION_PAISES_SNAPSHOT"
+USAR_SNAPSHOT = os.environ.get(VARIABLE_SNAPSHOT, "") not in ("", "0")
+MAGIA_SNAPSHOT = b"PAIS"                          # identifica el formato del archivo
+VERSION_SNAPSHOT = 2                              # 2: códigos de continente de 16 bits
+# encabezado: magia, versión, cantidad de continentes, cantidad de países, mtime_ns y tamaño
+# del CSV de origen, bytes de nombres, bytes de continentes y CRC32 del contenido
+ENCABEZADO_SNAPSHOT = struct.Struct("<4sHHqqqqqI4x")
+
+# Si es True, el catálogo en memoria se guarda por columnas (AlmacenPaises)
+# en lugar de un diccionario por país: ocupa mucha menos memoria por fila.
+# También se activa con la opción --columnar o con la variable de entorno GESTION_PAISES_COLUMNAR=1
+VARIABLE_COLUMNAR = "GESTION_PAISES_COLUMNAR"
+USAR_ALMACEN_COLUMNAR = os.environ.get(VARIABLE_COLUMNAR, "") not in ("", "0")
+MAXIMO_CONTINENTES_COLUMNAR = 65535               # códigos de 16 bits (la instantánea guarda la cantidad en 16 bits)
+
+# Caché de consultas: guarda los resultados de las búsquedas, filtros y ordenamientos
+# más recientes; cuando se supera alguno de los dos límites se descartan los menos usados
+TAMANIO_MAXIMO_CACHE_CONSULTAS = 256               # cantidad de consultas guardadas
+MEMORIA_MAXIMA_CACHE_CONSULTAS = 32 * 1024 * 1024  # en bytes (estimados)
+
+# Instrumentación (opcional): mide las funciones de lectura, búsqueda, filtrado, orden,
+# impresión y escritura. Se activa con la opción --metricas/--perfil o con estas variables
+# de entorno; desactivada, cada función medida solo consulta una bandera antes de ejecutarse
+VARIABLE_METRICAS = "GESTION_PAISES_METRICAS"     # ruta del archivo JSON de métricas
+VARIABLE_PERFIL = "GESTION_PAISES_PERFIL"         # ruta del archivo pstats de cProfile
+VARIABLE_MEMORIA = "GESTION_PAISES_MEMORIA"       # "1" para medir la memoria con tracemalloc
+# función -> tipo: "lectura" y "escritura" anotan además los bytes del archivo.
+# Lo completa el decorador _instrumentada en la definición de cada función medida
+FUNCIONES_INSTRUMENTADAS = {}
+
+# Catálogo en memoria: se carga una sola vez y se vuelve a leer
+# solamente cuando el archivo cambia (fecha de modificación o tamaño).
+# Cada índice se construye la primera vez que se usa (None = todavía no se construyó)
+_catalogo = {
+    "paises": None,                # lista de países cargada (None = todavía no se cargó)
+    "firma": None,                 # (mtime_ns, tamaño) del archivo al momento de la carga
+    "indice_nombres": None,        # nombre normalizado -> posición del país en la lista
+    "nombres_normalizados": None,  # nombre normalizado de cada posición de la lista
+    "indice_trigramas": None,      # trigrama del nombre normalizado -> posiciones que lo contienen
+    "indice_continentes": None,    # continente en minúsculas -> posiciones (en orden creciente)
+    "indices_ordenados": None,     # columna numérica -> (valores ordenados, posiciones en ese orden)
+}
+INDICES_CATALOGO = ("indice_nombres", "nombres_normalizados", "indice_trigramas",
+                    "indice_continentes", "indices_ordenados")
+
+# Caché de consultas: cualquier cambio del catálogo pasa a una generación nueva
+# y vacía la caché completa (todas las consultas guardadas son de la generación actual)
+_cache_consultas = {
+    "entradas": OrderedDict(),     # clave normalizada -> (resultado, bytes); la última es la más usada
+    "generacion": 0,               # se incrementa con cada cambio del catálogo en memoria
+    "bytes": 0,                    # memoria estimada de los resultados guardados
+    "aciertos": 0,
+    "fallos": 0,
+    "desalojos": 0,                # entradas descartadas por falta de lugar
+}
+
+# Bloqueo del archivo entre procesos: compartido para leer, exclusivo para escribir.
+# Se guarda el estado para poder anidar bloqueos; cada hilo tiene el suyo (y su propio
+# archivo .lock abierto), así que dos hilos del mismo proceso también se excluyen entre sí
+class _EstadoBloqueo(threading.local):
+    def __init__(self):
+        self.archivo = None        # archivo .lock abierto mientras haya un bloqueo tomado
+        self.nivel = 0             # cantidad de bloqueos anidados
+        self.exclusivo = False     # True si el bloqueo actual es exclusivo
+
+_bloqueo = _EstadoBloqueo()
+
+# Estado de la instrumentación
+_instrumentacion = {
+    "activa": False,
+    "metricas": {},                # función -> llamadas, tiempos, histograma, filas, bytes y memoria
+    "archivo_metricas": None,      # dónde guardar las métricas al terminar (None = no se guardan)
+    "perfil": None,                # cProfile.Profile en curso, si se pidió
+    "archivo_perfil": None,
+    "memoria": False,              # True si se mide la memoria con tracemalloc
+    "profundidad": 0,              # llamadas instrumentadas en curso (el pico de memoria se mide en la primera)
+    "espera": 0.0,                 # segundos esperando que el usuario presione Enter
+}
+
+# Estadísticas incrementales: acumulados que se actualizan con cada escritura
+# y se guardan junto al archivo CSV para no recalcularlos al reiniciar
+_resumen = {
+    "firma": None,                 # firma del archivo CSV a la que corresponden (None = sin calcular)
+    "cantidad": 0,
+    "totales": {},                 # columna numérica -> suma de valores
+    "cuadrados": {},               # columna numérica -> suma de los cuadrados de los valores
+    "continentes": {},             # continente -> {"cantidad", "poblacion_total", "superficie_total"}
+    "pais_mayor_poblacion": None,
+    "pais_menor_poblacion": None,
+    "distribucion": None,          # columna numérica -> mínimo, máximo, mediana y percentiles (None = sin calcular)
+}
+
+
+def _instrumentada(tipo):
+    """ Decorador de las funciones que mide la instrumentación. Se aplica una sola vez, al definir
+    la función, así que también miden las referencias tomadas antes de activarla (por ejemplo,
+    'from GestionDatosPaises import buscar_pais'). Desactivada, solo consulta una bandera. """
+    def decorar(funcion):
+        nombre = funcion.__name__
+        FUNCIONES_INSTRUMENTADAS[nombre] = tipo
+        if inspect.isgeneratorfunction(funcion):
+            @functools.wraps(funcion)
+            def generador(*args, **kwargs):
+                if not _instrumentacion["activa"]:
+                    return funcion(*args, **kwargs)
+                return _generador_medido(funcion, tipo, args, kwargs)
+            return generador
+        
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _instrumentacion["activa"]:
+                return funcion(*args, **kwargs)
+            return _llamada_medida(funcion, tipo, args, kwargs)
+        return envoltura
+    return decorar
+
+def leer_teclado(mensaje=""):
+    """ input() del programa: con la instrumentación activa acumula el tiempo que se espera
+    al usuario, para descontarlo de las funciones medidas. """
+    if not _instrumentacion["activa"]:
+        return input(mensaje)
+    inicio = time.perf_counter()
+    try:
+        return input(mensaje)
+    finally:
+        _instrumentacion["espera"] += time.perf_counter() - inicio
 
 
 # Funciones auxiliares
 # ----------------------------------------------------------------
-def mostrar_listado_paises(paises):
-    """ Muestra el catálogo de paises."""
-    if len(paises) > 0:                        #verifica si hay elementos en la lista
-        mostrar_catalogo_titulo()              # muestra el encabezado del catálogo
-        for pais in paises:                    # recorre cada país en la lista
-            # imprime cada campo con formato: nombre, población, superficie, continente
-            print("{:<25} {:>10} {:>17} {:>12}".format(
-                pais[COL_NOMBRE_PAIS].capitalize(), 
-                pais[COL_POBLACION],
-                pais[COL_SUPERFICIE], 
-                pais[COL_CONTINENTE].capitalize()))
-    else:
+@_instrumentada("impresion")
+def mostrar_listado_paises(paises, tamanio_pagina=TAMANIO_PAGINA):
+    """ Muestra el catálogo de paises de a páginas. Acepta una lista o un generador.
+    Devuelve la cantidad de países mostrados. """
+    cantidad = 0
+    for pais in paises:                        # recorre cada país (sin necesitar la lista completa)
+        if cantidad == 0:
+            mostrar_catalogo_titulo()          # muestra el encabezado del catálogo
+        elif tamanio_pagina and cantidad % tamanio_pagina == 0:
+            # fin de página: solo se pregunta si queda al menos un país por mostrar
+            respuesta = leer_teclado("Presione Enter para ver más resultados o 'q' para terminar...")
+            if respuesta.strip().lower() == "q":
+                break
+        # imprime cada campo con formato: nombre, población, superficie, continente
+        print("{:<25} {:>10} {:>17} {:>12}".format(
+            pais[COL_NOMBRE_PAIS].capitalize(), 
+            pais[COL_POBLACION],
+            pais[COL_SUPERFICIE], 
+            pais[COL_CONTINENTE].capitalize()))
+        cantidad += 1
+    
+    if cantidad == 0:
         print("No existen resultados.")         # mensaje si no hay países
     
     mostrar_y_esperar_tecla()                   # pausa para que el usuario vea el listado
+    return cantidad
 
 def validar_entero_mayor_que_cero(valor):
     """ Valida que el valor sea un entero mayor que cero. """
@@ -52,7 +256,7 @@ def dibujar_linea(separador="-", longitud=70):
 def mostrar_y_esperar_tecla(mensaje=""):
     """ Muestra un mensaje y espera a que el usuario presione Enter. """
     print(mensaje)                               
-    input("Presione Enter para continuar...")    
+    leer_teclado("Presione Enter para continuar...")    
 
 def mostrar_titulo_opcion(mensaje):
     """ Muestra un título de opción en pantalla. """
@@ -82,7 +286,7 @@ def mostrar_menu():
         print("6. Mostrar estadísticas")
         print("7. Salir")
           
-        opcion = input("Seleccione una opción (1-7): ").strip()  
+        opcion = leer_teclado("Seleccione una opción (1-7): ").strip()  
         match opcion:
             case "1":
                 ingresar_paises()                  
@@ -102,44 +306,227 @@ def mostrar_menu():
             case _:
                 mostrar_y_esperar_tecla("Opción no válida. Por favor, seleccione una opción del 1 al 7.")
 
+def normalizar_nombre(nombre):
+    """ Normaliza un nombre para compararlo: sin espacios extremos, sin mayúsculas y sin acentos. """
+    nombre = nombre.strip().casefold()
+    if nombre.isascii():                        # caso más común: no hay acentos que quitar
+        return nombre
+    descompuesto = unicodedata.normalize("NFKD", nombre)   # separa letras y acentos ("ó" -> "o" + "´")
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+@_instrumentada("consulta")
 def buscar_pais(paises, pais_a_buscar):
     """Busca un pais en la lista de paises. Devuelve el pais si lo encuentra, o None si no. """
-    busqueda = pais_a_buscar.lower()
-    for pais in paises:                         # recorre lista de diccionarios
-        if busqueda == pais[COL_NOMBRE_PAIS].lower():
+    busqueda = normalizar_nombre(pais_a_buscar)
+    if paises is _catalogo["paises"]:           # catálogo en memoria: búsqueda O(1) en el índice
+        posicion = _indice("indice_nombres").get(busqueda)
+        return None if posicion is None else paises[posicion]
+    
+    for pais in paises:                         # otra lista: recorre lista de diccionarios
+        if busqueda == normalizar_nombre(pais[COL_NOMBRE_PAIS]):
             return pais
         
     return None                                 # devuelve None si no encontró
 
-def buscar_paises(paises, texto_a_buscar):
-    """Busca un pais en la lista de paises. Devuelve el pais si lo encuentra, o None si no. """
-    busqueda = texto_a_buscar.lower()
-    resultados = []
-    for pais in paises:                         
-        if  busqueda == pais[COL_NOMBRE_PAIS].lower() or \
-            busqueda in pais[COL_NOMBRE_PAIS].lower():
-            resultados.append(pais)
+def trigramas(texto):
+    """ Devuelve el conjunto de subcadenas de 3 caracteres del texto. """
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+def _contiene_con_un_error(texto, patron):
+    """ Indica si el patrón aparece en el texto con a lo sumo un error (distancia de edición 1). """
+    if patron in texto:
+        return True
+    # con un solo error, alguna de las dos mitades del patrón aparece intacta en el texto
+    mitad = len(patron) // 2
+    if patron[:mitad] not in texto and patron[mitad:] not in texto:
+        return False
+    return _expresion_con_un_error(patron).search(texto) is not None
+
+@functools.lru_cache(maxsize=256)
+def _expresion_con_un_error(patron):
+    """ Devuelve una expresión regular que encuentra el patrón con una letra de menos, una
+    cambiada o una de más (todas las variantes a distancia de edición 1). La búsqueda de
+    las variantes la hace el módulo re, mucho más rápido que comparar letra por letra. """
+    variantes = set()
+    for i in range(len(patron) + 1):
+        variantes.add(re.escape(patron[:i]) + "." + re.escape(patron[i:]))            # una de más
+        if i < len(patron):
+            variantes.add(re.escape(patron[:i]) + "." + re.escape(patron[i + 1:]))    # una cambiada
+            variantes.add(re.escape(patron[:i] + patron[i + 1:]))                     # una de menos
+    return re.compile("|".join(sorted(variantes)), re.DOTALL)
+
+def _candidatos_por_trigramas(busqueda, tolerar_errores=False):
+    """ Devuelve las posiciones del catálogo que pueden contener la búsqueda (ya normalizada). """
+    trigramas_busqueda = trigramas(busqueda)
+    indice = _indice("indice_trigramas")
+    
+    if not tolerar_errores:
+        if not trigramas_busqueda:                  # búsqueda de menos de 3 letras: no hay filtro
+            return range(len(_catalogo["paises"]))
+        listas = []
+        for trigrama in trigramas_busqueda:
+            posiciones = indice.get(trigrama)
+            if posiciones is None:                  # un trigrama ausente descarta todo
+                return []
+            listas.append(posiciones)
+        listas.sort(key=len)                        # se intersecta empezando por la lista más corta
+        candidatos = set(listas[0])
+        for posiciones in listas[1:]:
+            candidatos.intersection_update(posiciones)
+            if not candidatos:
+                break
+        return sorted(candidatos)
+    
+    # con un solo error, alguna de las dos mitades de la búsqueda aparece intacta en el nombre
+    # (como en _contiene_con_un_error): con mitades de 3 letras o más se buscan en el índice
+    mitad = len(busqueda) // 2
+    if mitad < 3:                                   # menos de 6 letras: no hay filtro
+        return range(len(_catalogo["paises"]))
+    candidatos = set()
+    for parte in (busqueda[:mitad], busqueda[mitad:]):
+        candidatos.update(_candidatos_por_trigramas(parte))
+    
+    # además, un error cambia como mucho 3 trigramas de la búsqueda: el nombre debe tener el resto
+    minimo = len(trigramas_busqueda) - 3
+    if minimo > 0 and candidatos:
+        apariciones = dict.fromkeys(candidatos, 0)
+        for trigrama in trigramas_busqueda:
+            for posicion in indice.get(trigrama, ()):
+                if posicion in apariciones:
+                    apariciones[posicion] += 1
+        candidatos = [posicion for posicion, cantidad in apariciones.items() if cantidad >= minimo]
+    return sorted(candidatos)
+
+@_instrumentada("consulta")
+def buscar_paises(paises, texto_a_buscar, limite=None, ignorar_acentos=False, tolerar_errores=False):
+    """Busca los paises cuyo nombre contiene el texto. Devuelve primero la coincidencia exacta,
+    luego los que empiezan con el texto y después el resto, hasta 'limite' resultados. """
+    if ignorar_acentos:
+        busqueda = normalizar_nombre(texto_a_buscar)
+        preparar = normalizar_nombre                # sin mayúsculas ni acentos
+    else:
+        busqueda = texto_a_buscar.lower()
+        preparar = str.lower                        # solo sin mayúsculas
+    
+    nombres = None                                  # nombres ya preparados, si están disponibles
+    if paises is _catalogo["paises"]:               # catálogo en memoria: usa el índice de trigramas
+        posiciones = _candidatos_por_trigramas(normalizar_nombre(texto_a_buscar), tolerar_errores)
+        if ignorar_acentos:
+            nombres = _indice("nombres_normalizados")
+    else:
+        posiciones = range(len(paises))             # otra lista: recorre todos los países
+    
+    exactos, prefijos, contienen, aproximados = [], [], [], []
+    for posicion in posiciones:
+        pais = paises[posicion]
+        nombre = preparar(pais[COL_NOMBRE_PAIS]) if nombres is None else nombres[posicion]
+        if nombre == busqueda:
+            exactos.append(pais)
+        elif nombre.startswith(busqueda):
+            prefijos.append(pais)
+        elif busqueda in nombre:
+            contienen.append(pais)
+        elif tolerar_errores and _contiene_con_un_error(nombre, busqueda):
+            aproximados.append(pais)
         
-    return resultados
+    resultados = exactos + prefijos + contienen + aproximados
+    return resultados if limite is None else resultados[:limite]
+
+def _en_rango(valor, rango):
+    """ Indica si el valor está dentro del rango (desde, hasta); None en un extremo lo deja abierto. """
+    desde, hasta = rango
+    return (desde is None or valor >= desde) and (hasta is None or valor <= hasta)
+
+def _posiciones_en_rango(columna, rango):
+    """ Devuelve, por búsqueda binaria, las posiciones del catálogo con la columna dentro del rango. """
+    valores, posiciones = _indice("indices_ordenados")[columna]
+    desde, hasta = rango
+    inicio = 0 if desde is None else bisect.bisect_left(valores, desde)
+    fin = len(valores) if hasta is None else bisect.bisect_right(valores, hasta)
+    return posiciones[inicio:fin]
+
+@_instrumentada("consulta")
+def filtrar_paises_por_rangos(paises, poblacion=None, superficie=None, continente=None):
+    """ Devuelve los países que cumplen todos los filtros indicados, en el orden de la lista.
+    poblacion y superficie son tuplas (desde, hasta) donde None deja el extremo abierto. """
+    rangos = {}                                     # columna numérica -> rango pedido
+    if poblacion is not None:
+        rangos[COL_POBLACION] = poblacion
+    if superficie is not None:
+        rangos[COL_SUPERFICIE] = superficie
+    continente = None if continente is None else continente.lower()
+    
+    if paises is not _catalogo["paises"]:           # otra lista: recorre todos los países
+        return [pais for pais in paises
+                if (continente is None or pais[COL_CONTINENTE].lower() == continente)
+                and all(_en_rango(pais[columna], rango) for columna, rango in rangos.items())]
+    
+    # catálogo en memoria: se parte del índice que devuelve menos posiciones
+    # y el resto de los filtros se verifica solo sobre esas filas
+    candidatas = []
+    for columna, rango in rangos.items():
+        candidatas.append((columna, _posiciones_en_rango(columna, rango)))
+    if continente is not None:
+        candidatas.append((COL_CONTINENTE, _indice("indice_continentes").get(continente, [])))
+    if not candidatas:                              # sin filtros: todos los países
+        return list(paises)
+    
+    columna_base, posiciones = min(candidatas, key=lambda candidata: len(candidata[1]))
+    resultado = []
+    for posicion in sorted(posiciones):             # orden original del catálogo
+        pais = paises[posicion]
+        if continente is not None and columna_base != COL_CONTINENTE and \
+           pais[COL_CONTINENTE].lower() != continente:
+            continue
+        if all(_en_rango(pais[columna], rango) for columna, rango in rangos.items() if columna != columna_base):
+            resultado.append(pais)
+    return resultado
+
+@_instrumentada("consulta")
+def filtrar_catalogo(poblacion=None, superficie=None, continente=None):
+    """ Filtra el catálogo con los índices en memoria, o leyendo el archivo fila por fila
+    si MODO_STREAMING está activo (en ese caso devuelve un generador). La lista devuelta
+    puede venir de la caché de consultas: no debe modificarse. """
+    if MODO_STREAMING:
+        return iterar_paises_desde_archivo(poblacion=poblacion, superficie=superficie, continente=continente)
+    poblacion = None if poblacion is None else tuple(poblacion)     # clave de la caché
+    superficie = None if superficie is None else tuple(superficie)
+    paises = obtener_paises()                       # antes de la caché: detecta cambios del archivo
+    clave = ("filtro", poblacion, superficie, None if continente is None else continente.lower())
+    return _consulta_en_cache(clave, lambda: filtrar_paises_por_rangos(
+        paises, poblacion=poblacion, superficie=superficie, continente=continente))
+
+@_instrumentada("consulta")
+def iterar_catalogo_ordenado(criterios):
+    """ Recorre el catálogo en el orden de los criterios (columna, desc). Con una sola columna
+    numérica avanza por su índice ordenado a medida que se pide cada país; si no, ordena. """
+    paises = obtener_paises()
+    criterios = list(criterios)
+    if len(criterios) == 1 and criterios[0][0] in COLUMNAS_NUMERICAS:
+        for posicion in _posiciones_ordenadas(*criterios[0]):
+            yield paises[posicion]
+    else:
+        yield from ordenar_catalogo(criterios)
+
+def ordenar_catalogo(criterios):
+    """ Devuelve el catálogo ordenado por los criterios (columna, desc). La lista puede venir
+    de la caché de consultas: no debe modificarse. """
+    paises = obtener_paises()
+    criterios = tuple((columna, bool(desc)) for columna, desc in criterios)
+    return _consulta_en_cache(("orden", criterios), lambda: ordenar_lista_paises(paises, criterios))
 
 def filtrar_paises_por_continente():
     """ Filtra los países por continente. """
     mostrar_titulo_opcion("Filtar paises por continente")
-    continente_a_filtrar = input("Ingrese el continente para filtrar: ").strip()  
-    paises = leer_paises_desde_archivo()         # carga todos los países desde el archivo
-    
-    paises_filtrados = []
-    for pais in paises:                           # compara continente (case-insensitive)
-        if pais[COL_CONTINENTE].lower() == continente_a_filtrar.lower():
-            paises_filtrados.append(pais)         # añade a la lista filtrada
-            
+    continente_a_filtrar = leer_teclado("Ingrese el continente para filtrar: ").strip()  
+    paises_filtrados = filtrar_catalogo(continente=continente_a_filtrar)  # índice o lectura por filas
     mostrar_listado_paises(paises_filtrados)      # muestra resultados
     
 def filtrar_paises_por_rango_poblacion():
     """ Filtra los países por rango de poblacion. """
     mostrar_titulo_opcion("Filtar paises por rango de poblacion")
-    desde = input("Ingrese el valor mínimo de población: ").strip()  # valor mínimo
-    hasta = input("Ingrese el valor máximo de población: ").strip()  # valor máximo
+    desde = leer_teclado("Ingrese el valor mínimo de población: ").strip()  # valor mínimo
+    hasta = leer_teclado("Ingrese el valor máximo de población: ").strip()  # valor máximo
     
     # valida que ambos sean enteros >= 0
     if not (validar_entero_mayor_igual_que_cero(desde) and validar_entero_mayor_igual_que_cero(hasta)):
@@ -153,20 +540,14 @@ def filtrar_paises_por_rango_poblacion():
         mostrar_y_esperar_tecla("El valor mínimo no puede ser mayor que el máximo.\n")
         return
     
-    paises = leer_paises_desde_archivo()          # carga datos
-    
-    paises_filtrados = []
-    for pais in paises:
-        if pais[COL_POBLACION] >= desde and pais[COL_POBLACION] <= hasta:
-            paises_filtrados.append(pais)         # añade si está en el rango
-            
+    paises_filtrados = filtrar_catalogo(poblacion=(desde, hasta))  # búsqueda binaria o lectura por filas
     mostrar_listado_paises(paises_filtrados)      # muestra resultados
     
 def filtrar_paises_por_rango_superficie():
     """ Filtra los países por rango de superficie. """
     mostrar_titulo_opcion("Filtar paises por rango de superficie")
-    desde = input("Ingrese el valor mínimo de superficie: ").strip()  # mínimo superficie
-    hasta = input("Ingrese el valor máximo de superficie: ").strip()  # máximo superficie
+    desde = leer_teclado("Ingrese el valor mínimo de superficie: ").strip()  # mínimo superficie
+    hasta = leer_teclado("Ingrese el valor máximo de superficie: ").strip()  # máximo superficie
     
     # validar valores numéricos
     if not (validar_entero_mayor_igual_que_cero(desde) and validar_entero_mayor_igual_que_cero(hasta)):
@@ -180,15 +561,42 @@ def filtrar_paises_por_rango_superficie():
         mostrar_y_esperar_tecla("El valor mínimo no puede ser mayor que el máximo.\n")
         return
     
-    paises = leer_paises_desde_archivo()          # leer archivo
-    
-    paises_filtrados = []
-    for pais in paises:
-        if pais[COL_SUPERFICIE] >= desde and pais[COL_SUPERFICIE] <= hasta:
-            paises_filtrados.append(pais)         # agrega si cumple rango
-            
+    paises_filtrados = filtrar_catalogo(superficie=(desde, hasta))  # búsqueda binaria o lectura por filas
     mostrar_listado_paises(paises_filtrados)      # mostrar lista filtrada
     
+def leer_rango(nombre_columna):
+    """ Pide un rango (desde, hasta) al usuario; Enter deja el extremo abierto. Devuelve None si es inválido. """
+    desde = leer_teclado(f"Ingrese el valor mínimo de {nombre_columna} (Enter = sin mínimo): ").strip()
+    hasta = leer_teclado(f"Ingrese el valor máximo de {nombre_columna} (Enter = sin máximo): ").strip()
+    
+    for valor in (desde, hasta):                  # valida los extremos ingresados
+        if valor != "" and not validar_entero_mayor_igual_que_cero(valor):
+            mostrar_y_esperar_tecla("Valores inválidos. Deben ser números enteros positivos.\n")
+            return None
+    
+    desde = int(desde) if desde != "" else None   # None = extremo abierto
+    hasta = int(hasta) if hasta != "" else None
+    if desde is not None and hasta is not None and desde > hasta:   # valida rango lógico
+        mostrar_y_esperar_tecla("El valor mínimo no puede ser mayor que el máximo.\n")
+        return None
+    return (desde, hasta)
+
+def filtrar_paises_combinado():
+    """ Filtra los países por continente, rango de población y rango de superficie a la vez. """
+    mostrar_titulo_opcion("Filtrar paises por continente, poblacion y superficie")
+    continente = leer_teclado("Ingrese el continente (Enter = todos): ").strip()
+    poblacion = leer_rango("población")
+    if poblacion is None:
+        return
+    superficie = leer_rango("superficie")
+    if superficie is None:
+        return
+    
+    paises_filtrados = filtrar_catalogo(poblacion=poblacion, superficie=superficie,
+                                        continente=continente or None)
+    mostrar_listado_paises(paises_filtrados)      # muestra resultados
+
+@_instrumentada("consulta")
 def ordenamiento_burbuja(lista, columna, desc=False):
     """ Ordena la lista usando el algoritmo burbuja según la columna indicada. """
     lista_ordenada = lista.copy()             # copia para no modificar original
@@ -209,68 +617,1738 @@ def ordenamiento_burbuja(lista, columna, desc=False):
                 
     return lista_ordenada                             # devuelve lista ordenada
 
+@_instrumentada("consulta")
+def ordenar_lista_paises(paises, criterios):
+    """ Ordena la lista de países por una o más columnas en O(n log n).
+    criterios es una lista de tuplas (columna, desc); los valores None quedan siempre al final. """
+    lista_ordenada = list(paises)             # copia para no modificar original
+    
+    # sort() es estable: se ordena desde la última clave hacia la primera
+    # y cada pasada conserva el orden logrado por las claves secundarias
+    for columna, desc in reversed(criterios):
+        if desc:
+            # con reverse=True los valores válidos (True) quedan antes que los None (False)
+            lista_ordenada.sort(key=lambda pais: (pais[columna] is not None, pais[columna]), reverse=True)
+        else:
+            # los None (True) quedan después de los valores válidos (False)
+            lista_ordenada.sort(key=lambda pais: (pais[columna] is None, pais[columna]))
+            
+    return lista_ordenada                             # devuelve lista ordenada
+
+def _clave_orden(criterios):
+    """ Devuelve una función que arma la clave (tupla) de un país con el mismo orden que
+    ordenar_lista_paises: los None quedan siempre al final y las columnas numéricas descendentes
+    se niegan. Devuelve None si hay un criterio descendente sobre textos (no se pueden negar). """
+    if any(desc and columna not in COLUMNAS_NUMERICAS for columna, desc in criterios):
+        return None
+    
+    def clave(pais):
+        partes = []
+        for columna, desc in criterios:
+            valor = pais[columna]
+            if valor is None:
+                partes += (True, 0)                   # el None va después de cualquier valor válido
+            else:
+                partes += (False, -valor if desc else valor)
+        return tuple(partes)
+    return clave
+
+def _posiciones_ordenadas(columna, desc):
+    """ Recorre las posiciones del catálogo en el orden de la columna numérica usando su índice
+    ordenado, sin ordenar nada. Ante empates respeta el orden del archivo (como sort()). """
+    valores, posiciones = _indice("indices_ordenados")[columna]
+    if not desc:
+        yield from posiciones
+        return
+    fin = len(valores)
+    while fin > 0:                                    # de mayor a menor, de a grupos de valores iguales
+        inicio = bisect.bisect_left(valores, valores[fin - 1], 0, fin)
+        yield from posiciones[inicio:fin]             # dentro del grupo, en orden del archivo
+        fin = inicio
+
+@_instrumentada("consulta")
+def primeros_paises(paises, criterios, cantidad, desde=0):
+    """ Devuelve los países de las posiciones [desde, desde + cantidad) del orden indicado por los
+    criterios (columna, desc), sin ordenar toda la lista: en el catálogo con una sola columna
+    numérica recorre su índice ordenado; si no, selecciona con un montículo en O(n log k)
+    mientras desde + cantidad sea una parte chica de la lista (si no, ordena todo). """
+    if cantidad <= 0:
+        return []
+    criterios = list(criterios)
+    if (paises is _catalogo["paises"] and len(criterios) == 1
+            and criterios[0][0] in COLUMNAS_NUMERICAS):
+        seleccion = itertools.islice(_posiciones_ordenadas(*criterios[0]), desde, desde + cantidad)
+        return [paises[posicion] for posicion in seleccion]
+    
+    clave = _clave_orden(criterios)
+    if clave is None:                                 # descendente por texto: orden completo
+        return ordenar_lista_paises(paises, criterios)[desde:desde + cantidad]
+    if desde + cantidad >= len(paises) * PROPORCION_ORDEN_COMPLETO:
+        # página profunda: el montículo ya no ahorra nada y un sort() completo es más rápido
+        return sorted(paises, key=clave)[desde:desde + cantidad]
+    # nsmallest equivale a sorted(...)[:k] (es estable) pero solo mantiene k elementos
+    return heapq.nsmallest(desde + cantidad, paises, key=clave)[desde:]
+
+def percentil(valores_ordenados, porcentaje):
+    """ Devuelve el percentil de una lista ordenada, interpolando entre los dos valores más cercanos. """
+    if not valores_ordenados:
+        return None
+    posicion = (len(valores_ordenados) - 1) * porcentaje / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(valores_ordenados) - 1)
+    fraccion = posicion - inferior
+    return valores_ordenados[inferior] + (valores_ordenados[superior] - valores_ordenados[inferior]) * fraccion
+
+@_instrumentada("consulta")
+def calcular_estadisticas(paises):
+    """ Calcula en una sola pasada las estadísticas de la lista de países y las devuelve en un diccionario:
+    cantidad, resumen de población y superficie (total, promedio, desviación, mínimo, máximo, mediana
+    y percentiles), densidad, países con mayor y menor población, y agregados por continente. """
+    cantidad = 0
+    totales = {COL_POBLACION: 0, COL_SUPERFICIE: 0}
+    medias = {COL_POBLACION: 0.0, COL_SUPERFICIE: 0.0}     # promedio y suma de cuadrados de las
+    cuadrados = {COL_POBLACION: 0.0, COL_SUPERFICIE: 0.0}  # diferencias (método de Welford)
+    pais_mayor_pob = None
+    pais_menor_pob = None
+    continentes = {}
+    usar_indices = paises is _catalogo["paises"]           # el catálogo ya tiene los valores ordenados
+    valores = {COL_POBLACION: [], COL_SUPERFICIE: []}
+    
+    for pais in paises:                                    # única pasada sobre los países
+        cantidad += 1
+        for columna in COLUMNAS_NUMERICAS:
+            valor = pais[columna]
+            totales[columna] += valor
+            diferencia = valor - medias[columna]
+            medias[columna] += diferencia / cantidad
+            cuadrados[columna] += diferencia * (valor - medias[columna])
+            if not usar_indices:
+                valores[columna].append(valor)
+        
+        poblacion = pais[COL_POBLACION]
+        if pais_mayor_pob is None or poblacion > pais_mayor_pob[COL_POBLACION]:
+            pais_mayor_pob = pais
+        if pais_menor_pob is None or poblacion < pais_menor_pob[COL_POBLACION]:
+            pais_menor_pob = pais
+        
+        grupo = continentes.get(pais[COL_CONTINENTE])
+        if grupo is None:
+            grupo = continentes[pais[COL_CONTINENTE]] = {"cantidad": 0, "poblacion_total": 0, "superficie_total": 0}
+        grupo["cantidad"] += 1
+        grupo["poblacion_total"] += poblacion
+        grupo["superficie_total"] += pais[COL_SUPERFICIE]
+    
+    estadisticas = {
+        "cantidad": cantidad,
+        "pais_mayor_poblacion": pais_mayor_pob,
+        "pais_menor_poblacion": pais_menor_pob,
+        "densidad": totales[COL_POBLACION] / totales[COL_SUPERFICIE] if totales[COL_SUPERFICIE] else None,
+        "continentes": continentes,
+    }
+    for columna in COLUMNAS_NUMERICAS:
+        if usar_indices:
+            ordenados = _indice("indices_ordenados")[columna][0]
+        else:
+            ordenados = sorted(valores[columna])
+        estadisticas[columna] = {
+            "total": totales[columna],
+            "promedio": totales[columna] / cantidad if cantidad else None,
+            "desviacion": (cuadrados[columna] / cantidad) ** 0.5 if cantidad else None,
+            "minimo": ordenados[0] if ordenados else None,
+            "maximo": ordenados[-1] if ordenados else None,
+            "mediana": percentil(ordenados, 50),
+            "percentiles": {porcentaje: percentil(ordenados, porcentaje) for porcentaje in PERCENTILES},
+        }
+    
+    for grupo in continentes.values():                     # promedios y densidad por continente
+        grupo["poblacion_promedio"] = grupo["poblacion_total"] / grupo["cantidad"]
+        grupo["superficie_promedio"] = grupo["superficie_total"] / grupo["cantidad"]
+        grupo["densidad"] = grupo["poblacion_total"] / grupo["superficie_total"] if grupo["superficie_total"] else None
+    
+    return estadisticas
+
+
+# ----------------------------------------------------------------
+# Almacén columnar de países
+# ----------------------------------------------------------------
+
+class AlmacenPaises:
+    """ Lista de países guardada por columnas: enteros de 64 bits para población y superficie,
+    un código por continente y todos los nombres juntos en un único bloque de bytes. """
+    
+    def __init__(self, paises=()):
+        self._nombres = bytearray()                 # nombres en UTF-8, uno detrás de otro
+        self._inicios = array("q", [0])             # el nombre i ocupa _nombres[_inicios[i]:_inicios[i + 1]]
+        self._poblaciones = array("q")
+        self._superficies = array("q")
+        self._codigos_continente = array("H")       # código de continente de cada país (16 bits)
+        self._continentes = []                      # código -> texto del continente
+        self._codigo_por_continente = {}            # texto del continente -> código
+        for pais in paises:
+            self.append(pais)
+    
+    @classmethod
+    def desde_columnas(cls, nombres, inicios, poblaciones, superficies, codigos_continente, continentes):
+        """ Arma un almacén directamente a partir de sus columnas (por ejemplo, leídas de una instantánea). """
+        almacen = cls()
+        almacen._nombres = nombres
+        almacen._inicios = inicios
+        almacen._poblaciones = poblaciones
+        almacen._superficies = superficies
+        almacen._codigos_continente = codigos_continente
+        almacen._continentes = list(continentes)
+        almacen._codigo_por_continente = {continente: codigo for codigo, continente in enumerate(continentes)}
+        return almacen
+    
+    def columnas(self):
+        """ Devuelve las columnas internas en el mismo orden que recibe desde_columnas. """
+        return (self._nombres, self._inicios, self._poblaciones, self._superficies,
+                self._codigos_continente, self._continentes)
+    
+    def __len__(self):
+        return len(self._poblaciones)
+    
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [VistaPais(self, i) for i in range(*posicion.indices(len(self)))]
+        if posicion < 0:
+            posicion += len(self)
+        if not 0 <= posicion < len(self):
+            raise IndexError("posición fuera del almacén de países")
+        return VistaPais(self, posicion)
+    
+    def __iter__(self):
+        for posicion in range(len(self)):
+            yield VistaPais(self, posicion)
+    
+    def _codigo_continente(self, continente):
+        """ Devuelve el código del continente, registrándolo si es nuevo. """
+        codigo = self._codigo_por_continente.get(continente)
+        if codigo is None:
+            codigo = len(self._continentes)
+            if codigo >= MAXIMO_CONTINENTES_COLUMNAR:
+                raise ValueError(f"El almacén columnar admite hasta {MAXIMO_CONTINENTES_COLUMNAR:,} "
+                                 f"continentes distintos.")
+            self._continentes.append(continente)
+            self._codigo_por_continente[continente] = codigo
+        return codigo
+    
+    def append(self, pais):
+        """ Agrega al final un país dado como diccionario (o vista de fila). """
+        self._nombres += pais[COL_NOMBRE_PAIS].encode(ENCODING)
+        self._inicios.append(len(self._nombres))
+        self._poblaciones.append(pais[COL_POBLACION])
+        self._superficies.append(pais[COL_SUPERFICIE])
+        self._codigos_continente.append(self._codigo_continente(pais[COL_CONTINENTE]))
+    
+    def extender_columnas(self, nombres, poblaciones, superficies, continentes):
+        """ Agrega al final muchos países dados como columnas (listas o arrays del mismo largo). """
+        codificados = [nombre.encode(ENCODING) for nombre in nombres]
+        base = len(self._nombres)
+        self._nombres += b"".join(codificados)
+        self._inicios.extend(base + fin for fin in itertools.accumulate(map(len, codificados)))
+        self._poblaciones.extend(poblaciones)
+        self._superficies.extend(superficies)
+        self._codigos_continente.extend(self._codigo_continente(continente) for continente in continentes)
+    
+    def valor(self, posicion, columna):
+        """ Devuelve el valor de una columna para la fila indicada. """
+        if columna == COL_POBLACION:
+            return self._poblaciones[posicion]
+        if columna == COL_SUPERFICIE:
+            return self._superficies[posicion]
+        if columna == COL_CONTINENTE:
+            return self._continentes[self._codigos_continente[posicion]]
+        if columna == COL_NOMBRE_PAIS:
+            return self._nombres[self._inicios[posicion]:self._inicios[posicion + 1]].decode(ENCODING)
+        raise KeyError(columna)
+    
+    def valores_columna(self, columna):
+        """ Devuelve en una lista los valores de una columna para todas las filas, sin armar vistas. """
+        if columna == COL_POBLACION:
+            return self._poblaciones.tolist()
+        if columna == COL_SUPERFICIE:
+            return self._superficies.tolist()
+        if columna == COL_CONTINENTE:
+            return [self._continentes[codigo] for codigo in self._codigos_continente]
+        if columna == COL_NOMBRE_PAIS:
+            nombres = self._nombres
+            return [nombres[inicio:fin].decode(ENCODING) for inicio, fin in zip(self._inicios, self._inicios[1:])]
+        raise KeyError(columna)
+    
+    def asignar(self, posicion, columna, valor):
+        """ Cambia el valor de una columna para la fila indicada. """
+        if columna == COL_POBLACION:
+            self._poblaciones[posicion] = valor
+        elif columna == COL_SUPERFICIE:
+            self._superficies[posicion] = valor
+        elif columna == COL_CONTINENTE:
+            self._codigos_continente[posicion] = self._codigo_continente(valor)
+        elif columna == COL_NOMBRE_PAIS:
+            # los nombres están empaquetados uno detrás de otro y no pueden cambiar de largo
+            raise TypeError("El nombre de un país no puede modificarse en el almacén columnar.")
+        else:
+            raise KeyError(columna)
+
+
+class VistaPais(MutableMapping):
+    """ Fila de un AlmacenPaises que se usa igual que el diccionario de un país. """
+    __slots__ = ("_almacen", "_posicion")
+    
+    def __init__(self, almacen, posicion):
+        self._almacen = almacen
+        self._posicion = posicion
+    
+    def __getitem__(self, columna):
+        return self._almacen.valor(self._posicion, columna)
+    
+    def __setitem__(self, columna, valor):
+        self._almacen.asignar(self._posicion, columna, valor)
+    
+    def __delitem__(self, columna):
+        raise TypeError("No se pueden quitar columnas de un país.")
+    
+    def __iter__(self):
+        return iter(COLUMNAS)
+    
+    def __len__(self):
+        return len(COLUMNAS)
+    
+    def __repr__(self):
+        return repr(dict(self))
+
 
 # ----------------------------------------------------------------
 # Funciones de manejo de archivos
 # ----------------------------------------------------------------
 
+def _ruta_bloqueo():
+    """ Devuelve la ruta del archivo que se usa para coordinar el acceso entre procesos. """
+    return os.path.splitext(FILE_NAME)[0] + ".lock"
+
+@contextlib.contextmanager
+def bloqueo_archivo(exclusivo=False):
+    """ Bloqueo asesor (fcntl.flock) del catálogo entre procesos: compartido para leer, de modo que
+    los lectores no se bloquean entre sí, o exclusivo para escribir. Se puede anidar dentro del
+    mismo hilo; si ya hay uno compartido y se pide exclusivo, se convierte mientras dure.
+    Donde no existe fcntl (Windows) no bloquea. """
+    if fcntl is None:
+        yield
+        return
+    
+    if _bloqueo.nivel == 0:
+        _bloqueo.archivo = open(_ruta_bloqueo(), mode="a")
+    anterior = _bloqueo.exclusivo
+    cambia = _bloqueo.nivel == 0 or (exclusivo and not anterior)
+    try:
+        if cambia:
+            fcntl.flock(_bloqueo.archivo.fileno(), fcntl.LOCK_EX if exclusivo else fcntl.LOCK_SH)
+            _bloqueo.exclusivo = exclusivo
+    except BaseException:
+        if _bloqueo.nivel == 0:
+            _bloqueo.archivo.close()
+            _bloqueo.archivo = None
+        raise
+    
+    _bloqueo.nivel += 1
+    try:
+        yield
+    finally:
+        _bloqueo.nivel -= 1
+        if _bloqueo.nivel == 0:                  # último nivel: libera y cierra
+            fcntl.flock(_bloqueo.archivo.fileno(), fcntl.LOCK_UN)
+            _bloqueo.archivo.close()
+            _bloqueo.archivo = None
+            _bloqueo.exclusivo = False
+        elif cambia:                                # vuelve al bloqueo compartido que había
+            fcntl.flock(_bloqueo.archivo.fileno(), fcntl.LOCK_SH)
+            _bloqueo.exclusivo = anterior
+
 def verificar_archivo():
-    """ Verifica si el archivo existe; si no, lo crea con el encabezado adecuado. """
+    """ Verifica si el archivo existe; si no, lo crea con el encabezado adecuado.
+    Si quedó un alta a medio escribir, devuelve el archivo a su estado anterior. """
     try:
+        if os.path.exists(_ruta_alta_pendiente()):
+            _deshacer_alta_pendiente()
         if not os.path.exists(FILE_NAME):         
-            with open(FILE_NAME, mode='w', encoding=ENCODING, newline='') as file:
-                # crea un escritor con los campos definidos y escribe el encabezado
-                writer = csv.DictWriter(file, fieldnames=[COL_NOMBRE_PAIS, COL_POBLACION, COL_SUPERFICIE, COL_CONTINENTE])
-                writer.writeheader()
+            with bloqueo_archivo(exclusivo=True):  # otro proceso podría estar creándolo
+                if not os.path.exists(FILE_NAME):
+                    with open(FILE_NAME, mode='w', encoding=ENCODING, newline='') as file:
+                        # crea un escritor con los campos definidos y escribe el encabezado
+                        writer = csv.DictWriter(file, fieldnames=[COL_NOMBRE_PAIS, COL_POBLACION, COL_SUPERFICIE, COL_CONTINENTE])
+                        writer.writeheader()
     except (OSError, IOError) as e:
         # lanza excepción con detalle si hay error en disco o sistema de archivos
         raise Exception(f"Ocurrió un error al verificar o crear el archivo: {e}")
 
-def leer_paises_desde_archivo():
-    """ Lee los paises desde el archivo y los devuelve como una lista de diccionarios. """
-    try:
-        verificar_archivo()                        # asegura que el archivo exista
-        with open(FILE_NAME, newline="", encoding=ENCODING) as file:
-            lector = csv.DictReader(file)          # lector que devuelve diccionarios
-            
-            paises = []
-            for fila in lector:                   # recorre cada fila del CSV
+def _ruta_alta_pendiente():
+    """ Devuelve la ruta del archivo que anota el tamaño del CSV mientras se le agregan filas. """
+    return os.path.splitext(FILE_NAME)[0] + ".alta.pendiente"
+
+def _deshacer_alta_pendiente():
+    """ Deshace un alta que quedó a medio escribir (el programa se cortó durante la escritura):
+    devuelve el archivo al tamaño anotado antes de escribir, así no queda una fila cortada. """
+    with bloqueo_archivo(exclusivo=True):             # espera a que termine un alta en curso
+        try:
+            with open(_ruta_alta_pendiente(), encoding=ENCODING) as archivo:
+                inodo, tamanio = (int(valor) for valor in archivo.read().split(","))
+        except FileNotFoundError:
+            return                                      # otro proceso ya la terminó o deshizo
+        except ValueError:
+            inodo = None                                # anotación cortada: el alta no llegó a escribir
+        try:
+            estado = os.stat(FILE_NAME)
+            if inodo == estado.st_ino and estado.st_size > tamanio:
+                os.truncate(FILE_NAME, tamanio)
+        except FileNotFoundError:
+            pass                                        # no hay archivo: se creará vacío
+        os.remove(_ruta_alta_pendiente())
+
+@_instrumentada("lectura")
+def _leer_paises(columnar=False):
+    """ Lee los países del archivo (con el registro de cambios aplicado); los errores se propagan
+    indicando el número de fila. En el almacén columnar, los archivos grandes se leen en paralelo. """
+    verificar_archivo()                            # asegura que el archivo exista
+    with bloqueo_archivo():                        # ningún proceso escribe mientras se lee
+        return _leer_paises_bloqueado(columnar)
+
+def _procesos_lectura():
+    """ Cantidad de procesos para la lectura en paralelo. """
+    return PROCESOS_LECTURA or os.cpu_count() or 1
+
+def _leer_paises_bloqueado(columnar):
+    """ Cuerpo de _leer_paises; se ejecuta con el bloqueo compartido tomado. """
+    if columnar and os.path.getsize(FILE_NAME) >= UMBRAL_LECTURA_PARALELA:
+        paises = _leer_paises_en_paralelo()
+        _aplicar_registro_cambios(paises)
+        return paises
+    
+    with open(FILE_NAME, newline="", encoding=ENCODING) as file:
+        lector = csv.DictReader(file)              # lector que devuelve diccionarios
+        
+        paises = AlmacenPaises() if columnar else []
+        for fila in lector:                       # recorre cada fila del CSV
+            try:
                 paises.append({
                     COL_NOMBRE_PAIS: fila[COL_NOMBRE_PAIS],
                     COL_POBLACION: int(fila[COL_POBLACION]),    # convierte población a entero
                     COL_SUPERFICIE: int(fila[COL_SUPERFICIE]),  # convierte superficie a entero
                     COL_CONTINENTE: fila[COL_CONTINENTE]        # continente como string               
                 })
-                
-            return paises                           # devuelve lista de diccionarios
-    except FileNotFoundError:
+            except (ValueError, TypeError) as e:
+                raise type(e)(f"fila {lector.line_num}: {e}") from e   # indica dónde está el error
+    
+    _aplicar_registro_cambios(paises)               # modificaciones todavía no volcadas al CSV
+    return paises
+
+def _parsear_tramo(ruta, inicio, fin, encabezado):
+    """ Convierte las líneas del archivo entre los bytes inicio y fin (tramo que empieza y termina
+    en un salto de línea). Se ejecuta en otro proceso y devuelve las columnas, la cantidad de líneas
+    del tramo y el primer error encontrado como (línea dentro del tramo, tipo, mensaje). """
+    with open(ruta, mode="rb") as archivo:
+        archivo.seek(inicio)
+        datos = archivo.read(fin - inicio)
+    
+    i_nombre, i_poblacion, i_superficie, i_continente = (encabezado.index(columna) for columna in COLUMNAS)
+    nombres, poblaciones, superficies, continentes = [], array("q"), array("q"), []
+    resultado = {"lineas": datos.count(b"\n"), "error": None}
+    lineas = datos.decode(ENCODING).split("\n")
+    for numero, fila in enumerate(csv.reader(lineas), start=1):
+        if not fila:                                # línea vacía: DictReader también la saltea
+            continue
+        fila += [None] * (len(encabezado) - len(fila))   # columnas faltantes, igual que DictReader
+        try:
+            poblacion = int(fila[i_poblacion])
+            superficie = int(fila[i_superficie])
+        except (ValueError, TypeError) as e:
+            resultado["error"] = (numero, type(e), str(e))
+            break
+        nombres.append(fila[i_nombre])
+        poblaciones.append(poblacion)
+        superficies.append(superficie)
+        continentes.append(fila[i_continente])
+    
+    resultado.update(nombres=nombres, poblaciones=poblaciones, superficies=superficies, continentes=continentes)
+    return resultado
+
+def _leer_paises_en_paralelo(procesos=None):
+    """ Lee el archivo en un AlmacenPaises repartiendo tramos alineados en saltos de línea entre
+    varios procesos; cada tramo llega como columnas que se agregan sin recorrer las filas.
+    Con un solo proceso (por ejemplo, en una máquina de un núcleo) los tramos se convierten
+    en este mismo proceso, sin crear otros. Supone que ningún campo contiene saltos de línea
+    (los nombres del catálogo nunca los tienen). """
+    procesos = procesos or _procesos_lectura()
+    tamanio = os.path.getsize(FILE_NAME)
+    with open(FILE_NAME, mode="rb") as archivo:
+        primera_linea = archivo.readline()          # encabezado
+        encabezado = next(csv.reader([primera_linea.decode(ENCODING)]), [])
+        
+        # límites de los tramos: se avanza cada corte hasta el próximo salto de línea
+        cantidad_tramos = max(1, min(procesos * 4, (tamanio - len(primera_linea)) // TAMANIO_MINIMO_TRAMO))
+        limites = [len(primera_linea)]
+        for i in range(1, cantidad_tramos):
+            corte = len(primera_linea) + (tamanio - len(primera_linea)) * i // cantidad_tramos
+            if corte <= limites[-1]:
+                continue
+            archivo.seek(corte - 1)
+            archivo.readline()                      # termina la línea en curso
+            if archivo.tell() < tamanio and archivo.tell() > limites[-1]:
+                limites.append(archivo.tell())
+        limites.append(tamanio)
+    
+    paises = AlmacenPaises()
+    primera_linea_del_tramo = 2                     # la línea 1 es el encabezado
+    with contextlib.ExitStack() as pila:
+        argumentos = (itertools.repeat(FILE_NAME), limites[:-1], limites[1:], itertools.repeat(encabezado))
+        if procesos > 1:
+            ejecutor = pila.enter_context(ProcessPoolExecutor(max_workers=procesos))
+            tramos = ejecutor.map(_parsear_tramo, *argumentos)
+        else:
+            tramos = map(_parsear_tramo, *argumentos)
+        for tramo in tramos:                        # map devuelve los tramos en orden
+            if tramo["error"] is not None:
+                linea, tipo, mensaje = tramo["error"]
+                raise tipo(f"fila {primera_linea_del_tramo + linea - 1}: {mensaje}")
+            paises.extender_columnas(tramo["nombres"], tramo["poblaciones"],
+                                     tramo["superficies"], tramo["continentes"])
+            primera_linea_del_tramo += tramo["lineas"]
+    return paises
+
+@_instrumentada("lectura")
+def leer_paises_desde_archivo(columnar=False):
+    """ Lee los paises desde el archivo y los devuelve como una lista de diccionarios
+    (o como un AlmacenPaises si columnar es True). """
+    try:
+        return _leer_paises(columnar)               # devuelve lista de diccionarios
+    except Exception as e:
+        _informar_error_lectura(e)
+    
+    return AlmacenPaises() if columnar else []     # devuelve lista vacía ante fallo
+
+def _informar_error_lectura(error):
+    """ Muestra el mensaje que corresponde a un error al leer el archivo de países. """
+    if isinstance(error, FileNotFoundError):
         print("Error: El archivo no se encontró.")  # mensaje si no existe (no debería ocurrir)
+    elif isinstance(error, ValueError):
+        print(f"Error de formato en los datos: {error}")  # mensaje si hay datos mal formateados
+    else:
+        print(f"Ocurrió un error inesperado: {error}")  # captura otros errores
+
+def _lineas_hasta(archivo, tamanio):
+    """ Devuelve las líneas decodificadas de un archivo binario sin pasar del byte 'tamanio'. """
+    leidos = 0
+    for linea in archivo:
+        if leidos >= tamanio:
+            return
+        leidos += len(linea)
+        if leidos > tamanio:                        # línea que se estaba agregando: se descarta
+            return
+        yield linea.decode(ENCODING)
+
+@_instrumentada("lectura")
+def iterar_paises_desde_archivo(poblacion=None, superficie=None, continente=None):
+    """ Lee el archivo fila por fila y va devolviendo solo los países que cumplen los filtros,
+    sin armar la lista completa. poblacion y superficie son tuplas (desde, hasta) con None
+    como extremo abierto; el continente se compara sin convertir la fila a diccionario. """
+    continente = None if continente is None else continente.lower()
+    try:
+        verificar_archivo()                        # asegura que el archivo exista
+        with bloqueo_archivo():                    # registro y tamaño leídos en un mismo estado
+            cambios = _leer_registro_cambios()     # modificaciones todavía no volcadas al CSV
+            file = open(FILE_NAME, mode="rb")
+            tamanio = os.fstat(file.fileno()).st_size
+        # el bloqueo no se mantiene mientras se recorre (el usuario puede demorar entre páginas):
+        # lo que se agregue después queda fuera del tamaño leído y, si el archivo se reemplaza,
+        # este descriptor sigue apuntando al archivo anterior completo
+        with file:
+            lector = csv.reader(_lineas_hasta(file, tamanio))  # filas como listas: más liviano que DictReader
+            encabezado = next(lector, None)
+            if encabezado is None:
+                return
+            i_nombre, i_poblacion, i_superficie, i_continente = (
+                encabezado.index(columna) for columna in COLUMNAS)
+            
+            for fila in lector:
+                valores_nuevos = None
+                if cambios:                        # solo la primera aparición del nombre
+                    valores_nuevos = cambios.pop(normalizar_nombre(fila[i_nombre]), None)
+                if continente is not None and fila[i_continente].lower() != continente:
+                    continue                       # se descarta antes de convertir números
+                
+                if valores_nuevos is None:
+                    valor_poblacion = int(fila[i_poblacion])
+                    valor_superficie = int(fila[i_superficie])
+                else:
+                    valor_poblacion, valor_superficie = valores_nuevos
+                if poblacion is not None and not _en_rango(valor_poblacion, poblacion):
+                    continue
+                if superficie is not None and not _en_rango(valor_superficie, superficie):
+                    continue
+                
+                yield {
+                    COL_NOMBRE_PAIS: fila[i_nombre],
+                    COL_POBLACION: valor_poblacion,
+                    COL_SUPERFICIE: valor_superficie,
+                    COL_CONTINENTE: fila[i_continente]
+                }
     except ValueError as e:
-        print(f"Error de formato en los datos: {e}")# mensaje si hay datos mal formateados
+        print(f"Error de formato en los datos: {e}")  # mismos mensajes que leer_paises_desde_archivo
     except Exception as e:
-        print(f"Ocurrió un error inesperado: {e}") # captura otros errores
-    
-    return []                                       # devuelve lista vacía ante fallo
+        print(f"Ocurrió un error inesperado: {e}")
     
 def agregar_pais_a_archivo(pais, poblacion, superficie, continente):
     """ Agrega un nuevo título al archivo. """
-    verificar_archivo()                             # asegura existencia del archivo
-    with open(FILE_NAME, mode='a', encoding=ENCODING, newline='') as archivo:
-        escritor = csv.DictWriter(archivo, fieldnames=[COL_NOMBRE_PAIS, COL_POBLACION, COL_SUPERFICIE, COL_CONTINENTE])
-        escritor.writerow({
-            COL_NOMBRE_PAIS: pais,                  # escribe nombre
-            COL_POBLACION: poblacion,               # escribe población
-            COL_SUPERFICIE: superficie,             # escribe superficie
-            COL_CONTINENTE: continente              # escribe continente
-        })
+    _agregar_paises_a_archivo([{
+        COL_NOMBRE_PAIS: pais,                      # nombre
+        COL_POBLACION: poblacion,                   # población
+        COL_SUPERFICIE: superficie,                 # superficie
+        COL_CONTINENTE: continente                  # continente
+    }])
+
+@_instrumentada("escritura")
+def _agregar_paises_a_archivo(nuevos_paises):
+    """ Agrega los países al final del archivo con una sola escritura: si falla, el archivo
+    vuelve a su tamaño original. El tamaño original se anota antes en un archivo aparte, así que
+    si el programa se corta a mitad de la escritura la próxima verificar_archivo la deshace.
+    Actualiza catálogo y estadísticas. """
+    with bloqueo_archivo(exclusivo=True):             # un solo proceso escribe a la vez
+        verificar_archivo()                             # asegura existencia del archivo
+        paises = _catalogo_al_dia()                     # relee el archivo si otro proceso lo cambió
+        nombres_nuevos = set()
+        for nuevo_pais in nuevos_paises:                # duplicados: se comprueba con el bloqueo tomado
+            clave = normalizar_nombre(nuevo_pais[COL_NOMBRE_PAIS])
+            if clave in nombres_nuevos or buscar_pais(paises, clave) is not None:
+                raise ValueError(f"El país '{nuevo_pais[COL_NOMBRE_PAIS]}' ya existe en el catálogo.")
+            nombres_nuevos.add(clave)
+        firma_previa = _firma_archivo()                 # estado del archivo antes de escribir
+    
+        texto = io.StringIO(newline="")                 # arma todas las filas en memoria
+        escritor = csv.DictWriter(texto, fieldnames=[COL_NOMBRE_PAIS, COL_POBLACION, COL_SUPERFICIE, COL_CONTINENTE])
+        escritor.writerows(nuevos_paises)
+        contenido = texto.getvalue().encode(ENCODING)
+    
+        alta_pendiente = _ruta_alta_pendiente()
+        try:
+            with open(FILE_NAME, mode="r+b", buffering=0) as archivo:   # sin búfer: nada queda sin escribir
+                tamanio_original = archivo.seek(0, os.SEEK_END)
+                if tamanio_original > 0:
+                    archivo.seek(-1, os.SEEK_END)
+                    if archivo.read(1) != b"\n":       # última fila sin salto de línea (editada a mano)
+                        contenido = b"\n" + contenido
+                with open(alta_pendiente, mode="w", encoding=ENCODING) as pendiente:
+                    pendiente.write(f"{os.fstat(archivo.fileno()).st_ino},{tamanio_original}")
+                    pendiente.flush()
+                    os.fsync(pendiente.fileno())        # anotado antes de tocar el CSV
+                try:
+                    datos = memoryview(contenido)
+                    while datos:                        # una sola escritura con todas las filas
+                        datos = datos[archivo.write(datos):]
+                    os.fsync(archivo.fileno())
+                except Exception:
+                    os.ftruncate(archivo.fileno(), tamanio_original)  # deshace la escritura parcial
+                    raise
+                finally:
+                    os.remove(alta_pendiente)
+        except Exception:
+            invalidar_catalogo()                        # el archivo pudo cambiar: se releerá
+            raise
+        firma_nueva = _firma_archivo()
+    
+        # si el catálogo en memoria estaba al día, se le agregan las filas sin releer el archivo
+        if _catalogo["paises"] is not None and _catalogo["firma"] == firma_previa:
+            primera_posicion = len(_catalogo["paises"])
+            for nuevo_pais in nuevos_paises:
+                _catalogo["paises"].append(nuevo_pais)
+                _indexar_pais(len(_catalogo["paises"]) - 1)   # actualiza los índices con la nueva fila
+            _agregar_a_indices_ordenados(range(primera_posicion, len(_catalogo["paises"])))
+            _catalogo["firma"] = firma_nueva
+            _nueva_generacion()                         # las consultas guardadas ya no sirven
+        else:
+            invalidar_catalogo()                        # hubo cambios externos: se releerá
+    
+        # lo mismo con las estadísticas incrementales
+        if _resumen["firma"] is not None and _resumen["firma"] == firma_previa:
+            for nuevo_pais in nuevos_paises:
+                _resumen_agregar(nuevo_pais)
+            _guardar_resumen(firma_nueva)
+        else:
+            _resumen["firma"] = None                    # se recalcularán en el próximo pedido
         
 def guardar_paises_en_archivo(paises):
     """ Guarda la lista de títulos en el archivo, sobrescribiendo el contenido existente. """
-    verificar_archivo()                             
-    with open(FILE_NAME, mode="w", newline="", encoding=ENCODING) as archivo:
-        escritor = csv.DictWriter(archivo, fieldnames=[COL_NOMBRE_PAIS, COL_POBLACION, COL_SUPERFICIE, COL_CONTINENTE])
-        escritor.writeheader()                     # reescribe encabezado
-        escritor.writerows(paises)                 # escribe todas las filas desde la lista
+    with bloqueo_archivo(exclusivo=True):             # un solo proceso escribe a la vez
+        _escribir_paises_en_archivo(paises)
+    
+        # el contenido del archivo es exactamente la lista recibida
+        if paises is not _catalogo["paises"]:
+            paises = list(paises)                      # copia para no compartir la lista del llamador
+        _establecer_catalogo(paises, _firma_archivo())
+        _recalcular_resumen(paises)                    # la escritura ya recorrió toda la lista
+        _guardar_resumen(_catalogo["firma"])
+
+@_instrumentada("escritura")
+def _escribir_paises_en_archivo(paises):
+    """ Sobrescribe el archivo con la lista de países, sin tocar los índices del catálogo.
+    Escribe un archivo temporal y lo renombra, así el CSV nunca queda a medio escribir. """
+    with bloqueo_archivo(exclusivo=True):             # un solo proceso escribe a la vez
+        verificar_archivo()                             
+        temporal = f"{FILE_NAME}.{os.getpid()}.tmp"    # nombre propio de este proceso
+        try:
+            with open(temporal, mode="w", newline="", encoding=ENCODING) as archivo:
+                escritor = csv.DictWriter(archivo, fieldnames=[COL_NOMBRE_PAIS, COL_POBLACION, COL_SUPERFICIE, COL_CONTINENTE])
+                escritor.writeheader()                 # reescribe encabezado
+                escritor.writerows(paises)             # escribe todas las filas desde la lista
+                archivo.flush()
+                os.fsync(archivo.fileno())             # asegura que los datos estén en disco
+            os.replace(temporal, FILE_NAME)            # reemplazo atómico del archivo
+        except Exception:
+            invalidar_catalogo()                       # el catálogo pudo quedar distinto del archivo
+            raise
+    
+        # el CSV nuevo ya incluye todas las modificaciones: el registro de cambios sobra
+        # (aunque quedara, no se aplicaría porque apunta al archivo anterior)
+        try:
+            os.remove(_ruta_registro_cambios())
+        except FileNotFoundError:
+            pass
+
+
+# ----------------------------------------------------------------
+# Registro de cambios
+# ----------------------------------------------------------------
+
+def _ruta_registro_cambios():
+    """ Devuelve la ruta del registro de cambios que acompaña al archivo CSV. """
+    return os.path.splitext(FILE_NAME)[0] + ".cambios.log"
+
+def _leer_registro_cambios():
+    """ Lee el registro de cambios y devuelve {nombre normalizado: (población, superficie)}.
+    Si el registro corresponde a otro archivo CSV (fue reemplazado), devuelve un diccionario vacío.
+    Solo se aplican las líneas completas: lo que sigue al último salto de línea es un registro
+    a medio escribir por un corte (puede parecer válido, como 'Chile,12345678,27') y se ignora. """
+    try:
+        with open(_ruta_registro_cambios(), mode="rb") as archivo:
+            contenido = archivo.read()
+    except FileNotFoundError:
+        return {}
+    contenido = contenido[:contenido.rfind(b"\n") + 1]  # se descarta el registro cortado, si lo hay
+    lector = csv.reader(io.StringIO(contenido.decode(ENCODING), newline=""))
+    encabezado = next(lector, None)
+    if encabezado != [ENCABEZADO_REGISTRO_CAMBIOS, str(os.stat(FILE_NAME).st_ino)]:
+        return {}                                   # registro de un archivo anterior
+    cambios = {}
+    for fila in lector:
+        if len(fila) == 3:
+            cambios[normalizar_nombre(fila[0])] = (int(fila[1]), int(fila[2]))  # el último cambio gana
+    return cambios
+
+def _aplicar_registro_cambios(paises):
+    """ Aplica a la lista de países las modificaciones guardadas en el registro de cambios. """
+    cambios = _leer_registro_cambios()
+    if not cambios:
+        return
+    for pais in paises:
+        nombre = normalizar_nombre(pais[COL_NOMBRE_PAIS])
+        if nombre in cambios:
+            pais[COL_POBLACION], pais[COL_SUPERFICIE] = cambios.pop(nombre)  # solo la primera aparición
+            if not cambios:
+                break
+
+@_instrumentada("escritura")
+def _registrar_cambio(pais):
+    """ Agrega al registro de cambios la población y superficie actuales del país, con fsync. """
+    with bloqueo_archivo(exclusivo=True):             # un solo proceso escribe a la vez
+        ruta = _ruta_registro_cambios()
+        encabezado = [ENCABEZADO_REGISTRO_CAMBIOS, str(os.stat(FILE_NAME).st_ino)]
+        try:
+            with open(ruta, mode="r+b") as archivo:
+                primera_linea = archivo.readline()
+                vigente = (primera_linea.endswith(b"\n")
+                           and next(csv.reader([primera_linea.decode(ENCODING, "replace")]), None) == encabezado)
+                if vigente:
+                    archivo.seek(-1, os.SEEK_END)
+                    if archivo.read(1) != b"\n":        # quedó un registro cortado: se quita
+                        archivo.seek(0)
+                        contenido = archivo.read()
+                        archivo.truncate(contenido.rfind(b"\n") + 1)
+        except FileNotFoundError:
+            vigente = False
+    
+        with open(ruta, mode="a" if vigente else "w", newline="", encoding=ENCODING) as archivo:
+            escritor = csv.writer(archivo)
+            if not vigente:                             # registro nuevo (o de un archivo anterior)
+                escritor.writerow(encabezado)
+            escritor.writerow([pais[COL_NOMBRE_PAIS], pais[COL_POBLACION], pais[COL_SUPERFICIE]])
+            archivo.flush()
+            os.fsync(archivo.fileno())                  # el cambio queda en disco antes de confirmar
+
+
+# ----------------------------------------------------------------
+# Instantánea binaria
+# ----------------------------------------------------------------
+
+def _ruta_snapshot():
+    """ Devuelve la ruta de la instantánea binaria que acompaña al archivo CSV. """
+    return os.path.splitext(FILE_NAME)[0] + ".snapshot.bin"
+
+def _bytes_de_enteros(arreglo):
+    """ Devuelve los bytes de un array de enteros en orden little-endian. """
+    if sys.byteorder == "big":
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+def _enteros_de_bytes(tipo, datos):
+    """ Arma un array de enteros a partir de bytes en orden little-endian (una sola copia). """
+    arreglo = array(tipo)
+    arreglo.frombytes(datos)
+    if sys.byteorder == "big":
+        arreglo.byteswap()
+    return arreglo
+
+def _relleno(tamanio):
+    """ Bytes de relleno para que la próxima sección empiece en un múltiplo de 8. """
+    return b"\0" * (-tamanio % 8)
+
+@_instrumentada("escritura")
+def guardar_snapshot(almacen, estado_csv):
+    """ Guarda el almacén como instantánea binaria. estado_csv es el os.stat del CSV
+    tomado antes de leerlo, para reconocer luego si la instantánea quedó vieja. """
+    nombres, inicios, poblaciones, superficies, codigos, continentes = almacen.columnas()
+    texto_continentes = [continente.encode(ENCODING) for continente in continentes]
+    inicios_continentes = array("q", [0])
+    for continente in texto_continentes:
+        inicios_continentes.append(inicios_continentes[-1] + len(continente))
+    heap_continentes = b"".join(texto_continentes)
+    
+    secciones = [                                   # columnas de ancho fijo y luego los textos
+        _bytes_de_enteros(poblaciones),
+        _bytes_de_enteros(superficies),
+        _bytes_de_enteros(inicios),
+        _bytes_de_enteros(codigos) + _relleno(2 * len(codigos)),
+        _bytes_de_enteros(inicios_continentes),
+        bytes(nombres) + _relleno(len(nombres)),
+        heap_continentes,
+    ]
+    crc = 0
+    for seccion in secciones:
+        crc = zlib.crc32(seccion, crc)
+    encabezado = ENCABEZADO_SNAPSHOT.pack(
+        MAGIA_SNAPSHOT, VERSION_SNAPSHOT, len(continentes), len(almacen),
+        estado_csv.st_mtime_ns, estado_csv.st_size, len(nombres), len(heap_continentes), crc)
+    
+    ruta = _ruta_snapshot()
+    temporal = f"{ruta}.{os.getpid()}.tmp"          # nombre propio de este proceso
+    with open(temporal, mode="wb") as archivo:
+        archivo.write(encabezado)
+        for seccion in secciones:
+            archivo.write(seccion)
+    os.replace(temporal, ruta)                      # reemplazo atómico
+
+@_instrumentada("lectura")
+def cargar_snapshot():
+    """ Carga la instantánea binaria. El archivo se mapea en memoria para verificarlo y cada
+    columna se copia una vez, entera, a su arreglo: no se convierte fila por fila, pero tampoco
+    se trabaja sobre el mapa (el almacén se modifica con las altas y el mapa se cierra al
+    terminar). Devuelve un AlmacenPaises, o None si no existe, no corresponde al CSV actual
+    o está dañada. """
+    with bloqueo_archivo():                        # ningún proceso escribe mientras se lee
+        try:
+            estado_csv = os.stat(FILE_NAME)
+            with open(_ruta_snapshot(), mode="rb") as archivo, \
+                 mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                datos = memoryview(mapa)
+                try:
+                    (magia, version, cantidad_continentes, cantidad, mtime_ns, tamanio_csv,
+                     bytes_nombres, bytes_continentes, crc) = ENCABEZADO_SNAPSHOT.unpack_from(datos)
+                    if magia != MAGIA_SNAPSHOT or version != VERSION_SNAPSHOT:
+                        return None
+                    if (mtime_ns, tamanio_csv) != (estado_csv.st_mtime_ns, estado_csv.st_size):
+                        return None                     # el CSV cambió: la instantánea quedó vieja
+                    if zlib.crc32(datos[ENCABEZADO_SNAPSHOT.size:]) != crc:
+                        return None                     # archivo dañado
+                
+                    inicio = ENCABEZADO_SNAPSHOT.size
+                    def tomar(tamanio):
+                        """ Devuelve la próxima sección del mapa y avanza (respetando el relleno). """
+                        nonlocal inicio
+                        seccion = datos[inicio:inicio + tamanio]
+                        inicio += tamanio + (-tamanio % 8)
+                        return seccion
+                
+                    poblaciones = _enteros_de_bytes("q", tomar(8 * cantidad))
+                    superficies = _enteros_de_bytes("q", tomar(8 * cantidad))
+                    inicios = _enteros_de_bytes("q", tomar(8 * (cantidad + 1)))
+                    codigos = _enteros_de_bytes("H", tomar(2 * cantidad))
+                    inicios_continentes = _enteros_de_bytes("q", tomar(8 * (cantidad_continentes + 1)))
+                    nombres = bytearray(tomar(bytes_nombres))
+                    heap_continentes = bytes(tomar(bytes_continentes))
+                    continentes = [heap_continentes[inicios_continentes[i]:inicios_continentes[i + 1]].decode(ENCODING)
+                                   for i in range(cantidad_continentes)]
+                finally:
+                    datos.release()                     # libera el mapa antes de cerrarlo
+        except (OSError, ValueError, struct.error):
+            return None                                 # no existe, vacía o truncada
+    
+        return AlmacenPaises.desde_columnas(nombres, inicios, poblaciones, superficies, codigos, continentes)
+
+@_instrumentada("lectura")
+def leer_paises_con_snapshot():
+    """ Carga los países desde la instantánea binaria si está al día; si no, lee el CSV
+    y deja una instantánea nueva para el próximo arranque. Devuelve un AlmacenPaises.
+    Los errores de lectura del CSV se propagan (y no se guarda instantánea). """
+    verificar_archivo()
+    with bloqueo_archivo():                        # ningún proceso escribe mientras se lee
+        almacen = cargar_snapshot()
+        if almacen is not None:
+            _aplicar_registro_cambios(almacen)          # modificaciones todavía no volcadas al CSV
+            return almacen
+    
+        estado_csv = os.stat(FILE_NAME)                 # antes de leer: si cambia mientras tanto, quedará vieja
+        almacen = _leer_paises(columnar=True)
+        try:
+            guardar_snapshot(almacen, estado_csv)
+        except OSError as e:
+            print(f"No se pudo guardar la instantánea: {e}")  # se seguirá leyendo el CSV
+        return almacen
+
+
+# ----------------------------------------------------------------
+# Importación masiva
+# ----------------------------------------------------------------
+
+def _leer_filas_a_importar(origen):
+    """ Devuelve pares (número de fila, datos) desde un archivo CSV, un archivo JSON Lines
+    (.jsonl o .json, un objeto por línea) o cualquier iterable de diccionarios. """
+    if not isinstance(origen, str):
+        yield from enumerate(origen, start=1)
+        return
+    
+    with open(origen, newline="", encoding=ENCODING) as archivo:
+        if os.path.splitext(origen)[1].lower() in (".jsonl", ".json"):
+            for numero, linea in enumerate(archivo, start=1):
+                if linea.strip() == "":
+                    continue
+                try:
+                    yield numero, json.loads(linea)
+                except ValueError as e:
+                    yield numero, f"JSON inválido: {e}"   # se informa como fila rechazada
+        else:
+            lector = csv.DictReader(archivo)
+            for fila in lector:
+                yield lector.line_num, fila
+
+def _validar_fila_importacion(datos):
+    """ Valida una fila a importar con las mismas reglas que el ingreso manual.
+    Devuelve (país, None) si es válida o (None, motivo) si no. """
+    if isinstance(datos, str):                      # error de lectura ya descripto
+        return None, datos
+    if not isinstance(datos, dict):
+        return None, "La fila no es un objeto con columnas."
+    
+    nombre = str(datos.get(COL_NOMBRE_PAIS) or "").strip()
+    poblacion = str(datos.get(COL_POBLACION) or "").strip()
+    superficie = str(datos.get(COL_SUPERFICIE) or "").strip()
+    continente = str(datos.get(COL_CONTINENTE) or "").strip()
+    if nombre == "":
+        return None, "El nombre no puede estar vacío."
+    if not validar_entero_mayor_que_cero(poblacion):
+        return None, "Población inválida. Debe ser un número entero positivo."
+    if not validar_entero_mayor_que_cero(superficie):
+        return None, "Superficie inválida. Debe ser un número entero positivo."
+    if continente.lower() not in CONTINENTES_VALIDOS:
+        return None, "Continente inválido."
+    
+    return {
+        COL_NOMBRE_PAIS: nombre.capitalize(),       # mismo formato que el ingreso manual
+        COL_POBLACION: int(poblacion),
+        COL_SUPERFICIE: int(superficie),
+        COL_CONTINENTE: continente.capitalize()
+    }, None
+
+def importar_paises(origen):
+    """ Importa países desde un archivo CSV, un archivo JSON Lines o un iterable de diccionarios.
+    Las filas válidas se agregan al archivo con una sola escritura. Devuelve un diccionario con
+    la cantidad importada y la lista de filas rechazadas (fila, datos y motivo). """
+    with bloqueo_archivo(exclusivo=True):             # un solo proceso escribe a la vez
+        paises = _catalogo_al_dia()                     # para detectar duplicados con el índice
+        nombres_nuevos = set()
+        validos = []
+        rechazados = []
+        for numero, datos in _leer_filas_a_importar(origen):
+            pais, motivo = _validar_fila_importacion(datos)
+            if pais is not None:
+                clave = normalizar_nombre(pais[COL_NOMBRE_PAIS])
+                if clave in nombres_nuevos or buscar_pais(paises, clave) is not None:
+                    pais, motivo = None, f"El país '{pais[COL_NOMBRE_PAIS]}' ya existe en el catálogo."
+                else:
+                    nombres_nuevos.add(clave)
+            if pais is None:
+                rechazados.append({"fila": numero, "datos": datos, "motivo": motivo})
+            else:
+                validos.append(pais)
+    
+        if validos:
+            _agregar_paises_a_archivo(validos)
+        return {"importados": len(validos), "rechazados": rechazados}
+
+
+# ----------------------------------------------------------------
+# Funciones del catálogo en memoria
+# ----------------------------------------------------------------
+
+def _firma_archivo():
+    """ Devuelve (mtime_ns, tamaño) del archivo y del registro de cambios, o None si el archivo no existe. """
+    try:
+        estado = os.stat(FILE_NAME)
+    except OSError:
+        return None
+    try:
+        registro = os.stat(_ruta_registro_cambios())
+        return (estado.st_mtime_ns, estado.st_size, registro.st_mtime_ns, registro.st_size)
+    except OSError:
+        return (estado.st_mtime_ns, estado.st_size, None, None)
+
+def invalidar_catalogo():
+    """ Descarta el catálogo en memoria para que se vuelva a leer en el próximo acceso. """
+    _catalogo["paises"] = None
+    _catalogo["firma"] = None
+    _nueva_generacion()                             # las consultas guardadas ya no sirven
+    _descartar_indices()
+
+def _establecer_catalogo(paises, firma):
+    """ Reemplaza el catálogo en memoria. Los índices se construyen recién cuando se usan. """
+    _catalogo["paises"] = paises
+    _catalogo["firma"] = firma
+    _nueva_generacion()                             # las consultas guardadas ya no sirven
+    _descartar_indices()
+
+def _descartar_indices():
+    """ Marca todos los índices del catálogo como no construidos. """
+    for nombre in INDICES_CATALOGO:
+        _catalogo[nombre] = None
+
+def _indice(nombre):
+    """ Devuelve el índice indicado del catálogo en memoria, construyéndolo la primera vez que se usa.
+    Así una carga (por ejemplo desde la instantánea) no paga índices que ninguna consulta pide. """
+    if _catalogo[nombre] is None:
+        paises = _catalogo["paises"]
+        if nombre in ("indice_nombres", "nombres_normalizados"):
+            indice_nombres = {}
+            nombres_normalizados = [normalizar_nombre(nombre_pais)
+                                    for nombre_pais in _valores_columna(paises, COL_NOMBRE_PAIS)]
+            for posicion, nombre_pais in enumerate(nombres_normalizados):
+                # si el archivo tuviera nombres repetidos, se conserva el primero (igual que la búsqueda lineal)
+                indice_nombres.setdefault(nombre_pais, posicion)
+            _catalogo["indice_nombres"] = indice_nombres
+            _catalogo["nombres_normalizados"] = nombres_normalizados
+        elif nombre == "indice_trigramas":
+            indice_trigramas = {}
+            for posicion, nombre_pais in enumerate(_indice("nombres_normalizados")):
+                _agregar_trigramas(indice_trigramas, nombre_pais, posicion)
+            _catalogo["indice_trigramas"] = indice_trigramas
+        elif nombre == "indice_continentes":
+            indice_continentes = {}
+            for posicion, continente in enumerate(_valores_columna(paises, COL_CONTINENTE)):
+                indice_continentes.setdefault(continente.lower(), []).append(posicion)
+            _catalogo["indice_continentes"] = indice_continentes
+        else:
+            # índices ordenados: posiciones ordenadas por valor (y por posición ante empates)
+            indices_ordenados = {}
+            for columna in COLUMNAS_NUMERICAS:
+                valores = _valores_columna(paises, columna)
+                posiciones = sorted(range(len(valores)), key=valores.__getitem__)
+                indices_ordenados[columna] = ([valores[posicion] for posicion in posiciones], posiciones)
+            _catalogo["indices_ordenados"] = indices_ordenados
+    return _catalogo[nombre]
+
+def _valores_columna(paises, columna):
+    """ Devuelve los valores de una columna de todos los países (directo de las columnas en el almacén columnar). """
+    if isinstance(paises, AlmacenPaises):
+        return paises.valores_columna(columna)
+    return [pais[columna] for pais in paises]
+
+def _agregar_trigramas(indice_trigramas, nombre, posicion):
+    """ Agrega la posición a la lista de cada trigrama del nombre (las listas quedan en orden creciente). """
+    for trigrama in trigramas(nombre):
+        if trigrama in indice_trigramas:
+            indice_trigramas[trigrama].append(posicion)
+        else:
+            indice_trigramas[trigrama] = [posicion]
+
+def _indexar_pais(posicion):
+    """ Agrega a los índices ya construidos el país que está en la posición indicada del catálogo. """
+    pais = _catalogo["paises"][posicion]
+    if _catalogo["nombres_normalizados"] is not None:
+        nombre = normalizar_nombre(pais[COL_NOMBRE_PAIS])
+        _catalogo["indice_nombres"].setdefault(nombre, posicion)
+        _catalogo["nombres_normalizados"].append(nombre)
+        if _catalogo["indice_trigramas"] is not None:
+            _agregar_trigramas(_catalogo["indice_trigramas"], nombre, posicion)
+    
+    if _catalogo["indice_continentes"] is not None:
+        _catalogo["indice_continentes"].setdefault(pais[COL_CONTINENTE].lower(), []).append(posicion)
+
+def _insertar_en_indice_ordenado(columna, posicion):
+    """ Inserta la posición en el índice ordenado de la columna según su valor actual. """
+    if _catalogo["indices_ordenados"] is None:      # todavía no se construyó: se armará con el valor actual
+        return
+    valores, posiciones = _catalogo["indices_ordenados"][columna]
+    valor = _catalogo["paises"][posicion][columna]
+    inicio = bisect.bisect_left(valores, valor)     # tramo de valores iguales
+    fin = bisect.bisect_right(valores, valor)
+    i = bisect.bisect_left(posiciones, posicion, inicio, fin)  # ante empates, por posición
+    valores.insert(i, valor)
+    posiciones.insert(i, posicion)
+
+def _agregar_a_indices_ordenados(posiciones_nuevas):
+    """ Agrega a los índices ordenados las posiciones nuevas (mayores que todas las existentes). """
+    if _catalogo["indices_ordenados"] is None:
+        return
+    if len(posiciones_nuevas) <= 64:                # pocas filas: inserción directa
+        for posicion in posiciones_nuevas:
+            for columna in COLUMNAS_NUMERICAS:
+                _insertar_en_indice_ordenado(columna, posicion)
+        return
+    
+    # muchas filas: se ordenan aparte y se combinan con el índice en una sola pasada
+    paises = _catalogo["paises"]
+    for columna in COLUMNAS_NUMERICAS:
+        valores, posiciones = _catalogo["indices_ordenados"][columna]
+        nuevos = sorted((paises[posicion][columna], posicion) for posicion in posiciones_nuevas)
+        combinados = list(heapq.merge(zip(valores, posiciones), nuevos))
+        _catalogo["indices_ordenados"][columna] = ([valor for valor, _ in combinados],
+                                                   [posicion for _, posicion in combinados])
+
+def _quitar_de_indice_ordenado(columna, posicion):
+    """ Quita la posición del índice ordenado de la columna según su valor actual. """
+    if _catalogo["indices_ordenados"] is None:
+        return
+    valores, posiciones = _catalogo["indices_ordenados"][columna]
+    valor = _catalogo["paises"][posicion][columna]
+    inicio = bisect.bisect_left(valores, valor)
+    fin = bisect.bisect_right(valores, valor)
+    i = bisect.bisect_left(posiciones, posicion, inicio, fin)
+    del valores[i]
+    del posiciones[i]
+
+def actualizar_pais(nombre, poblacion, superficie):
+    """ Actualiza población y superficie de un país del catálogo y lo guarda en el archivo.
+    Devuelve el país actualizado, o None si no existe. """
+    with bloqueo_archivo(exclusivo=True):             # un solo proceso escribe a la vez
+        paises = _catalogo_al_dia()
+        posicion = _indice("indice_nombres").get(normalizar_nombre(nombre))
+        if posicion is None:
+            return None
+    
+        pais = paises[posicion]
+        resumen_al_dia = _resumen["firma"] is not None and _resumen["firma"] == _catalogo["firma"]
+        if resumen_al_dia:
+            _resumen_quitar(pais)                       # descuenta los valores anteriores
+    
+        nuevos_valores = {COL_POBLACION: poblacion, COL_SUPERFICIE: superficie}
+        for columna in COLUMNAS_NUMERICAS:              # reubica la fila en los índices ordenados
+            _quitar_de_indice_ordenado(columna, posicion)
+            pais[columna] = nuevos_valores[columna]
+            _insertar_en_indice_ordenado(columna, posicion)
+        _nueva_generacion()                             # las consultas guardadas ya no sirven
+    
+        try:
+            _registrar_cambio(pais)                     # persiste el cambio sin reescribir el CSV
+        except Exception:
+            invalidar_catalogo()                        # la memoria quedó distinta del disco
+            _resumen["firma"] = None
+            raise
+        _catalogo["firma"] = _firma_archivo()
+        if _catalogo["firma"][3] > TAMANIO_MAXIMO_REGISTRO_CAMBIOS:
+            _escribir_paises_en_archivo(paises)         # vuelca los cambios al CSV y borra el registro
+            _catalogo["firma"] = _firma_archivo()
+    
+        if resumen_al_dia:
+            _resumen_agregar(pais)                      # suma los valores nuevos
+            _resumen_extremos_desde_indices()           # mayor y menor población según el índice
+            _guardar_resumen(_catalogo["firma"])
+        else:
+            _resumen["firma"] = None
+        return pais
+
+def _catalogo_al_dia():
+    """ Devuelve el catálogo en memoria al día con el archivo; lanza ValueError si no se pudo leer
+    (las escrituras no deben basarse en la lista vacía que devuelve obtener_paises ante un error). """
+    paises = obtener_paises()
+    if paises is not _catalogo["paises"]:
+        raise ValueError("No se pudo leer el archivo de países.")
+    return paises
+
+def obtener_paises():
+    """ Devuelve la lista de países del catálogo en memoria, releyendo el archivo solo si cambió.
+    Si la lectura falla, informa el error y devuelve una lista vacía que no queda en el catálogo. """
+    verificar_archivo()                             # asegura que el archivo exista
+    with bloqueo_archivo():                         # firma y contenido del mismo estado del archivo
+        firma = _firma_archivo()
+        if _catalogo["paises"] is None or firma != _catalogo["firma"]:
+            try:
+                if USAR_SNAPSHOT:
+                    paises = leer_paises_con_snapshot()  # instantánea binaria (almacén columnar)
+                else:
+                    paises = _leer_paises(columnar=USAR_ALMACEN_COLUMNAR)
+            except Exception as e:
+                # no se guarda en el catálogo: el próximo acceso vuelve a intentar la lectura
+                _informar_error_lectura(e)
+                return AlmacenPaises() if USAR_SNAPSHOT or USAR_ALMACEN_COLUMNAR else []
+            _establecer_catalogo(paises, firma)
+        
+    return _catalogo["paises"]
+
+
+# ----------------------------------------------------------------
+# Caché de consultas
+# ----------------------------------------------------------------
+
+def _nueva_generacion():
+    """ Pasa a una nueva generación del catálogo y vacía la caché completa: no se sabe qué
+    consultas afecta un cambio, así que se descartan todas. """
+    _cache_consultas["generacion"] += 1
+    vaciar_cache_consultas()
+
+def vaciar_cache_consultas():
+    """ Descarta todas las consultas guardadas (los contadores se conservan). """
+    _cache_consultas["entradas"].clear()
+    _cache_consultas["bytes"] = 0
+
+def generacion_catalogo():
+    """ Devuelve la generación actual del catálogo en memoria: cambia con cada alta,
+    modificación o relectura del archivo. """
+    return _cache_consultas["generacion"]
+
+def _bytes_filas(filas, copias=False):
+    """ Estima los bytes de una lista de países. Las filas del catálogo no se cuentan (ya están
+    en memoria); sí las vistas del almacén columnar y, con copias=True, cada diccionario. """
+    total = sys.getsizeof(filas)
+    for fila in filas:
+        if copias:
+            total += sys.getsizeof(fila) + sum(map(sys.getsizeof, fila.values()))
+        elif isinstance(fila, VistaPais):
+            total += sys.getsizeof(fila)
+    return total
+
+def _consulta_en_cache(clave, calcular, medir=_bytes_filas):
+    """ Devuelve el resultado guardado para la clave (ya normalizada); si no está, lo calcula
+    con calcular() y lo guarda, descartando las consultas menos usadas si se superan los
+    límites. medir(resultado) estima los bytes que ocupa. """
+    entradas = _cache_consultas["entradas"]
+    entrada = entradas.get(clave)
+    if entrada is not None:
+        entradas.move_to_end(clave)                 # pasa a ser la más usada
+        _cache_consultas["aciertos"] += 1
+        return entrada[0]
+    
+    _cache_consultas["fallos"] += 1
+    generacion = _cache_consultas["generacion"]
+    resultado = calcular()
+    tamanio = medir(resultado)
+    if (generacion == _cache_consultas["generacion"]  # el catálogo no cambió mientras se calculaba
+            and TAMANIO_MAXIMO_CACHE_CONSULTAS > 0 and tamanio <= MEMORIA_MAXIMA_CACHE_CONSULTAS):
+        entradas[clave] = (resultado, tamanio)
+        _cache_consultas["bytes"] += tamanio
+        while (len(entradas) > TAMANIO_MAXIMO_CACHE_CONSULTAS
+               or _cache_consultas["bytes"] > MEMORIA_MAXIMA_CACHE_CONSULTAS):
+            _, (_, bytes_desalojados) = entradas.popitem(last=False)  # la menos usada
+            _cache_consultas["bytes"] -= bytes_desalojados
+            _cache_consultas["desalojos"] += 1
+    return resultado
+
+def estadisticas_cache_consultas():
+    """ Devuelve los contadores de la caché de consultas: aciertos, fallos, desalojos,
+    entradas guardadas, bytes estimados y generación actual del catálogo. """
+    return {
+        "aciertos": _cache_consultas["aciertos"],
+        "fallos": _cache_consultas["fallos"],
+        "desalojos": _cache_consultas["desalojos"],
+        "entradas": len(_cache_consultas["entradas"]),
+        "bytes": _cache_consultas["bytes"],
+        "generacion": _cache_consultas["generacion"],
+    }
+
+
+# ----------------------------------------------------------------
+# Estadísticas incrementales
+# ----------------------------------------------------------------
+
+def _ruta_resumen():
+    """ Devuelve la ruta del archivo de estadísticas que acompaña al archivo CSV. """
+    return os.path.splitext(FILE_NAME)[0] + ".estadisticas.json"
+
+def _copia_pais(pais):
+    """ Devuelve una copia del país como diccionario simple (para guardarlo en JSON). """
+    return {columna: pais[columna] for columna in COLUMNAS}
+
+def _resumen_agregar(pais):
+    """ Suma un país a los acumulados de las estadísticas. """
+    _resumen["cantidad"] += 1
+    _resumen["distribucion"] = None                 # la mediana y los percentiles se vuelven a calcular
+    for columna in COLUMNAS_NUMERICAS:
+        _resumen["totales"][columna] += pais[columna]
+        _resumen["cuadrados"][columna] += pais[columna] ** 2
+    
+    grupo = _resumen["continentes"].setdefault(
+        pais[COL_CONTINENTE], {"cantidad": 0, "poblacion_total": 0, "superficie_total": 0})
+    grupo["cantidad"] += 1
+    grupo["poblacion_total"] += pais[COL_POBLACION]
+    grupo["superficie_total"] += pais[COL_SUPERFICIE]
+    
+    # ante empates se conserva el país que apareció primero
+    mayor = _resumen["pais_mayor_poblacion"]
+    if mayor is None or pais[COL_POBLACION] > mayor[COL_POBLACION]:
+        _resumen["pais_mayor_poblacion"] = _copia_pais(pais)
+    menor = _resumen["pais_menor_poblacion"]
+    if menor is None or pais[COL_POBLACION] < menor[COL_POBLACION]:
+        _resumen["pais_menor_poblacion"] = _copia_pais(pais)
+
+def _resumen_quitar(pais):
+    """ Resta un país de los acumulados. El mayor y el menor se corrigen luego con los índices. """
+    _resumen["cantidad"] -= 1
+    _resumen["distribucion"] = None
+    for columna in COLUMNAS_NUMERICAS:
+        _resumen["totales"][columna] -= pais[columna]
+        _resumen["cuadrados"][columna] -= pais[columna] ** 2
+    
+    grupo = _resumen["continentes"][pais[COL_CONTINENTE]]
+    grupo["cantidad"] -= 1
+    grupo["poblacion_total"] -= pais[COL_POBLACION]
+    grupo["superficie_total"] -= pais[COL_SUPERFICIE]
+    if grupo["cantidad"] == 0:
+        del _resumen["continentes"][pais[COL_CONTINENTE]]
+
+def _resumen_extremos_desde_indices():
+    """ Toma del índice ordenado de población los países con mayor y menor población. """
+    paises = _catalogo["paises"]
+    valores, posiciones = _indice("indices_ordenados")[COL_POBLACION]
+    if not valores:
+        _resumen["pais_mayor_poblacion"] = _resumen["pais_menor_poblacion"] = None
+        return
+    primero_del_maximo = bisect.bisect_left(valores, valores[-1])   # ante empates, el primero del archivo
+    _resumen["pais_mayor_poblacion"] = _copia_pais(paises[posiciones[primero_del_maximo]])
+    _resumen["pais_menor_poblacion"] = _copia_pais(paises[posiciones[0]])
+
+def _recalcular_resumen(paises):
+    """ Recalcula los acumulados recorriendo toda la lista de países. """
+    _resumen["cantidad"] = 0
+    _resumen["totales"] = {columna: 0 for columna in COLUMNAS_NUMERICAS}
+    _resumen["cuadrados"] = {columna: 0 for columna in COLUMNAS_NUMERICAS}
+    _resumen["continentes"] = {}
+    _resumen["pais_mayor_poblacion"] = None
+    _resumen["pais_menor_poblacion"] = None
+    _resumen["distribucion"] = None
+    for pais in paises:
+        _resumen_agregar(pais)
+
+def _guardar_resumen(firma):
+    """ Marca los acumulados como válidos para la firma indicada y los guarda junto al CSV. """
+    _resumen["firma"] = firma
+    ruta = _ruta_resumen()
+    temporal = f"{ruta}.{os.getpid()}.tmp"          # nombre propio de este proceso
+    try:
+        with open(temporal, mode="w", encoding=ENCODING) as archivo:
+            json.dump({"firma": list(firma)} | {clave: valor for clave, valor in _resumen.items() if clave != "firma"},
+                      archivo, ensure_ascii=False)
+        os.replace(temporal, ruta)                  # reemplazo atómico: nunca queda a medio escribir
+    except OSError as e:
+        # no poder guardar el resumen no impide seguir: se recalcula al reiniciar
+        print(f"No se pudieron guardar las estadísticas: {e}")
+
+def _cargar_resumen(firma):
+    """ Carga los acumulados guardados si corresponden a la firma indicada. Devuelve True si pudo. """
+    try:
+        with open(_ruta_resumen(), encoding=ENCODING) as archivo:
+            guardado = json.load(archivo)
+    except (OSError, ValueError):
+        return False                                # no existe o está dañado: se recalcula
+    if firma is None or guardado.get("firma") != list(firma):
+        return False                                # el CSV cambió desde que se guardó
+    if any(clave not in guardado for clave in _resumen):
+        return False                                # guardado por una versión anterior: se recalcula
+    for clave in _resumen:
+        if clave != "firma":
+            _resumen[clave] = guardado[clave]
+    for distribucion in (_resumen["distribucion"] or {}).values():
+        # JSON guarda las claves como texto: se vuelven a convertir a entero
+        distribucion["percentiles"] = {int(porcentaje): valor for porcentaje, valor in distribucion["percentiles"].items()}
+    _resumen["firma"] = firma
+    return True
+
+def _actualizar_resumen():
+    """ Deja los acumulados al día con el archivo: los carga del archivo de estadísticas
+    o, si no corresponden al CSV actual, los recalcula una vez recorriendo el catálogo. """
+    verificar_archivo()
+    firma = _firma_archivo()
+    if _resumen["firma"] != firma and not _cargar_resumen(firma):
+        paises = obtener_paises()
+        _recalcular_resumen(paises)
+        if paises is _catalogo["paises"]:
+            _guardar_resumen(_catalogo["firma"])
+        else:
+            _resumen["firma"] = None                # lectura fallida: no se guarda, se reintenta
+
+@_instrumentada("consulta")
+def obtener_resumen_estadisticas(verificar=False):
+    """ Devuelve las estadísticas básicas a partir de los acumulados, sin recorrer el catálogo.
+    Con verificar=True las compara contra un recálculo completo y lanza ValueError si difieren. """
+    _actualizar_resumen()
+    
+    cantidad = _resumen["cantidad"]
+    resumen = {
+        "cantidad": cantidad,
+        "pais_mayor_poblacion": _resumen["pais_mayor_poblacion"],
+        "pais_menor_poblacion": _resumen["pais_menor_poblacion"],
+        "densidad": (_resumen["totales"][COL_POBLACION] / _resumen["totales"][COL_SUPERFICIE]
+                     if _resumen["totales"][COL_SUPERFICIE] else None),
+        "continentes": {},
+    }
+    for columna in COLUMNAS_NUMERICAS:
+        total = _resumen["totales"][columna]
+        # varianza = (n·Σx² - (Σx)²) / n², con enteros exactos
+        varianza = (cantidad * _resumen["cuadrados"][columna] - total ** 2) / cantidad ** 2 if cantidad else None
+        resumen[columna] = {
+            "total": total,
+            "promedio": total / cantidad if cantidad else None,
+            "desviacion": varianza ** 0.5 if cantidad else None,
+        }
+    for continente, grupo in _resumen["continentes"].items():
+        resumen["continentes"][continente] = grupo | {
+            "poblacion_promedio": grupo["poblacion_total"] / grupo["cantidad"],
+            "superficie_promedio": grupo["superficie_total"] / grupo["cantidad"],
+            "densidad": grupo["poblacion_total"] / grupo["superficie_total"] if grupo["superficie_total"] else None,
+        }
+    
+    if verificar:
+        diferencias = _comparar_estadisticas(resumen, calcular_estadisticas(obtener_paises()))
+        if diferencias:
+            raise ValueError("Las estadísticas incrementales no coinciden con el recálculo: " + "; ".join(diferencias))
+    return resumen
+
+def obtener_distribucion(columna):
+    """ Devuelve mínimo, máximo, mediana y percentiles de una columna numérica.
+    Se guardan con los acumulados: mientras el archivo no cambie no hace falta cargar el catálogo.
+    Después de un alta o modificación se vuelven a leer de los índices ordenados, sin ordenar nada. """
+    _actualizar_resumen()
+    if _resumen["distribucion"] is None:
+        if obtener_paises() is not _catalogo["paises"]:
+            return _distribucion([])                # no se pudo leer el archivo
+        distribucion = {}
+        for columna_numerica in COLUMNAS_NUMERICAS:
+            distribucion[columna_numerica] = _distribucion(_indice("indices_ordenados")[columna_numerica][0])
+        if _resumen["firma"] != _catalogo["firma"]:
+            return distribucion[columna]            # el archivo cambió mientras tanto: no se guarda
+        _resumen["distribucion"] = distribucion
+        _guardar_resumen(_resumen["firma"])
+    return _resumen["distribucion"][columna]
+
+def _distribucion(valores):
+    """ Arma mínimo, máximo, mediana y percentiles a partir de una lista de valores ordenados. """
+    return {
+        "minimo": valores[0] if valores else None,
+        "maximo": valores[-1] if valores else None,
+        "mediana": percentil(valores, 50),
+        "percentiles": {porcentaje: percentil(valores, porcentaje) for porcentaje in PERCENTILES},
+    }
+
+def _comparar_estadisticas(resumen, completo, ruta=""):
+    """ Compara recursivamente las claves del resumen con el cálculo completo y devuelve las diferencias. """
+    diferencias = []
+    for clave, valor in resumen.items():
+        esperado = completo.get(clave)
+        nombre = f"{ruta}{clave}"
+        if isinstance(valor, dict) and isinstance(esperado, dict):
+            diferencias += _comparar_estadisticas(valor, esperado, nombre + ".")
+        elif isinstance(valor, float) or isinstance(esperado, float):
+            if valor is None or esperado is None or not math.isclose(valor, esperado, rel_tol=1e-9):
+                diferencias.append(f"{nombre}: {valor} != {esperado}")
+        elif valor != esperado:
+            diferencias.append(f"{nombre}: {valor} != {esperado}")
+    return diferencias
+
+
+# ----------------------------------------------------------------
+# API de consultas
+# Funciones sin entrada por teclado ni salida por pantalla: las usan el menú
+# y el servidor HTTP (servidor_paises.py). Devuelven diccionarios simples
+# ----------------------------------------------------------------
+
+def _validar_rango(nombre, rango):
+    """ Verifica que el rango sea (desde, hasta) con enteros >= 0 o None, y desde <= hasta. """
+    if len(rango) != 2:
+        raise ValueError(f"El rango de {nombre} debe tener dos valores: (desde, hasta).")
+    desde, hasta = rango
+    for valor in (desde, hasta):
+        if valor is not None and (not isinstance(valor, int) or valor < 0):
+            raise ValueError(f"El rango de {nombre} debe tener enteros mayores o iguales que cero.")
+    if desde is not None and hasta is not None and desde > hasta:
+        raise ValueError(f"El mínimo de {nombre} no puede ser mayor que el máximo.")
+
+def consultar_pais(nombre):
+    """ Devuelve una copia del país con ese nombre (sin importar mayúsculas ni acentos), o None. """
+    pais = buscar_pais(obtener_paises(), nombre)
+    return None if pais is None else _copia_pais(pais)
+
+@_instrumentada("consulta")
+def consultar_paises(nombre=None, continente=None, poblacion=None, superficie=None,
+                     orden=(), desde=0, limite=None):
+    """ Consulta el catálogo: busca por nombre parcial (admitiendo un error de tipeo si no hay
+    coincidencias y el nombre tiene al menos LARGO_MINIMO_TOLERANCIA letras), filtra por
+    continente y rangos (desde, hasta), ordena por los criterios (columna, desc) y devuelve
+    la página [desde, desde + limite). Lanza ValueError si algún parámetro es inválido. Devuelve {"total": coincidencias, "paises": lista de diccionarios}. """
+    for columna, _ in orden:
+        if columna not in COLUMNAS:
+            raise ValueError(f"No se puede ordenar por la columna '{columna}'.")
+    # rangos como tuplas: [1, 5] y (1, 5) son la misma consulta (y las listas no sirven de clave)
+    poblacion = None if poblacion is None else tuple(poblacion)
+    superficie = None if superficie is None else tuple(superficie)
+    for nombre_rango, rango in (("población", poblacion), ("superficie", superficie)):
+        if rango is not None:
+            _validar_rango(nombre_rango, rango)
+    if desde < 0 or (limite is not None and limite < 0):
+        raise ValueError("desde y limite deben ser mayores o iguales que cero.")
+
+    continente = continente or None                 # "" equivale a no filtrar por continente
+    paises = obtener_paises()                       # antes de la caché: detecta cambios del archivo
+    clave = ("consulta", normalizar_nombre(nombre) if nombre else None,
+             continente.lower() if continente else None, poblacion, superficie,
+             tuple((columna, bool(desc)) for columna, desc in orden), desde, limite)
+    resultado = _consulta_en_cache(clave, lambda: _resolver_consulta(
+        paises, nombre, continente, poblacion, superficie, orden, desde, limite),
+        lambda resultado: _bytes_filas(resultado["paises"], copias=True))
+    # copia: quien la reciba puede modificarla sin alterar la caché
+    return {"total": resultado["total"], "paises": [dict(pais) for pais in resultado["paises"]]}
+
+def _resolver_consulta(paises, nombre, continente, poblacion, superficie, orden, desde, limite):
+    """ Calcula el resultado de consultar_paises sobre el catálogo (sin caché). """
+    hay_filtros = continente or poblacion is not None or superficie is not None
+    if nombre:
+        resultados = buscar_paises(paises, nombre, ignorar_acentos=True)
+        if not resultados and len(normalizar_nombre(nombre)) >= LARGO_MINIMO_TOLERANCIA:
+            # reintenta admitiendo un error de tipeo
+            resultados = buscar_paises(paises, nombre, ignorar_acentos=True, tolerar_errores=True)
+        if hay_filtros:
+            resultados = filtrar_paises_por_rangos(resultados, poblacion=poblacion,
+                                                   superficie=superficie, continente=continente)
+    elif hay_filtros:
+        resultados = filtrar_paises_por_rangos(paises, poblacion=poblacion, superficie=superficie,
+                                               continente=continente)
+    else:
+        resultados = paises                         # el catálogo mismo: puede usar sus índices ordenados
+
+    if orden and limite is not None:
+        pagina = primeros_paises(resultados, orden, limite, desde)   # sin ordenar todo
+    elif orden:
+        pagina = ordenar_lista_paises(resultados, orden)[desde:]
+    else:
+        pagina = resultados[desde:None if limite is None else desde + limite]
+    return {"total": len(resultados), "paises": [_copia_pais(pais) for pais in pagina]}
+
+def consultar_estadisticas():
+    """ Devuelve el resumen de estadísticas con la distribución (mediana y percentiles)
+    de población y superficie. """
+    estadisticas = obtener_resumen_estadisticas()   # acumulados: no recorre el catálogo
+    for columna in COLUMNAS_NUMERICAS:
+        # mediana y percentiles guardados con los acumulados (o de los índices ordenados, si cambiaron)
+        estadisticas[columna] = estadisticas[columna] | obtener_distribucion(columna)
+    return estadisticas
+
+
+# ----------------------------------------------------------------
+# Instrumentación
+# ----------------------------------------------------------------
+
+def _archivos_de_tipo(tipo, funcion):
+    """ Devuelve las rutas cuyos bytes se anotan para una función de lectura o escritura. """
+    if funcion in ("cargar_snapshot", "guardar_snapshot"):
+        return (_ruta_snapshot(),)
+    if funcion == "_registrar_cambio":
+        return (_ruta_registro_cambios(),)
+    return (FILE_NAME, _ruta_registro_cambios()) if tipo == "lectura" else (FILE_NAME,)
+
+def _tamanio_archivos(rutas):
+    """ Devuelve (suma de tamaños, inodos) de los archivos que existen entre las rutas. """
+    total = 0
+    inodos = []
+    for ruta in rutas:
+        try:
+            estado = os.stat(ruta)
+        except OSError:
+            inodos.append(None)
+            continue
+        total += estado.st_size
+        inodos.append(estado.st_ino)
+    return total, inodos
+
+def _filas_resultado(resultado):
+    """ Cantidad de países de un resultado: listas, almacenes, consultas o un país suelto. """
+    if resultado is None:
+        return 0
+    if isinstance(resultado, int):
+        return resultado                        # cantidad ya contada (países mostrados)
+    if isinstance(resultado, dict) and "paises" in resultado:
+        return len(resultado["paises"])         # respuesta de consultar_paises
+    if isinstance(resultado, (dict, VistaPais)):
+        return 1 if COL_NOMBRE_PAIS in resultado else 0
+    try:
+        return len(resultado)
+    except TypeError:
+        return 0
+
+def _metrica(nombre, tipo):
+    """ Devuelve (creándolas si hace falta) las métricas acumuladas de una función. """
+    metrica = _instrumentacion["metricas"].get(nombre)
+    if metrica is None:
+        metrica = _instrumentacion["metricas"][nombre] = {
+            "tipo": tipo, "llamadas": 0, "segundos_total": 0.0, "segundos_minimo": None,
+            "segundos_maximo": 0.0, "histograma_us": {}, "filas": 0, "bytes": 0,
+            "memoria_pico": 0, "memoria_neta": 0,
+        }
+    return metrica
+
+def _anotar(metrica, segundos, filas=0, bytes_archivo=0, memoria_pico=0, memoria_neta=0):
+    """ Suma una llamada a las métricas. El histograma agrupa las duraciones en potencias
+    de 2 microsegundos: la cubeta "k" cuenta las llamadas de menos de 2**k µs. """
+    metrica["llamadas"] += 1
+    metrica["segundos_total"] += segundos
+    if metrica["segundos_minimo"] is None or segundos < metrica["segundos_minimo"]:
+        metrica["segundos_minimo"] = segundos
+    metrica["segundos_maximo"] = max(metrica["segundos_maximo"], segundos)
+    cubeta = str(int(segundos * 1_000_000).bit_length())
+    metrica["histograma_us"][cubeta] = metrica["histograma_us"].get(cubeta, 0) + 1
+    metrica["filas"] += filas
+    metrica["bytes"] += bytes_archivo
+    metrica["memoria_pico"] = max(metrica["memoria_pico"], memoria_pico)
+    metrica["memoria_neta"] += memoria_neta
+
+def _medicion_inicial(tipo, nombre):
+    """ Toma los valores iniciales de una llamada: reloj, espera del usuario, archivos y memoria. """
+    medir_memoria = _instrumentacion["memoria"] and tracemalloc.is_tracing()
+    if medir_memoria and _instrumentacion["profundidad"] == 0:
+        tracemalloc.reset_peak()
+    _instrumentacion["profundidad"] += 1
+    archivos = _tamanio_archivos(_archivos_de_tipo(tipo, nombre)) if tipo == "escritura" else None
+    memoria = tracemalloc.get_traced_memory()[0] if medir_memoria else None
+    return time.perf_counter(), _instrumentacion["espera"], archivos, memoria
+
+def _medicion_final(metrica, tipo, nombre, inicio, filas):
+    """ Anota la llamada comparando con los valores iniciales de _medicion_inicial. """
+    reloj, espera, archivos, memoria = inicio
+    segundos = time.perf_counter() - reloj - (_instrumentacion["espera"] - espera)  # sin la espera del usuario
+    _instrumentacion["profundidad"] -= 1
+    
+    bytes_archivo = 0
+    if tipo == "lectura":
+        bytes_archivo = _tamanio_archivos(_archivos_de_tipo(tipo, nombre))[0]
+    elif tipo == "escritura":
+        tamanio, inodos = _tamanio_archivos(_archivos_de_tipo(tipo, nombre))
+        # archivo reemplazado (otro inodo): se escribió completo; si no, solo lo que creció
+        bytes_archivo = tamanio if inodos != archivos[1] else max(0, tamanio - archivos[0])
+    
+    memoria_pico = memoria_neta = 0
+    if memoria is not None:
+        actual, pico = tracemalloc.get_traced_memory()
+        memoria_neta = actual - memoria
+        if _instrumentacion["profundidad"] == 0:
+            memoria_pico = pico - memoria
+    _anotar(metrica, segundos, filas, bytes_archivo, memoria_pico, memoria_neta)
+
+def _generador_medido(funcion, tipo, args, kwargs):
+    """ Recorre el generador de la función midiendo solo el tiempo que tarda en producir
+    cada país (sin contar el que el llamador tarda entre uno y otro). """
+    nombre = funcion.__name__
+    segundos = 0.0
+    filas = 0
+    generador = funcion(*args, **kwargs)
+    try:
+        while True:
+            reloj, espera = time.perf_counter(), _instrumentacion["espera"]
+            try:
+                pais = next(generador)
+            except StopIteration:
+                break
+            finally:
+                segundos += time.perf_counter() - reloj - (_instrumentacion["espera"] - espera)
+            filas += 1
+            yield pais
+    finally:                                        # también si el llamador deja de pedir países
+        generador.close()
+        bytes_archivo = _tamanio_archivos(_archivos_de_tipo(tipo, nombre))[0] if tipo == "lectura" else 0
+        _anotar(_metrica(nombre, tipo), segundos, filas, bytes_archivo)
+
+def _llamada_medida(funcion, tipo, args, kwargs):
+    """ Ejecuta la función midiendo la llamada. """
+    nombre = funcion.__name__
+    inicio = _medicion_inicial(tipo, nombre)
+    resultado = None
+    try:
+        resultado = funcion(*args, **kwargs)
+        return resultado
+    finally:
+        # en las escrituras se cuentan los países recibidos; en el resto, los devueltos
+        filas = _filas_resultado(args[0] if tipo == "escritura" and args else resultado)
+        _medicion_final(_metrica(nombre, tipo), tipo, nombre, inicio, filas)
+
+def activar_instrumentacion(archivo_metricas=None, archivo_perfil=None, memoria=False):
+    """ Empieza a medir cada llamada de las funciones de FUNCIONES_INSTRUMENTADAS. Si se indican
+    archivos, al terminar el programa guarda las métricas en JSON y/o el perfil de cProfile
+    (para leerlo con pstats). Con memoria=True mide además la memoria con tracemalloc. """
+    if _instrumentacion["activa"]:
+        return
+    _instrumentacion["activa"] = True
+    _instrumentacion["archivo_metricas"] = archivo_metricas
+    _instrumentacion["archivo_perfil"] = archivo_perfil
+    _instrumentacion["memoria"] = memoria
+    
+    if memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if archivo_perfil:
+        _instrumentacion["perfil"] = cProfile.Profile()
+        _instrumentacion["perfil"].enable()
+    atexit.register(guardar_instrumentacion)
+
+def desactivar_instrumentacion():
+    """ Deja de medir (las métricas acumuladas se conservan) y detiene el perfil sin guardarlo. """
+    if not _instrumentacion["activa"]:
+        return
+    _instrumentacion["activa"] = False
+    if _instrumentacion["perfil"] is not None:
+        _instrumentacion["perfil"].disable()
+        _instrumentacion["perfil"] = None
+    atexit.unregister(guardar_instrumentacion)
+
+def activar_instrumentacion_desde_entorno(archivo_metricas=None, archivo_perfil=None, memoria=False):
+    """ Activa la instrumentación si se pidió por parámetro o por variable de entorno. """
+    archivo_metricas = archivo_metricas or os.environ.get(VARIABLE_METRICAS) or None
+    archivo_perfil = archivo_perfil or os.environ.get(VARIABLE_PERFIL) or None
+    memoria = memoria or os.environ.get(VARIABLE_MEMORIA, "") not in ("", "0")
+    if archivo_metricas or archivo_perfil or memoria:
+        activar_instrumentacion(archivo_metricas, archivo_perfil, memoria)
+
+def metricas_instrumentacion():
+    """ Devuelve una copia de las métricas acumuladas, con el promedio de cada función. """
+    metricas = {}
+    for nombre, metrica in _instrumentacion["metricas"].items():
+        if metrica["llamadas"]:
+            metricas[nombre] = dict(metrica, histograma_us=dict(metrica["histograma_us"]),
+                                    segundos_promedio=metrica["segundos_total"] / metrica["llamadas"])
+    return metricas
+
+def guardar_instrumentacion():
+    """ Detiene el perfil y guarda los archivos pedidos al activar la instrumentación. """
+    perfil = _instrumentacion["perfil"]
+    if perfil is not None:
+        perfil.disable()
+        perfil.dump_stats(_instrumentacion["archivo_perfil"])
+        _instrumentacion["perfil"] = None
+    if _instrumentacion["archivo_metricas"]:
+        try:
+            with open(_instrumentacion["archivo_metricas"], mode="w", encoding=ENCODING) as archivo:
+                json.dump(metricas_instrumentacion(), archivo, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"No se pudieron guardar las métricas: {e}")
 
 
 # ----------------------------------------------------------------
@@ -280,18 +2358,17 @@ def guardar_paises_en_archivo(paises):
 def ingresar_paises():
     """ Permite ingresar paises al catálogo. """
     mostrar_titulo_opcion("Ingresar países al catálogo")  # título de la opción
-    cantidad = input("Ingrese la cantidad de países: ")   # lee cantidad a ingresar
+    cantidad = leer_teclado("Ingrese la cantidad de países: ")   # lee cantidad a ingresar
     if not validar_entero_mayor_que_cero(cantidad): # valida que sea entero > 0
         mostrar_y_esperar_tecla("Cantidad inválida. Debe ser un número entero positivo.\n")
         return
 
     cantidad = int(cantidad)                              # convierte a entero el numero ingresado por el usuario
 
-    paises_existentes = leer_paises_desde_archivo()       # carga países actuales
-
     for i in range(cantidad):                             # bucle para cada país a ingresar
+        paises_existentes = obtener_paises()              # catálogo actual (incluye los ya ingresados)
         
-        nombre_pais = input(f"Ingrese el nombre del país ({i+1}/{cantidad}): ").strip()  # lee nombre
+        nombre_pais = leer_teclado(f"Ingrese el nombre del país ({i+1}/{cantidad}): ").strip()  # lee nombre
         if nombre_pais == "":                            # nombre no puede quedar vacío
             mostrar_y_esperar_tecla("El nombre no puede estar vacío.\n")
             return
@@ -300,34 +2377,28 @@ def ingresar_paises():
             mostrar_y_esperar_tecla(f"El país '{nombre_pais}' ya existe en el catálogo.\n")
             return
 
-        poblacion = input("Ingrese la población del país: ").strip()  # lee población
+        poblacion = leer_teclado("Ingrese la población del país: ").strip()  # lee población
         if not validar_entero_mayor_que_cero(poblacion):        # valida población
             mostrar_y_esperar_tecla("Población inválida. Debe ser un número entero positivo.\n")
             return
 
-        superficie = input("Ingrese la superficie del país (km²): ").strip() # lee superficie
+        superficie = leer_teclado("Ingrese la superficie del país (km²): ").strip() # lee superficie
         if not validar_entero_mayor_que_cero(superficie):       # valida superficie
             mostrar_y_esperar_tecla("Superficie inválida. Debe ser un número entero positivo.\n")
             return
 
-        continente = input("Ingrese el continente del país: ").strip() # lee continente
+        continente = leer_teclado("Ingrese el continente del país: ").strip() # lee continente
         if continente == "":                                           # continente no vacío
             mostrar_y_esperar_tecla("Continente no puede estar vacío.\n")
             return
         
-        if (continente.lower() not in ["america", "europa", "asia", "africa", "oceania"]):
+        if (continente.lower() not in CONTINENTES_VALIDOS):
             mostrar_y_esperar_tecla("Debes ingresar un continente valido.\n")
             return
 
         try:
-            # guarda en archivo y agrega a la lista en memoria
+            # guarda en archivo; el catálogo en memoria se actualiza solo
             agregar_pais_a_archivo(nombre_pais.capitalize(), int(poblacion), int(superficie), continente.capitalize())
-            paises_existentes.append({
-                COL_NOMBRE_PAIS: nombre_pais,
-                COL_POBLACION: int(poblacion),
-                COL_SUPERFICIE: int(superficie),
-                COL_CONTINENTE: continente
-            })
 
             print(f"País '{nombre_pais}' agregado exitosamente.\n")  # confirma agregado
         except Exception as e:
@@ -338,28 +2409,26 @@ def ingresar_paises():
 def actualizar_poblacion_y_superficie():
     """ Actualiza la población y superficie de un pais. """
     mostrar_titulo_opcion("Actualizar población y superficie de un país")  # título
-    pais_buscado = input(("Ingrese el pais a actualizar:"))                # nombre a buscar
-    paises = leer_paises_desde_archivo()                                   # cargar lista
+    pais_buscado = leer_teclado(("Ingrese el pais a actualizar:"))                # nombre a buscar
+    paises = obtener_paises()                                              # catálogo en memoria
     pais_encontrado = buscar_pais(paises, pais_buscado)         # busca en lista
     if pais_encontrado is None:                                            # mensaje si no existe
         mostrar_y_esperar_tecla("El país no existe en el catálogo.\n")
         return
     
-    poblacion = input("Ingrese la población del país: ").strip()           # nueva población
+    poblacion = leer_teclado("Ingrese la población del país: ").strip()           # nueva población
     if not validar_entero_mayor_que_cero(poblacion):                 # validar
         mostrar_y_esperar_tecla("Población inválida. Debe ser un número entero positivo.\n")
         return
 
-    superficie = input("Ingrese la superficie del país (km²): ").strip()   # nueva superficie
+    superficie = leer_teclado("Ingrese la superficie del país (km²): ").strip()   # nueva superficie
     if not validar_entero_mayor_que_cero(superficie):                # validar
         mostrar_y_esperar_tecla("Superficie inválida. Debe ser un número entero positivo.\n")
         return
     
-    pais_encontrado[COL_POBLACION] = int(poblacion)                        # actualizar diccionario
-    pais_encontrado[COL_SUPERFICIE] = int(superficie)
-    
     try:
-        guardar_paises_en_archivo(paises)                                  # guarda cambios en archivo
+        # actualiza el diccionario y los índices, y guarda cambios en archivo
+        actualizar_pais(pais_encontrado[COL_NOMBRE_PAIS], int(poblacion), int(superficie))
         mostrar_y_esperar_tecla("Población y Superficie actualizadas exitosamente!\n")
     except Exception as e:
         print(f"Ocurrió un error al actualizar Población y Superficie: {e}")  # muestra error
@@ -367,10 +2436,9 @@ def actualizar_poblacion_y_superficie():
 def buscar_pais_por_nombre():
     """ Busca un pais por nombre. """
     mostrar_titulo_opcion("Consultar país por nombre")                     # título opción
-    pais_consultado = input("Ingrese el país a consultar: ").strip()       # lee nombre
-    paises = leer_paises_desde_archivo()                                   # carga lista
+    pais_consultado = leer_teclado("Ingrese el país a consultar: ").strip()       # lee nombre
     
-    paises_encontrados = buscar_paises(paises, pais_consultado)            # busca en lista
+    paises_encontrados = consultar_paises(nombre=pais_consultado)["paises"]  # busca en el índice
     if len(paises_encontrados) > 0:
         mostrar_listado_paises(paises_encontrados)
     else:
@@ -383,7 +2451,8 @@ def filtrar_paises():
     print("1. Filtrar por continente")
     print("2. Filtrar por rango de población")
     print("3. Filtrar por rango de superficie")
-    opcion = input("Seleccione una opción (1-3): ").strip()         # opción de filtrado
+    print("4. Filtrar combinando continente, población y superficie")
+    opcion = leer_teclado("Seleccione una opción (1-4): ").strip()         # opción de filtrado
     
     match opcion:
         case "1":
@@ -392,13 +2461,15 @@ def filtrar_paises():
             filtrar_paises_por_rango_poblacion()                    # por rango de población
         case "3":       
             filtrar_paises_por_rango_superficie()                   # por rango de superficie
+        case "4":
+            filtrar_paises_combinado()                              # filtros combinados
         case _:
             mostrar_y_esperar_tecla("Opción no válida.")            # opción inválida
 
 def ordenar_paises():
     """ Ordena países por: Nombre, Población y Superficie (ascendente o descendente)  """
     mostrar_titulo_opcion ("Ordenar Países")   # título opción
-    paises = leer_paises_desde_archivo()      # lee datos del archivo
+    paises = obtener_paises()                 # catálogo en memoria
     if not paises:
         mostrar_y_esperar_tecla("No hay países registrados para ordenar.\n")  # sin datos
         return
@@ -407,7 +2478,7 @@ def ordenar_paises():
     print("1. Nombre")
     print("2. Población")
     print("3. Superficie")
-    opcion_col = input("Opción (1-3): ").strip()  # lee columna a ordenar
+    opcion_col = leer_teclado("Opción (1-3): ").strip()  # lee columna a ordenar
 
     columnas = {
         "1": COL_NOMBRE_PAIS,
@@ -421,44 +2492,40 @@ def ordenar_paises():
     print("\nSeleccione el orden:")
     print("1. Ascendente")
     print("2. Descendente")
-    opcion_orden = input("Opción (1-2): ").strip()  # lee dirección de orden
+    opcion_orden = leer_teclado("Opción (1-2): ").strip()  # lee dirección de orden
     if opcion_orden not in ("1", "2"):
         mostrar_y_esperar_tecla("Opción de orden inválida.")    # orden inválido
         return
 
+    cantidad = leer_teclado("\nCantidad de primeros países a mostrar (Enter = todos): ").strip()
+    if cantidad != "" and not validar_entero_mayor_que_cero(cantidad):
+        mostrar_y_esperar_tecla("Cantidad inválida. Debe ser un número entero positivo.\n")
+        return
+
     columna = columnas[opcion_col]          # columna seleccionada
     desc = opcion_orden == "2"              # True si descendente
 
-    paises_ordenados = ordenamiento_burbuja(paises, columna, desc)  # ordena
+    if cantidad != "":
+        # solo los primeros N: selección parcial, sin ordenar todo el catálogo
+        paises_ordenados = primeros_paises(paises, [(columna, desc)], int(cantidad))
+    else:
+        # todos, de a páginas: se ordena a medida que se muestran
+        paises_ordenados = iterar_catalogo_ordenado([(columna, desc)])
     mostrar_listado_paises(paises_ordenados)                        # muestra resultado
 
 def mostrar_estadisticas():
     """Muestra estadísticas sobre los países"""
     mostrar_titulo_opcion("Estadísticas de Países")  # título sección
-    paises = leer_paises_desde_archivo()             # carga datos desde archivo
+    estadisticas = consultar_estadisticas()          # acumulados: no recorre el catálogo
     
-    if not paises:
+    if estadisticas["cantidad"] == 0:
         mostrar_y_esperar_tecla("No hay países registrados para mostrar estadísticas.\n")
         return
     
-    # País con mayor y menor población
-    pais_mayor_pob = max(paises, key=lambda x: x[COL_POBLACION])  # usa max por población
-    pais_menor_pob = min(paises, key=lambda x: x[COL_POBLACION])  # usa min por población
-    
-    # Cálculo de promedios
-    total_poblacion = sum(pais[COL_POBLACION] for pais in paises)
-    total_superficie = sum(pais[COL_SUPERFICIE] for pais in paises)
-    promedio_poblacion = total_poblacion / len(paises)            # promedio población
-    promedio_superficie = total_superficie / len(paises)         # promedio superficie
-    
-    # Cantidad de países por continente
-    paises_por_continente = {}
-    for pais in paises:
-        continente = pais[COL_CONTINENTE]
-        if continente in paises_por_continente:
-            paises_por_continente[continente] += 1
-        else:
-            paises_por_continente[continente] = 1
+    pais_mayor_pob = estadisticas["pais_mayor_poblacion"]
+    pais_menor_pob = estadisticas["pais_menor_poblacion"]
+    poblacion = estadisticas[COL_POBLACION]
+    superficie = estadisticas[COL_SUPERFICIE]
     
     # Mostrar resultados
     print("\nMAYOR Y MENOR POBLACIÓN:")
@@ -466,12 +2533,23 @@ def mostrar_estadisticas():
     print(f"- País con menor población: {pais_menor_pob[COL_NOMBRE_PAIS]} ({pais_menor_pob[COL_POBLACION]:,} habitantes)")
     
     print("\nPROMEDIOS:")
-    print(f"- Promedio de población: {promedio_poblacion:,.2f} habitantes")
-    print(f"- Promedio de superficie: {promedio_superficie:,.2f} km²")
+    print(f"- Promedio de población: {poblacion['promedio']:,.2f} habitantes")
+    print(f"- Promedio de superficie: {superficie['promedio']:,.2f} km²")
+    
+    print("\nDISTRIBUCIÓN:")
+    print(f"- Mediana de población: {poblacion['mediana']:,.2f} habitantes")
+    print(f"- Desviación estándar de población: {poblacion['desviacion']:,.2f} habitantes")
+    print(f"- Mediana de superficie: {superficie['mediana']:,.2f} km²")
+    print(f"- Desviación estándar de superficie: {superficie['desviacion']:,.2f} km²")
+    for porcentaje, valor in poblacion["percentiles"].items():
+        print(f"- Percentil {porcentaje} de población: {valor:,.2f} habitantes")
+    if estadisticas["densidad"] is not None:
+        print(f"- Densidad de población: {estadisticas['densidad']:,.2f} habitantes/km²")
     
     print("\nCANTIDAD DE PAÍSES POR CONTINENTE:")
-    for continente, cantidad in paises_por_continente.items():
-        print(f"- {continente}: {cantidad} países")
+    for continente, grupo in estadisticas["continentes"].items():
+        print(f"- {continente}: {grupo['cantidad']} países, "
+              f"{grupo['poblacion_total']:,} habitantes, {grupo['superficie_total']:,} km²")
     
     mostrar_y_esperar_tecla("\n") 
 
@@ -479,6 +2557,50 @@ def mostrar_estadisticas():
 # ----------------------------------------------------------------
 # Programa principal
 # ----------------------------------------------------------------
-if __name__ == "__main__":
+def main(argumentos=None):
+    """ Punto de entrada: sin opciones muestra el menú; con --importar carga países sin preguntar. """
+    parser = argparse.ArgumentParser(description="Gestión de datos de países")
+    parser.add_argument("--importar", metavar="ARCHIVO",
+                        help="importa países desde un archivo CSV o JSON Lines y termina")
+    parser.add_argument("--streaming", action="store_true",
+                        help="los filtros leen el archivo fila por fila en lugar de cargarlo en memoria")
+    parser.add_argument("--columnar", action="store_true",
+                        help=f"guarda el catálogo en memoria por columnas (también con {VARIABLE_COLUMNAR}=1)")
+    parser.add_argument("--snapshot", action="store_true",
+                        help=f"carga el catálogo desde la instantánea binaria (también con {VARIABLE_SNAPSHOT}=1)")
+    parser.add_argument("--metricas", metavar="ARCHIVO",
+                        help=f"mide las funciones principales y guarda las métricas en JSON al salir "
+                             f"(también con la variable {VARIABLE_METRICAS})")
+    parser.add_argument("--perfil", metavar="ARCHIVO",
+                        help=f"guarda un perfil de cProfile al salir (también con {VARIABLE_PERFIL})")
+    parser.add_argument("--memoria", action="store_true",
+                        help=f"mide también la memoria con tracemalloc (también con {VARIABLE_MEMORIA}=1)")
+    opciones = parser.parse_args(argumentos)
+    activar_instrumentacion_desde_entorno(opciones.metricas, opciones.perfil, opciones.memoria)
+    
+    global MODO_STREAMING, USAR_ALMACEN_COLUMNAR, USAR_SNAPSHOT
+    MODO_STREAMING = MODO_STREAMING or opciones.streaming
+    USAR_ALMACEN_COLUMNAR = USAR_ALMACEN_COLUMNAR or opciones.columnar
+    USAR_SNAPSHOT = USAR_SNAPSHOT or opciones.snapshot
+    
+    if opciones.importar:
+        try:
+            resultado = importar_paises(opciones.importar)
+        except FileNotFoundError:
+            print(f"Error: El archivo '{opciones.importar}' no se encontró.")
+            return 2
+        except (OSError, ValueError) as e:
+            print(f"No se pudo importar el archivo: {e}")
+            return 2
+        print(f"Países importados: {resultado['importados']}")
+        print(f"Filas rechazadas: {len(resultado['rechazados'])}")
+        for rechazo in resultado["rechazados"]:
+            print(f"- Fila {rechazo['fila']}: {rechazo['motivo']}")
+        return 1 if resultado["rechazados"] else 0
+    
     mostrar_menu()  # inicia la aplicación mostrando el menú
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
 
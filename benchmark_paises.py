@@ -0,0 +1,421 @@
+# BENCHMARKS DE GESTIÓN DE DATOS DE PAÍSES
+# Genera catálogos sintéticos con el formato de gestion.paises.csv
+# y mide el tiempo de las operaciones más usadas del programa.
+# ------------------------------------------------------------
+
+import argparse  # módulo para leer los argumentos de la línea de comandos
+import json      # módulo para guardar y comparar los resultados
+import os        # módulo para manejo de rutas
+import platform  # módulo para anotar la versión de Python en los resultados
+import random    # módulo para generar datos sintéticos
+import tempfile  # módulo para crear una carpeta temporal de trabajo
+import time      # módulo para medir tiempos
+import tracemalloc  # módulo para medir la memoria reservada
+from concurrent.futures import ProcessPoolExecutor  # procesos para la prueba de concurrencia
+
+import GestionDatosPaises as gestion
+
+# Constantes
+# ----------------------------------------------------------------
+SILABAS = ["ar", "ba", "ca", "da", "el", "fi", "ga", "hu", "in", "jo", "ka", "li",
+           "ma", "ne", "or", "pa", "qui", "ro", "sa", "tu", "ur", "va", "xe", "zo"]
+TERMINACIONES = ["nia", "landia", "stan", "ria", "via", "ca", "ña", "ón", ""]
+CONTINENTES = ["America", "Europa", "Asia", "Africa", "Oceania"]
+PESOS_CONTINENTES = [35, 44, 48, 54, 14]   # proporción real de países por continente
+UMBRAL_REGRESION = 0.20                    # 20 % más lento que la referencia se informa como regresión
+TAMANIO_BURBUJA = 500                      # el ordenamiento burbuja es O(n²): se mide sobre pocos países
+
+
+# Funciones auxiliares
+# ----------------------------------------------------------------
+def generar_nombre(generador):
+    """ Genera un nombre de país inventado combinando sílabas. """
+    cantidad = generador.randint(2, 4)
+    nombre = "".join(generador.choice(SILABAS) for _ in range(cantidad))
+    return (nombre + generador.choice(TERMINACIONES)).capitalize()
+
+def generar_archivo_paises(ruta, cantidad, semilla=0):
+    """ Escribe un archivo CSV con el formato del catálogo y 'cantidad' países sintéticos:
+    continentes en la proporción real y poblaciones y superficies muy desparejas
+    (pocos países enormes y muchos chicos, como en el mundo real). """
+    generador = random.Random(semilla)
+    nombres_usados = set()
+    with open(ruta, mode="w", encoding=gestion.ENCODING, newline="") as archivo:
+        archivo.write(",".join([gestion.COL_NOMBRE_PAIS, gestion.COL_POBLACION,
+                                gestion.COL_SUPERFICIE, gestion.COL_CONTINENTE]) + "\n")
+        while len(nombres_usados) < cantidad:
+            nombre = generar_nombre(generador)
+            if nombre in nombres_usados:            # los nombres del catálogo no se repiten
+                nombre = f"{nombre} {len(nombres_usados)}"
+            nombres_usados.add(nombre)
+            # distribución lognormal: mediana de ~9 millones de habitantes y ~100.000 km²
+            poblacion = min(int(generador.lognormvariate(16, 2)) + 1, 2 * 10**9)
+            superficie = min(int(generador.lognormvariate(11.5, 2)) + 1, 2 * 10**7)
+            continente = generador.choices(CONTINENTES, PESOS_CONTINENTES)[0]
+            archivo.write(f"{nombre},{poblacion},{superficie},{continente}\n")
+
+def usar_archivo(ruta):
+    """ Hace que el programa trabaje sobre el archivo indicado, descartando el catálogo cargado. """
+    gestion.FILE_NAME = ruta
+    gestion.invalidar_catalogo()
+
+def medir(funcion, repeticiones=1):
+    """ Ejecuta la función 'repeticiones' veces y devuelve el tiempo promedio en segundos. """
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+def medir_minimo(funcion, vueltas=None, repeticiones=3, duracion_minima=0.02):
+    """ Ejecuta la función 'vueltas' veces seguidas, 'repeticiones' veces, y devuelve el menor
+    tiempo promedio por llamada en segundos (el menos afectado por otros procesos). Sin
+    'vueltas', se eligen para que cada repetición dure al menos 'duracion_minima' segundos. """
+    if vueltas is None:
+        primera = medir(funcion)
+        vueltas = max(1, int(duracion_minima / primera)) if primera > 0 else 1000
+    return min(medir(funcion, vueltas) for _ in range(repeticiones))
+
+def mostrar_resultado(descripcion, segundos, referencia=None):
+    """ Muestra una línea de resultado, con la mejora respecto de la referencia si se indica. """
+    linea = "{:<45} {:>12.3f} ms".format(descripcion, segundos * 1000)
+    if referencia is not None and segundos > 0:
+        linea += "   (x{:,.1f})".format(referencia / segundos)
+    print(linea)
+
+
+# Benchmarks
+# ----------------------------------------------------------------
+def benchmark_busqueda_parcial(cantidad, consultas=50):
+    """ Compara buscar_paises con índice de trigramas contra el recorrido lineal. """
+    paises = gestion.obtener_paises()
+    copia = list(paises)                            # una lista que no es el catálogo se recorre entera
+    generador = random.Random(1)
+    textos = []
+    for _ in range(consultas):                      # fragmentos de nombres existentes
+        nombre = generador.choice(paises)[gestion.COL_NOMBRE_PAIS]
+        inicio = generador.randint(0, max(0, len(nombre) - 4))
+        textos.append(nombre[inicio:inicio + 4])
+
+    print(f"\nBúsqueda parcial ({cantidad:,} países, {consultas} consultas)")
+    lineal = medir(lambda: [gestion.buscar_paises(copia, texto) for texto in textos]) / consultas
+    indexada = medir(lambda: [gestion.buscar_paises(paises, texto) for texto in textos]) / consultas
+    mostrar_resultado("buscar_paises lineal", lineal)
+    mostrar_resultado("buscar_paises con trigramas", indexada, lineal)
+
+    limitada = medir(lambda: [gestion.buscar_paises(paises, texto, limite=10) for texto in textos]) / consultas
+    mostrar_resultado("buscar_paises con trigramas (limite=10)", limitada, lineal)
+
+    # con un error, el índice solo filtra búsquedas de 6 letras o más (mitades de 3 letras)
+    for largo in (4, 6, 8):
+        nombres = [pais[gestion.COL_NOMBRE_PAIS] for pais in copia if len(pais[gestion.COL_NOMBRE_PAIS]) >= largo]
+        textos_con_error = []
+        for _ in range(consultas):
+            nombre = generador.choice(nombres)
+            inicio = generador.randint(0, len(nombre) - largo)
+            texto = nombre[inicio:inicio + largo]
+            textos_con_error.append(texto[:1] + "x" + texto[2:])
+        lineal = medir(lambda: [gestion.buscar_paises(copia, texto, tolerar_errores=True)
+                                for texto in textos_con_error]) / consultas
+        indexada = medir(lambda: [gestion.buscar_paises(paises, texto, tolerar_errores=True)
+                                  for texto in textos_con_error]) / consultas
+        mostrar_resultado(f"buscar_paises con un error ({largo} letras), lineal", lineal)
+        mostrar_resultado(f"buscar_paises con un error ({largo} letras), índice", indexada, lineal)
+
+def benchmark_memoria(cantidad):
+    """ Compara los bytes por fila de la lista de diccionarios y del almacén columnar. """
+    print(f"\nMemoria del catálogo ({cantidad:,} países)")
+    for descripcion, columnar in (("lista de diccionarios", False), ("almacén columnar", True)):
+        tracemalloc.start()
+        paises = gestion.leer_paises_desde_archivo(columnar=columnar)
+        memoria, _ = tracemalloc.get_traced_memory()  # memoria que sigue ocupada por el catálogo
+        tracemalloc.stop()
+        print("{:<45} {:>12,.1f} bytes/fila".format(descripcion, memoria / max(1, len(paises))))
+        del paises
+
+def benchmark_carga(cantidad):
+    """ Compara el tiempo de carga del CSV (csv.DictReader) con el de la instantánea binaria. """
+    print(f"\nCarga del catálogo ({cantidad:,} países)")
+    diccionarios = medir(gestion.leer_paises_desde_archivo)
+    columnar = medir(lambda: gestion.leer_paises_desde_archivo(columnar=True))
+    gestion.leer_paises_con_snapshot()              # crea la instantánea si no existe
+    instantanea = medir(gestion.cargar_snapshot, repeticiones=5)
+    mostrar_resultado("CSV a lista de diccionarios", diccionarios)
+    mostrar_resultado("CSV a almacén columnar", columnar, diccionarios)
+    mostrar_resultado("instantánea binaria (copia por columna)", instantanea, diccionarios)
+
+    # obtener_paises completo (carga, registro de cambios y catálogo en memoria), sin índices
+    # hasta la primera consulta; luego la primera búsqueda exacta, que construye el de nombres
+    def obtener_en_frio(snapshot):
+        anterior = gestion.USAR_SNAPSHOT
+        gestion.USAR_SNAPSHOT = snapshot
+        try:
+            gestion.invalidar_catalogo()
+            return gestion.obtener_paises()
+        finally:
+            gestion.USAR_SNAPSHOT = anterior
+    nombre = gestion.leer_paises_desde_archivo()[cantidad // 2][gestion.COL_NOMBRE_PAIS]
+    desde_csv = medir(lambda: obtener_en_frio(False))
+    desde_instantanea = medir(lambda: obtener_en_frio(True), repeticiones=5)
+    primera_busqueda = medir(lambda: gestion.buscar_pais(obtener_en_frio(True), nombre), repeticiones=5)
+    gestion.invalidar_catalogo()
+    mostrar_resultado("obtener_paises desde el CSV", desde_csv)
+    mostrar_resultado("obtener_paises desde la instantánea", desde_instantanea, desde_csv)
+    mostrar_resultado("instantánea + primera búsqueda exacta", primera_busqueda, desde_csv)
+
+def benchmark_lectura_paralela(cantidad, procesos=(1, 2, 4)):
+    """ Compara la lectura del CSV al almacén columnar fila por fila y por tramos, en uno o varios
+    procesos (la lista de diccionarios siempre se lee en un proceso). Con un solo núcleo, más
+    procesos no mejoran. """
+    print(f"\nLectura en paralelo ({cantidad:,} países, {os.cpu_count()} núcleos)")
+    anteriores = gestion.UMBRAL_LECTURA_PARALELA, gestion.PROCESOS_LECTURA
+    try:
+        gestion.UMBRAL_LECTURA_PARALELA = float("inf")
+        diccionarios = medir(gestion._leer_paises)
+        secuencial = medir(lambda: gestion._leer_paises(columnar=True))
+        mostrar_resultado("CSV a lista de diccionarios (1 proceso)", diccionarios)
+        mostrar_resultado("CSV a almacén columnar (fila por fila)", secuencial, diccionarios)
+        gestion.UMBRAL_LECTURA_PARALELA = 0
+        for cantidad_procesos in procesos:
+            gestion.PROCESOS_LECTURA = cantidad_procesos
+            paralela = medir(lambda: gestion._leer_paises(columnar=True))
+            mostrar_resultado(f"CSV a almacén columnar (tramos, {cantidad_procesos} proc.)", paralela, diccionarios)
+    finally:
+        gestion.UMBRAL_LECTURA_PARALELA, gestion.PROCESOS_LECTURA = anteriores
+
+
+
+# Suite de regresión
+# ----------------------------------------------------------------
+def ejecutar_suite(cantidad, consultas=20):
+    """ Mide las operaciones principales sobre el catálogo actual y devuelve un diccionario
+    operación -> segundos por llamada. Las escrituras se miden al final porque modifican el archivo. """
+    generador = random.Random(2)
+    resultados = {}
+    def registrar(operacion, funcion, vueltas=None, repeticiones=3):
+        resultados[operacion] = medir_minimo(funcion, vueltas, repeticiones)
+        mostrar_resultado(operacion, resultados[operacion])
+    
+    print(f"\nSuite de regresión ({cantidad:,} países)")
+    repeticiones_lectura = 1 if cantidad >= 1_000_000 else 3
+    registrar("leer_paises_desde_archivo", gestion.leer_paises_desde_archivo,
+              vueltas=1, repeticiones=repeticiones_lectura)
+    registrar("leer_paises_desde_archivo (columnar)",
+              lambda: gestion.leer_paises_desde_archivo(columnar=True), vueltas=1,
+              repeticiones=repeticiones_lectura)
+    
+    paises = gestion.obtener_paises()
+    nombres = [generador.choice(paises)[gestion.COL_NOMBRE_PAIS] for _ in range(consultas)]
+    fragmentos = [nombre[1:5] for nombre in nombres]
+    registrar("buscar_pais", lambda: [gestion.buscar_pais(paises, nombre) for nombre in nombres])
+    registrar("buscar_paises", lambda: [gestion.buscar_paises(paises, texto, limite=20)
+                                        for texto in fragmentos])
+    
+    registrar("filtrar por continente",
+              lambda: gestion.filtrar_paises_por_rangos(paises, continente="Oceania"))
+    registrar("filtrar por rango de población",
+              lambda: gestion.filtrar_paises_por_rangos(paises, poblacion=(1_000_000, 5_000_000)))
+    registrar("filtrar por rango de superficie",
+              lambda: gestion.filtrar_paises_por_rangos(paises, superficie=(10_000, 50_000)))
+    registrar("filtrar combinado",
+              lambda: gestion.filtrar_paises_por_rangos(paises, poblacion=(1_000_000, None),
+                                                        superficie=(None, 50_000), continente="Europa"))
+    # la API de consultas (la que usa el servidor) filtra con los índices ordenados y pagina;
+    # se vacía la caché antes de cada llamada para medir el cálculo y no el acierto
+    def consultar_sin_cache(**parametros):
+        gestion.vaciar_cache_consultas()
+        return gestion.consultar_paises(limite=20, **parametros)
+    registrar("consultar_paises por rango de población",
+              lambda: consultar_sin_cache(poblacion=(1_000_000, 5_000_000)))
+    registrar("consultar_paises por rango de superficie",
+              lambda: consultar_sin_cache(superficie=(10_000, 50_000), orden=[(gestion.COL_POBLACION, True)]))
+    registrar("consultar_paises combinado",
+              lambda: consultar_sin_cache(poblacion=(1_000_000, None), superficie=(None, 50_000),
+                                          continente="Europa"))
+    registrar("consultar_paises combinado (desde la caché)",
+              lambda: gestion.consultar_paises(poblacion=(1_000_000, None), superficie=(None, 50_000),
+                                               continente="Europa", limite=20))
+    registrar("filtrar leyendo el archivo (streaming)",
+              lambda: sum(1 for _ in gestion.iterar_paises_desde_archivo(continente="Oceania")),
+              vueltas=1, repeticiones=repeticiones_lectura)
+    
+    muestra = list(paises[:TAMANIO_BURBUJA])
+    registrar(f"ordenamiento_burbuja ({len(muestra)} países)",
+              lambda: gestion.ordenamiento_burbuja(muestra, gestion.COL_POBLACION), vueltas=1)
+    registrar(f"ordenar_lista_paises ({len(muestra)} países)",
+              lambda: gestion.ordenar_lista_paises(muestra, [(gestion.COL_POBLACION, False)]))
+    criterios = [(gestion.COL_CONTINENTE, False), (gestion.COL_POBLACION, True)]
+    registrar("ordenar_lista_paises", lambda: gestion.ordenar_lista_paises(paises, criterios))
+    registrar("primeros_paises (10)", lambda: gestion.primeros_paises(paises, criterios, 10))
+    
+    registrar("calcular_estadisticas", lambda: gestion.calcular_estadisticas(paises))
+    registrar("obtener_resumen_estadisticas", gestion.obtener_resumen_estadisticas)
+    
+    contador = iter(range(10**9))
+    registrar("agregar_pais_a_archivo",
+              lambda: gestion.agregar_pais_a_archivo(f"Nuevo {next(contador)}", 1_000, 1_000, "Europa"),
+              vueltas=10, repeticiones=1)
+    registrar("actualizar_pais",
+              lambda: gestion.actualizar_pais(nombres[0], generador.randint(1, 10**9), 1_000),
+              vueltas=10, repeticiones=1)
+    registrar("guardar_paises_en_archivo",
+              lambda: gestion.guardar_paises_en_archivo(gestion.obtener_paises()), vueltas=1, repeticiones=1)
+    return resultados
+
+def comparar_con_base(resultados, base, umbral=UMBRAL_REGRESION):
+    """ Compara los resultados con los de referencia (mismas cantidades y operaciones) y
+    devuelve la lista de regresiones: operaciones más lentas que la referencia más el umbral. """
+    regresiones = []
+    comparadas = 0
+    print(f"\nComparación con la referencia (umbral {umbral:.0%})")
+    for cantidad, operaciones in resultados.items():
+        for operacion, segundos in operaciones.items():
+            referencia = base.get(cantidad, {}).get(operacion)
+            if not referencia:
+                continue                            # operación nueva o cantidad no medida antes
+            comparadas += 1
+            variacion = segundos / referencia - 1
+            marca = "REGRESIÓN" if variacion > umbral else ""
+            print("{:>10} {:<45} {:>+8.1%} {}".format(cantidad, operacion, variacion, marca))
+            if variacion > umbral:
+                regresiones.append((cantidad, operacion, variacion))
+    if not comparadas:
+        raise ValueError("La referencia no tiene ninguna operación ni cantidad en común con esta medición.")
+    return regresiones
+
+def leer_base(ruta):
+    """ Lee los resultados de referencia guardados con --salida. Lanza ValueError con un mensaje
+    claro si el archivo no existe o no tiene el formato esperado. """
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            return json.load(archivo)["resultados"]
+    except FileNotFoundError:
+        raise ValueError(f"No existe el archivo de referencia '{ruta}'. Generarlo primero, con las mismas "
+                         f"cantidades, en esta máquina: python benchmark_paises.py 1000 100000 --salida {ruta}")
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"El archivo de referencia '{ruta}' no es una salida de --salida: {e}")
+
+
+# Prueba de concurrencia
+# ----------------------------------------------------------------
+def _escritor_estres(ruta, numero, cantidad):
+    """ Proceso escritor: agrega 'cantidad' países propios y actualiza cada uno. El registro de
+    cambios se compacta seguido para que también se reemplace el CSV completo. """
+    usar_archivo(ruta)
+    gestion.TAMANIO_MAXIMO_REGISTRO_CAMBIOS = 2_000
+    for i in range(cantidad):
+        nombre = f"Estres {numero}-{i}"
+        gestion.agregar_pais_a_archivo(nombre, 1, 1, "Europa")
+        gestion.actualizar_pais(nombre, numero * 1000 + i, i + 1)
+    return cantidad
+
+def _lector_estres(ruta, lecturas):
+    """ Proceso lector: lee el archivo completo varias veces. Devuelve la cantidad de lecturas
+    fallidas o inconsistentes (con errores o con menos países que la anterior). """
+    usar_archivo(ruta)
+    anterior = 0
+    fallas = 0
+    for _ in range(lecturas):
+        try:
+            cantidad = len(gestion._leer_paises())
+        except Exception:
+            fallas += 1
+            continue
+        if cantidad < anterior:                     # los países agregados nunca desaparecen
+            fallas += 1
+        anterior = cantidad
+    return fallas
+
+def prueba_estres(cantidad, procesos=4, escrituras=50, lecturas=50):
+    """ Ejecuta 'procesos' escritores y 'procesos' lectores a la vez sobre el mismo archivo
+    y verifica que no se pierdan escrituras ni haya lecturas a medio escribir. """
+    print(f"\nConcurrencia ({cantidad:,} países, {procesos} escritores y {procesos} lectores)")
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=2 * procesos) as ejecutor:
+        escritores = [ejecutor.submit(_escritor_estres, gestion.FILE_NAME, numero, escrituras)
+                      for numero in range(procesos)]
+        lectores = [ejecutor.submit(_lector_estres, gestion.FILE_NAME, lecturas)
+                    for _ in range(procesos)]
+        agregados = sum(tarea.result() for tarea in escritores)
+        fallas = sum(tarea.result() for tarea in lectores)
+    mostrar_resultado("escrituras y lecturas concurrentes", time.perf_counter() - inicio)
+    
+    gestion.invalidar_catalogo()
+    paises = gestion.obtener_paises()
+    errores = []
+    if len(paises) != cantidad + agregados:
+        errores.append(f"se esperaban {cantidad + agregados:,} países y hay {len(paises):,}")
+    for numero in range(procesos):
+        for i in range(escrituras):
+            pais = gestion.buscar_pais(paises, f"Estres {numero}-{i}")
+            if pais is None or pais[gestion.COL_POBLACION] != numero * 1000 + i:
+                errores.append(f"actualización perdida: Estres {numero}-{i}")
+    if fallas:
+        errores.append(f"{fallas} lecturas fallidas o inconsistentes")
+    try:
+        gestion.obtener_resumen_estadisticas(verificar=True)
+    except ValueError as e:
+        errores.append(str(e))
+    
+    for error in errores:
+        print(f"ERROR: {error}")
+    if not errores:
+        print("Sin escrituras perdidas ni lecturas inconsistentes.")
+    return not errores
+
+
+# ----------------------------------------------------------------
+# Programa principal
+# ----------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de gestión de datos de países.")
+    parser.add_argument("cantidades", nargs="*", type=int, default=[1_000, 10_000, 100_000],
+                        help="cantidades de países de los catálogos sintéticos (de 10³ a 10⁷)")
+    parser.add_argument("--salida", metavar="ARCHIVO",
+                        help="guarda los resultados de la suite en un archivo JSON")
+    parser.add_argument("--base", metavar="ARCHIVO",
+                        help="archivo JSON de referencia (una --salida anterior) contra el que comparar")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                        help="fracción de tiempo extra que se considera regresión (por defecto 0.20)")
+    parser.add_argument("--detalle", action="store_true",
+                        help="agrega las comparaciones de búsqueda, memoria y carga")
+    parser.add_argument("--estres", action="store_true",
+                        help="ejecuta solo la prueba de escritores y lectores concurrentes")
+    parser.add_argument("--procesos", type=int, default=4,
+                        help="cantidad de escritores (y de lectores) de la prueba de concurrencia")
+    argumentos = parser.parse_args()
+    base = None
+    if argumentos.base:
+        try:
+            base = leer_base(argumentos.base)       # antes de medir: falla enseguida si no existe
+        except ValueError as e:
+            parser.error(str(e))
+    
+    correcto = True
+    resultados = {}
+    with tempfile.TemporaryDirectory() as carpeta:
+        for cantidad in argumentos.cantidades:
+            ruta = os.path.join(carpeta, f"paises_{cantidad}.csv")
+            generar_archivo_paises(ruta, cantidad)
+            usar_archivo(ruta)
+            if argumentos.estres:
+                correcto = prueba_estres(cantidad, argumentos.procesos) and correcto
+                continue
+            if argumentos.detalle:
+                benchmark_busqueda_parcial(cantidad)
+                benchmark_memoria(cantidad)
+                benchmark_carga(cantidad)
+                benchmark_lectura_paralela(cantidad)
+            resultados[str(cantidad)] = ejecutar_suite(cantidad)   # claves de texto, como en JSON
+    
+    if resultados and argumentos.salida:
+        with open(argumentos.salida, mode="w", encoding="utf-8") as archivo:
+            json.dump({"python": platform.python_version(), "resultados": resultados}, archivo, indent=2)
+        print(f"\nResultados guardados en {argumentos.salida}")
+    if resultados and base is not None:
+        try:
+            regresiones = comparar_con_base(resultados, base, argumentos.umbral)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"Regresiones: {len(regresiones)}")
+        correcto = correcto and not regresiones
+    raise SystemExit(0 if correcto else 1)
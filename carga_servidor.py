@@ -0,0 +1,89 @@
+# PRUEBA DE CARGA DEL SERVIDOR DE PAÍSES
+# Abre varias conexiones keep-alive contra servidor_paises.py, envía
+# consultas variadas y muestra la latencia (p50, p90 y p99) y el rendimiento.
+# ------------------------------------------------------------
+
+import argparse  # módulo para leer las opciones de la línea de comandos
+import asyncio   # módulo para mantener muchas conexiones a la vez
+import time      # módulo para medir tiempos
+
+import GestionDatosPaises as gestion
+
+# Consultas que se envían, en rotación
+CONSULTAS = [
+    "/paises?continente=Europa&orden=POBLACION:desc",
+    "/paises?nombre=ar&limite=10",
+    "/paises?poblacion_min=1000000&poblacion_max=50000000&orden=NOMBRE",
+    "/paises?superficie_min=100000&continente=Asia&desde=20",
+    "/paises?orden=SUPERFICIE:desc,NOMBRE&limite=50",
+    "/estadisticas",
+]
+
+
+# Cliente
+# ----------------------------------------------------------------
+async def _pedir(lector, escritor, host, destino):
+    """ Envía un GET por la conexión abierta y devuelve el código de estado de la respuesta. """
+    escritor.write(f"GET {destino} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await escritor.drain()
+    estado = int((await lector.readline()).split()[1])
+    largo = 0
+    while True:
+        linea = await lector.readline()
+        if linea in (b"\r\n", b""):
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        if nombre.strip().lower() == "content-length":
+            largo = int(valor)
+    await lector.readexactly(largo)
+    return estado
+
+async def _conexion(host, puerto, pedidos, desplazamiento, latencias, errores):
+    """ Abre una conexión y envía 'pedidos' consultas seguidas, anotando la latencia de cada una. """
+    lector, escritor = await asyncio.open_connection(host, puerto)
+    try:
+        for numero in range(pedidos):
+            destino = CONSULTAS[(desplazamiento + numero) % len(CONSULTAS)]
+            inicio = time.perf_counter()
+            estado = await _pedir(lector, escritor, host, destino)
+            latencias.append(time.perf_counter() - inicio)
+            if estado != 200:
+                errores.append((destino, estado))
+    finally:
+        escritor.close()
+        await escritor.wait_closed()
+
+async def prueba_carga(host, puerto, conexiones, pedidos):
+    """ Ejecuta la prueba con 'conexiones' clientes simultáneos y muestra los resultados. """
+    latencias = []
+    errores = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(_conexion(host, puerto, pedidos, numero, latencias, errores)
+                           for numero in range(conexiones)))
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    print(f"Pedidos: {len(latencias):,} en {total:,.2f} s ({len(latencias) / total:,.0f} pedidos/s)")
+    for porcentaje in (50, 90, 99):
+        print(f"- p{porcentaje}: {gestion.percentil(latencias, porcentaje) * 1000:,.3f} ms")
+    print(f"- máximo: {latencias[-1] * 1000:,.3f} ms")
+    print(f"Respuestas con error: {len(errores)}")
+    for destino, estado in errores[:10]:
+        print(f"- {estado} {destino}")
+    return not errores
+
+
+# ----------------------------------------------------------------
+# Programa principal
+# ----------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor HTTP de países.")
+    parser.add_argument("--host", default="127.0.0.1", help="dirección del servidor")
+    parser.add_argument("--puerto", type=int, default=8000, help="puerto del servidor")
+    parser.add_argument("--conexiones", type=int, default=20, help="clientes simultáneos")
+    parser.add_argument("--pedidos", type=int, default=500, help="pedidos por conexión")
+    argumentos = parser.parse_args()
+
+    correcto = asyncio.run(prueba_carga(argumentos.host, argumentos.puerto,
+                                        argumentos.conexiones, argumentos.pedidos))
+    raise SystemExit(0 if correcto else 1)
@@ -0,0 +1,231 @@
+# SERVIDOR HTTP DE GESTIÓN DE DATOS DE PAÍSES
+# Expone las consultas del catálogo (búsqueda, filtros, orden y estadísticas)
+# como respuestas JSON, para que otros programas puedan usarlas sin el menú.
+# ------------------------------------------------------------
+
+import argparse  # módulo para leer las opciones de la línea de comandos
+import asyncio   # módulo para atender muchas conexiones en un solo hilo
+import json      # módulo para armar las respuestas
+import signal    # módulo para terminar ordenadamente con SIGTERM
+from concurrent.futures import ThreadPoolExecutor  # hilo donde se resuelven las consultas
+from http import HTTPStatus  # textos de los códigos de estado HTTP
+from urllib.parse import parse_qsl, unquote, urlsplit  # módulo para leer la ruta y los parámetros
+
+import GestionDatosPaises as gestion
+
+# Constantes
+# ----------------------------------------------------------------
+HOST = "127.0.0.1"
+PUERTO = 8000
+TIEMPO_ESPERA_CONEXION = 15        # segundos que una conexión keep-alive puede quedar sin pedidos
+TAMANIO_MAXIMO_ENCABEZADOS = 100   # cantidad máxima de líneas de encabezado por pedido
+LIMITE_POR_DEFECTO = gestion.TAMANIO_PAGINA  # países por página si no se indica 'limite'
+LIMITE_MAXIMO = 1000               # países por página como máximo
+
+# Las consultas se resuelven en un único hilo aparte, una por vez: el catálogo nunca se usa
+# desde dos hilos y, mientras se relee el archivo, el bucle de eventos sigue aceptando
+# conexiones, leyendo pedidos y enviando respuestas
+_ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="consultas")
+
+
+class ErrorConsulta(Exception):
+    """ Error en un pedido: se responde con el estado HTTP indicado y el mensaje en JSON. """
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# Lectura de parámetros
+# ----------------------------------------------------------------
+def _entero(parametros, nombre, por_defecto=None):
+    """ Devuelve el parámetro como entero >= 0, el valor por defecto si falta, o lanza ErrorConsulta. """
+    valor = parametros.get(nombre, "")
+    if valor == "":
+        return por_defecto
+    if not gestion.validar_entero_mayor_igual_que_cero(valor):
+        raise ErrorConsulta(HTTPStatus.BAD_REQUEST, f"'{nombre}' debe ser un entero mayor o igual que cero.")
+    return int(valor)
+
+def _rango(parametros, prefijo):
+    """ Arma el rango (desde, hasta) de los parámetros <prefijo>_min y <prefijo>_max, o None si faltan ambos. """
+    rango = (_entero(parametros, f"{prefijo}_min"), _entero(parametros, f"{prefijo}_max"))
+    return None if rango == (None, None) else rango
+
+def _criterios_orden(texto):
+    """ Convierte 'POBLACION:desc,NOMBRE' en [(COL_POBLACION, True), (COL_NOMBRE_PAIS, False)]. """
+    criterios = []
+    for parte in texto.split(","):
+        if not parte.strip():
+            continue
+        columna, _, direccion = parte.partition(":")
+        direccion = direccion.strip().lower() or "asc"
+        if direccion not in ("asc", "desc"):
+            raise ErrorConsulta(HTTPStatus.BAD_REQUEST, f"Dirección de orden inválida: '{direccion}'.")
+        criterios.append((columna.strip().upper(), direccion == "desc"))
+    return criterios
+
+
+# Rutas
+# ----------------------------------------------------------------
+def _consultar_paises(parametros):
+    """ GET /paises: búsqueda por nombre, filtros, orden y paginación. """
+    limite = _entero(parametros, "limite", LIMITE_POR_DEFECTO)
+    if limite > LIMITE_MAXIMO:
+        raise ErrorConsulta(HTTPStatus.BAD_REQUEST, f"'limite' no puede superar {LIMITE_MAXIMO}.")
+    desde = _entero(parametros, "desde", 0)
+    resultado = gestion.consultar_paises(
+        nombre=parametros.get("nombre") or None,
+        continente=parametros.get("continente") or None,
+        poblacion=_rango(parametros, "poblacion"),
+        superficie=_rango(parametros, "superficie"),
+        orden=_criterios_orden(parametros.get("orden", "")),
+        desde=desde,
+        limite=limite)
+    return resultado | {"desde": desde, "limite": limite}
+
+def _consultar_pais(nombre):
+    """ GET /paises/<nombre>: un país por nombre exacto. """
+    pais = gestion.consultar_pais(nombre)
+    if pais is None:
+        raise ErrorConsulta(HTTPStatus.NOT_FOUND, f"El país '{nombre}' no existe en el catálogo.")
+    return pais
+
+def resolver(ruta, parametros):
+    """ Ejecuta la consulta que corresponde a la ruta y devuelve (estado, datos a enviar en JSON). """
+    try:
+        if ruta == "/paises":
+            return HTTPStatus.OK, _consultar_paises(parametros)
+        if ruta.startswith("/paises/"):
+            return HTTPStatus.OK, _consultar_pais(unquote(ruta[len("/paises/"):]))
+        if ruta == "/estadisticas":
+            return HTTPStatus.OK, gestion.consultar_estadisticas()
+        if ruta == "/cache":
+            return HTTPStatus.OK, gestion.estadisticas_cache_consultas()
+        if ruta == "/metricas":
+            return HTTPStatus.OK, gestion.metricas_instrumentacion()
+        raise ErrorConsulta(HTTPStatus.NOT_FOUND, f"No existe la ruta '{ruta}'.")
+    except ErrorConsulta as e:
+        return e.estado, {"error": str(e)}
+    except ValueError as e:                         # parámetros rechazados por la API de consultas
+        return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+
+def responder(destino):
+    """ Devuelve (estado, cuerpo JSON en bytes) para el destino pedido. Los resultados de las
+    consultas se reutilizan desde la caché de consultas del módulo de gestión (LRU acotada). """
+    partes = urlsplit(destino)
+    ruta = partes.path.rstrip("/") or "/"
+    estado, datos = resolver(ruta, dict(parse_qsl(partes.query)))
+    return estado, json.dumps(datos, ensure_ascii=False).encode(gestion.ENCODING)
+
+
+# Servidor
+# ----------------------------------------------------------------
+async def _leer_pedido(lector):
+    """ Lee un pedido HTTP. Devuelve (método, destino, versión, encabezados) o None si la conexión se cerró. """
+    linea = await asyncio.wait_for(lector.readline(), TIEMPO_ESPERA_CONEXION)
+    if not linea:
+        return None
+    try:
+        metodo, destino, version = linea.decode("latin-1").split()
+    except ValueError:
+        raise ErrorConsulta(HTTPStatus.BAD_REQUEST, "Línea de pedido inválida.")
+
+    encabezados = {}
+    for _ in range(TAMANIO_MAXIMO_ENCABEZADOS):
+        linea = await asyncio.wait_for(lector.readline(), TIEMPO_ESPERA_CONEXION)
+        if linea in (b"\r\n", b"\n", b""):
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        encabezados[nombre.strip().lower()] = valor.strip()
+    else:
+        raise ErrorConsulta(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Demasiados encabezados.")
+
+    largo = encabezados.get("content-length", "0")
+    if largo.isdigit() and int(largo) > 0:          # las consultas no usan cuerpo: se descarta
+        await lector.readexactly(int(largo))
+    return metodo, destino, version, encabezados
+
+def _armar_respuesta(estado, cuerpo, mantener):
+    """ Arma los bytes de la respuesta HTTP con el cuerpo JSON. """
+    encabezado = (f"HTTP/1.1 {estado.value} {estado.phrase}\r\n"
+                  f"Content-Type: application/json; charset={gestion.ENCODING}\r\n"
+                  f"Content-Length: {len(cuerpo)}\r\n"
+                  f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n")
+    return encabezado.encode("latin-1") + cuerpo
+
+async def atender_conexion(lector, escritor):
+    """ Atiende los pedidos de una conexión mientras el cliente la mantenga abierta (keep-alive).
+    Cada consulta se resuelve en el hilo de consultas (_ejecutor), sin bloquear el bucle de eventos. """
+    bucle = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                pedido = await _leer_pedido(lector)
+            except ErrorConsulta as e:
+                cuerpo = json.dumps({"error": str(e)}, ensure_ascii=False).encode(gestion.ENCODING)
+                escritor.write(_armar_respuesta(e.estado, cuerpo, mantener=False))
+                break
+            if pedido is None:
+                break
+            metodo, destino, version, encabezados = pedido
+            conexion = encabezados.get("connection", "").lower()
+            # HTTP/1.1 mantiene la conexión salvo que se pida cerrarla; HTTP/1.0 solo si se pide
+            mantener = conexion != "close" if version == "HTTP/1.1" else conexion == "keep-alive"
+
+            if metodo != "GET":
+                estado = HTTPStatus.METHOD_NOT_ALLOWED
+                cuerpo = json.dumps({"error": "Solo se admiten pedidos GET."}).encode(gestion.ENCODING)
+            else:
+                try:
+                    estado, cuerpo = await bucle.run_in_executor(_ejecutor, responder, destino)
+                except Exception as e:              # archivo ilegible u otro error inesperado
+                    estado = HTTPStatus.INTERNAL_SERVER_ERROR
+                    cuerpo = json.dumps({"error": str(e)}, ensure_ascii=False).encode(gestion.ENCODING)
+            escritor.write(_armar_respuesta(estado, cuerpo, mantener))
+            await escritor.drain()
+            if not mantener:
+                break
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+        pass                                        # cliente inactivo o desconectado
+    finally:
+        escritor.close()
+        try:
+            await escritor.wait_closed()
+        except ConnectionError:
+            pass
+
+async def iniciar_servidor(host=HOST, puerto=PUERTO):
+    """ Carga el catálogo y atiende pedidos hasta que se interrumpa el programa. """
+    # el primer pedido no paga la carga del archivo
+    await asyncio.get_running_loop().run_in_executor(_ejecutor, gestion.obtener_paises)
+    servidor = await asyncio.start_server(atender_conexion, host, puerto)
+    direcciones = ", ".join(f"http://{host}:{socket.getsockname()[1]}" for socket in servidor.sockets)
+    print(f"Servidor de países escuchando en {direcciones}")
+    try:
+        # al recibir SIGTERM se termina normalmente (y se guardan las métricas, si se pidieron)
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass                                        # Windows: no hay manejadores de señales
+    async with servidor:
+        try:
+            await servidor.serve_forever()
+        except asyncio.CancelledError:
+            print("Servidor detenido.")
+
+
+# ----------------------------------------------------------------
+# Programa principal
+# ----------------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON del catálogo de países.")
+    parser.add_argument("--host", default=HOST, help="dirección donde escuchar")
+    parser.add_argument("--puerto", type=int, default=PUERTO, help="puerto donde escuchar")
+    parser.add_argument("--archivo", default=gestion.FILE_NAME, help="archivo CSV del catálogo")
+    argumentos = parser.parse_args()
+
+    gestion.FILE_NAME = argumentos.archivo
+    gestion.activar_instrumentacion_desde_entorno()   # métricas opcionales (GESTION_PAISES_METRICAS)
+    try:
+        asyncio.run(iniciar_servidor(argumentos.host, argumentos.puerto))
+    except KeyboardInterrupt:
+        print("Servidor detenido.")
@@ -0,0 +1,38 @@
+# Configuración común de las pruebas: cada prueba trabaja sobre un catálogo
+# de ejemplo en una carpeta temporal, con el estado en memoria limpio.
+# ------------------------------------------------------------
+
+import pytest
+
+import GestionDatosPaises as gestion
+
+CSV_EJEMPLO = (
+    "NOMBRE,POBLACION,SUPERFICIE,CONTINENTE\n"
+    "Argentina,45000000,2780400,America\n"
+    "Chile,19000000,756102,America\n"
+    "Francia,68000000,643801,Europa\n"
+    "España,48000000,505990,Europa\n"
+    "India,1400000000,3287263,Asia\n"
+    "Japón,125000000,377975,Asia\n"
+    "Kenia,54000000,580367,Africa\n"
+    "Egipto,104000000,1002450,Africa\n"
+    "Australia,26000000,7692024,Oceania\n"
+    "Fiyi,900000,18274,Oceania\n"
+)
+
+
+def _limpiar_estado():
+    """ Descarta el catálogo, las estadísticas y la caché de consultas en memoria. """
+    gestion.invalidar_catalogo()
+    gestion._resumen["firma"] = None
+
+
+@pytest.fixture
+def archivo_paises(tmp_path, monkeypatch):
+    """ Crea el catálogo de ejemplo en una carpeta temporal y hace que el programa lo use. """
+    ruta = tmp_path / "gestion.paises.csv"
+    ruta.write_text(CSV_EJEMPLO, encoding=gestion.ENCODING)
+    monkeypatch.setattr(gestion, "FILE_NAME", str(ruta))
+    _limpiar_estado()
+    yield ruta
+    _limpiar_estado()
@@ -0,0 +1,33 @@
+# Pruebas del almacén columnar (AlmacenPaises).
+# ------------------------------------------------------------
+
+import os
+
+import pytest
+
+import GestionDatosPaises as gestion
+
+
+def test_columnar_igual_a_diccionarios(archivo_paises):
+    columnar = gestion.leer_paises_desde_archivo(columnar=True)
+    assert [dict(pais) for pais in columnar] == gestion.leer_paises_desde_archivo()
+
+
+def test_mas_de_256_continentes(archivo_paises):
+    almacen = gestion.AlmacenPaises(
+        {gestion.COL_NOMBRE_PAIS: f"Pais {numero}", gestion.COL_POBLACION: numero,
+         gestion.COL_SUPERFICIE: numero, gestion.COL_CONTINENTE: f"Continente {numero}"}
+        for numero in range(300))
+    assert almacen[299][gestion.COL_CONTINENTE] == "Continente 299"
+
+    gestion.guardar_snapshot(almacen, os.stat(archivo_paises))
+    cargado = gestion.cargar_snapshot()
+    assert [dict(pais) for pais in cargado] == [dict(pais) for pais in almacen]
+
+
+def test_demasiados_continentes_da_error_claro(monkeypatch):
+    monkeypatch.setattr(gestion, "MAXIMO_CONTINENTES_COLUMNAR", 2)
+    almacen = gestion.AlmacenPaises()
+    almacen.extender_columnas(["A", "B"], [1, 2], [1, 2], ["Uno", "Dos"])
+    with pytest.raises(ValueError, match="continentes distintos"):
+        almacen.extender_columnas(["C"], [3], [3], ["Tres"])
@@ -0,0 +1,70 @@
+# Pruebas del bloqueo del archivo (bloqueo_archivo) y de las altas concurrentes.
+# ------------------------------------------------------------
+
+import threading
+import time
+
+import pytest
+
+import GestionDatosPaises as gestion
+
+
+def test_bloqueos_anidados(archivo_paises):
+    with gestion.bloqueo_archivo():
+        assert (gestion._bloqueo.nivel, gestion._bloqueo.exclusivo) == (1, False)
+        with gestion.bloqueo_archivo(exclusivo=True):   # se convierte en exclusivo mientras dure
+            assert (gestion._bloqueo.nivel, gestion._bloqueo.exclusivo) == (2, True)
+            with gestion.bloqueo_archivo():             # dentro de uno exclusivo sigue exclusivo
+                assert (gestion._bloqueo.nivel, gestion._bloqueo.exclusivo) == (3, True)
+            assert gestion._bloqueo.exclusivo
+        assert (gestion._bloqueo.nivel, gestion._bloqueo.exclusivo) == (1, False)
+    assert gestion._bloqueo.nivel == 0
+    assert gestion._bloqueo.archivo is None
+
+
+def test_bloqueo_se_libera_ante_un_error(archivo_paises):
+    with pytest.raises(RuntimeError):
+        with gestion.bloqueo_archivo(exclusivo=True):
+            raise RuntimeError("falla dentro del bloqueo")
+    assert gestion._bloqueo.nivel == 0
+    assert gestion._bloqueo.archivo is None
+
+
+def test_cada_hilo_tiene_su_bloqueo(archivo_paises):
+    tomado = threading.Event()
+    nivel_en_el_hilo = []
+
+    def lector():
+        nivel_en_el_hilo.append(gestion._bloqueo.nivel)
+        with gestion.bloqueo_archivo():
+            tomado.set()
+
+    with gestion.bloqueo_archivo(exclusivo=True):
+        hilo = threading.Thread(target=lector)
+        hilo.start()
+        time.sleep(0.1)
+        assert not tomado.is_set()                      # espera a que se libere el exclusivo
+    hilo.join(5)
+    assert tomado.is_set()
+    assert nivel_en_el_hilo == [0]                      # no ve el nivel del otro hilo
+
+
+def test_alta_duplicada_por_otro_proceso(archivo_paises):
+    gestion.obtener_paises()
+    with open(archivo_paises, mode="a", encoding=gestion.ENCODING) as archivo:
+        archivo.write("Peru,34000000,1285216,America\n")   # otro proceso agregó el mismo país
+
+    with pytest.raises(ValueError, match="ya existe"):
+        gestion.agregar_pais_a_archivo("Peru", 1, 1, "America")
+    contenido = archivo_paises.read_text(encoding=gestion.ENCODING)
+    assert contenido.count("Peru,") == 1
+
+
+def test_alta_con_nombres_repetidos_en_el_mismo_lote(archivo_paises):
+    with pytest.raises(ValueError, match="ya existe"):
+        gestion._agregar_paises_a_archivo([
+            {gestion.COL_NOMBRE_PAIS: "Peru", gestion.COL_POBLACION: 1,
+             gestion.COL_SUPERFICIE: 1, gestion.COL_CONTINENTE: "America"},
+            {gestion.COL_NOMBRE_PAIS: "PERU", gestion.COL_POBLACION: 2,
+             gestion.COL_SUPERFICIE: 2, gestion.COL_CONTINENTE: "America"}])
+    assert "Peru" not in archivo_paises.read_text(encoding=gestion.ENCODING)
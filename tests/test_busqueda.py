@@ -0,0 +1,115 @@
+# Pruebas de la búsqueda parcial con el índice de trigramas (buscar_paises).
+# ------------------------------------------------------------
+
+import random
+
+import pytest
+
+import GestionDatosPaises as gestion
+
+SILABAS = ["ar", "ba", "ca", "dé", "el", "fi", "gá", "hu", "in", "jo", "ka", "lí",
+           "ma", "ñe", "or", "pa", "qui", "ró", "sa", "tü", "ur", "va", "xe", "zo"]
+
+
+def _escribir_nombres_aleatorios(ruta, cantidad, semilla=3):
+    """ Catálogo con nombres inventados (con acentos y eñes) y algunos repetidos como parte de otros. """
+    generador = random.Random(semilla)
+    nombres = set()
+    while len(nombres) < cantidad:
+        nombre = "".join(generador.choice(SILABAS) for _ in range(generador.randint(2, 5)))
+        nombres.add(nombre.capitalize())
+    with open(ruta, mode="w", encoding=gestion.ENCODING) as archivo:
+        archivo.write("NOMBRE,POBLACION,SUPERFICIE,CONTINENTE\n")
+        for nombre in sorted(nombres):
+            archivo.write(f"{nombre},1,1,Asia\n")
+    return sorted(nombres)
+
+
+def _consultas(nombres, generador, cantidad):
+    """ Fragmentos de nombres existentes, con y sin un error, y textos que no aparecen. """
+    consultas = []
+    for _ in range(cantidad):
+        nombre = generador.choice(nombres)
+        largo = generador.randint(1, min(9, len(nombre)))
+        inicio = generador.randint(0, len(nombre) - largo)
+        fragmento = nombre[inicio:inicio + largo]
+        posicion = generador.randint(0, len(fragmento) - 1)
+        consultas += [
+            fragmento,
+            fragmento.upper(),
+            fragmento[:posicion] + "x" + fragmento[posicion + 1:],            # letra cambiada
+            fragmento[:posicion] + fragmento[posicion + 1:],                  # letra de menos
+            fragmento[:posicion] + "w" + fragmento[posicion:],                # letra de más
+        ]
+    return consultas + ["zzzz", "qqqqqqq", "Ñandú"]
+
+
+@pytest.mark.parametrize("ignorar_acentos", [False, True])
+@pytest.mark.parametrize("tolerar_errores", [False, True])
+def test_indice_igual_que_recorrido_lineal(archivo_paises, ignorar_acentos, tolerar_errores):
+    nombres = _escribir_nombres_aleatorios(archivo_paises, 300)
+    paises = gestion.obtener_paises()
+    copia = list(paises)                            # otra lista: recorre todos los países
+    for consulta in _consultas(nombres, random.Random(4), 80):
+        if not consulta:
+            continue
+        esperado = gestion.buscar_paises(copia, consulta, ignorar_acentos=ignorar_acentos,
+                                         tolerar_errores=tolerar_errores)
+        obtenido = gestion.buscar_paises(paises, consulta, ignorar_acentos=ignorar_acentos,
+                                         tolerar_errores=tolerar_errores)
+        assert obtenido == esperado, consulta
+
+
+def test_candidatos_filtrados_por_trigramas(archivo_paises):
+    gestion.obtener_paises()
+    posiciones = list(gestion._candidatos_por_trigramas("stral"))
+    assert [gestion._catalogo["paises"][p][gestion.COL_NOMBRE_PAIS] for p in posiciones] == ["Australia"]
+    assert list(gestion._candidatos_por_trigramas("xyz")) == []
+    # con un error se buscan las mitades: "ausxralia" conserva "ralia"
+    posiciones = gestion._candidatos_por_trigramas("ausxralia", tolerar_errores=True)
+    assert [gestion._catalogo["paises"][p][gestion.COL_NOMBRE_PAIS] for p in posiciones] == ["Australia"]
+
+
+def test_orden_exacto_prefijo_y_contenido(archivo_paises):
+    for nombre in ("India Chica", "Indiana", "Gran India"):
+        gestion.agregar_pais_a_archivo(nombre, 1, 1, "Asia")
+    nombres = [pais[gestion.COL_NOMBRE_PAIS] for pais in gestion.buscar_paises(gestion.obtener_paises(), "india")]
+    assert nombres == ["India", "India Chica", "Indiana", "Gran India"]
+    assert len(gestion.buscar_paises(gestion.obtener_paises(), "india", limite=2)) == 2
+
+
+def test_sin_acentos(archivo_paises):
+    paises = gestion.obtener_paises()
+    assert gestion.buscar_paises(paises, "japon") == []                     # distingue acentos
+    encontrados = gestion.buscar_paises(paises, "JAPON", ignorar_acentos=True)
+    assert [pais[gestion.COL_NOMBRE_PAIS] for pais in encontrados] == ["Japón"]
+
+
+def test_con_un_error(archivo_paises):
+    paises = gestion.obtener_paises()
+    assert gestion.buscar_paises(paises, "australa") == []
+    for consulta in ("australa", "austrlia", "austrxlia", "aaustralia"):
+        encontrados = gestion.buscar_paises(paises, consulta, tolerar_errores=True)
+        assert [pais[gestion.COL_NOMBRE_PAIS] for pais in encontrados] == ["Australia"], consulta
+    assert gestion.buscar_paises(paises, "asutralia", tolerar_errores=True) == []   # dos errores
+
+
+def _distancia_minima(texto, patron):
+    """ Referencia: menor distancia de edición entre el patrón y una subcadena del texto (Sellers). """
+    fila = list(range(len(patron) + 1))
+    mejor = fila[-1]
+    for caracter in texto:
+        anterior, fila = fila, [0]
+        for j in range(1, len(patron) + 1):
+            costo = 0 if patron[j - 1] == caracter else 1
+            fila.append(min(anterior[j] + 1, fila[j - 1] + 1, anterior[j - 1] + costo))
+        mejor = min(mejor, fila[-1])
+    return mejor
+
+
+def test_contiene_con_un_error_igual_que_distancia_de_edicion():
+    generador = random.Random(5)
+    for _ in range(3000):
+        texto = "".join(generador.choice("abc.") for _ in range(generador.randint(0, 8)))
+        patron = "".join(generador.choice("abc.") for _ in range(generador.randint(1, 5)))
+        assert gestion._contiene_con_un_error(texto, patron) == (_distancia_minima(texto, patron) <= 1), (texto, patron)
@@ -0,0 +1,76 @@
+# Pruebas de la caché de consultas y de su invalidación.
+# ------------------------------------------------------------
+
+import pytest
+
+import GestionDatosPaises as gestion
+
+
+@pytest.fixture
+def cache_limpia(archivo_paises):
+    gestion.vaciar_cache_consultas()
+    for contador in ("aciertos", "fallos", "desalojos"):
+        gestion._cache_consultas[contador] = 0
+    return archivo_paises
+
+
+def test_consulta_repetida_usa_la_cache(cache_limpia):
+    primera = gestion.consultar_paises(continente="Europa")
+    segunda = gestion.consultar_paises(continente="europa")   # misma consulta normalizada
+    assert primera == segunda
+    estadisticas = gestion.estadisticas_cache_consultas()
+    assert (estadisticas["aciertos"], estadisticas["fallos"]) == (1, 1)
+
+
+def test_alta_vacia_la_cache(cache_limpia):
+    antes = gestion.consultar_paises(continente="America")
+    generacion = gestion.generacion_catalogo()
+    gestion.agregar_pais_a_archivo("Peru", 34000000, 1285216, "America")
+
+    assert gestion.generacion_catalogo() > generacion
+    assert gestion.estadisticas_cache_consultas()["entradas"] == 0
+    despues = gestion.consultar_paises(continente="America")
+    assert despues["total"] == antes["total"] + 1
+
+
+def test_modificacion_vacia_la_cache(cache_limpia):
+    gestion.consultar_paises(poblacion=(100000000, None))
+    gestion.actualizar_pais("Fiyi", 200000000, 18274)
+    nombres = [pais[gestion.COL_NOMBRE_PAIS] for pais in gestion.consultar_paises(poblacion=(100000000, None))["paises"]]
+    assert "Fiyi" in nombres
+
+
+def test_cambio_externo_del_archivo_vacia_la_cache(cache_limpia):
+    gestion.consultar_paises(nombre="peru")
+    with open(cache_limpia, mode="a", encoding=gestion.ENCODING) as archivo:
+        archivo.write("Peru,34000000,1285216,America\n")   # otro proceso agregó un país
+    assert gestion.consultar_paises(nombre="peru")["total"] == 1
+
+
+def test_cache_desaloja_la_menos_usada(cache_limpia, monkeypatch):
+    monkeypatch.setattr(gestion, "TAMANIO_MAXIMO_CACHE_CONSULTAS", 2)
+    gestion.consultar_paises(continente="Asia")
+    gestion.consultar_paises(continente="Africa")
+    gestion.consultar_paises(continente="Asia")         # Africa pasa a ser la menos usada
+    gestion.consultar_paises(continente="Europa")
+    assert gestion.estadisticas_cache_consultas()["desalojos"] == 1
+
+    gestion.consultar_paises(continente="Asia")         # sigue guardada
+    assert gestion.estadisticas_cache_consultas()["aciertos"] == 2
+
+
+def test_resultado_devuelto_no_altera_la_cache(cache_limpia):
+    resultado = gestion.consultar_paises(continente="Asia")
+    resultado["paises"][0][gestion.COL_POBLACION] = 0
+    assert gestion.consultar_paises(continente="Asia")["paises"][0][gestion.COL_POBLACION] != 0
+
+
+def test_rangos_como_lista_o_tupla_son_la_misma_consulta(cache_limpia):
+    como_lista = gestion.consultar_paises(poblacion=[1000000, 60000000], superficie=[100000, None])
+    como_tupla = gestion.consultar_paises(poblacion=(1000000, 60000000), superficie=(100000, None))
+    assert como_lista == como_tupla
+    assert (gestion.estadisticas_cache_consultas()["aciertos"], gestion.estadisticas_cache_consultas()["fallos"]) == (1, 1)
+
+    assert gestion.filtrar_catalogo(poblacion=[1000000, 60000000]) == gestion.filtrar_catalogo(poblacion=(1000000, 60000000))
+    with pytest.raises(ValueError):
+        gestion.consultar_paises(poblacion=[1, 2, 3])
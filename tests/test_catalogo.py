@@ -0,0 +1,38 @@
+# Pruebas del catálogo en memoria (obtener_paises) y su relectura.
+# ------------------------------------------------------------
+
+import pytest
+
+import GestionDatosPaises as gestion
+
+
+def test_catalogo_se_reutiliza_mientras_no_cambia(archivo_paises):
+    assert gestion.obtener_paises() is gestion.obtener_paises()
+
+
+def test_catalogo_se_relee_si_el_archivo_cambia(archivo_paises):
+    primero = gestion.obtener_paises()
+    with open(archivo_paises, mode="a", encoding=gestion.ENCODING) as archivo:
+        archivo.write("Peru,34000000,1285216,America\n")   # cambio hecho por otro proceso
+    segundo = gestion.obtener_paises()
+    assert segundo is not primero
+    assert gestion.buscar_pais(segundo, "peru") is not None
+
+
+def test_lectura_fallida_no_queda_en_el_catalogo(archivo_paises, capsys):
+    contenido = archivo_paises.read_text(encoding=gestion.ENCODING)
+    archivo_paises.write_text(contenido + "Peru,muchos,1285216,America\n", encoding=gestion.ENCODING)
+    assert gestion.obtener_paises() == []
+    assert "Error de formato" in capsys.readouterr().out
+    assert gestion._catalogo["paises"] is None
+
+    archivo_paises.write_text(contenido + "Peru,34000000,1285216,America\n", encoding=gestion.ENCODING)
+    assert len(gestion.obtener_paises()) == 11
+
+
+def test_escrituras_fallan_si_no_se_puede_leer(archivo_paises):
+    contenido = archivo_paises.read_text(encoding=gestion.ENCODING)
+    archivo_paises.write_text(contenido + "Peru,muchos,1285216,America\n", encoding=gestion.ENCODING)
+    with pytest.raises(ValueError, match="No se pudo leer"):
+        gestion.agregar_pais_a_archivo("Uruguay", 3500000, 176215, "America")
+    assert "Uruguay" not in archivo_paises.read_text(encoding=gestion.ENCODING)
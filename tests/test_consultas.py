@@ -0,0 +1,59 @@
+# Pruebas de la API de consultas (consultar_paises, consultar_pais).
+# ------------------------------------------------------------
+
+import pytest
+
+import GestionDatosPaises as gestion
+
+
+def _nombres(resultado):
+    return [pais[gestion.COL_NOMBRE_PAIS] for pais in resultado["paises"]]
+
+
+def test_busqueda_corta_sin_coincidencias_no_tolera_errores(archivo_paises):
+    # con una o dos letras, un error de tipeo coincidiría con todos los países
+    assert gestion.consultar_paises(nombre="q") == {"total": 0, "paises": []}
+    assert gestion.consultar_paises(nombre="qz")["total"] == 0
+
+
+def test_busqueda_exacta_primero(archivo_paises):
+    resultado = gestion.consultar_paises(nombre="chile")
+    assert _nombres(resultado) == ["Chile"]
+
+
+def test_busqueda_parcial_sin_acentos(archivo_paises):
+    assert _nombres(gestion.consultar_paises(nombre="japon")) == ["Japón"]
+    assert _nombres(gestion.consultar_paises(nombre="ar")) == ["Argentina"]
+
+
+def test_busqueda_con_error_de_tipeo(archivo_paises):
+    assert _nombres(gestion.consultar_paises(nombre="Fracia")) == ["Francia"]   # falta una letra
+    assert _nombres(gestion.consultar_paises(nombre="Kenya")) == ["Kenia"]      # letra cambiada
+
+
+def test_busqueda_con_filtros_y_orden(archivo_paises):
+    resultado = gestion.consultar_paises(nombre="a", continente="Europa",
+                                         orden=[(gestion.COL_POBLACION, True)])
+    assert _nombres(resultado) == ["Francia", "España"]
+
+
+def test_paginacion(archivo_paises):
+    orden = [(gestion.COL_NOMBRE_PAIS, False)]
+    completo = _nombres(gestion.consultar_paises(orden=orden))
+    pagina = gestion.consultar_paises(orden=orden, desde=3, limite=4)
+    assert pagina["total"] == 10
+    assert _nombres(pagina) == completo[3:7]
+
+
+def test_parametros_invalidos(archivo_paises):
+    with pytest.raises(ValueError):
+        gestion.consultar_paises(orden=[("CAPITAL", False)])
+    with pytest.raises(ValueError):
+        gestion.consultar_paises(poblacion=(10, 5))
+    with pytest.raises(ValueError):
+        gestion.consultar_paises(desde=-1)
+
+
+def test_consultar_pais(archivo_paises):
+    assert gestion.consultar_pais("JAPON")[gestion.COL_NOMBRE_PAIS] == "Japón"
+    assert gestion.consultar_pais("Jap") is None
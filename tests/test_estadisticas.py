@@ -0,0 +1,37 @@
+# Pruebas de las estadísticas incrementales y de la distribución guardada.
+# ------------------------------------------------------------
+
+import GestionDatosPaises as gestion
+
+
+def _distribucion_completa():
+    completo = gestion.calcular_estadisticas(gestion.leer_paises_desde_archivo())
+    return {columna: (completo[columna]["mediana"], completo[columna]["percentiles"])
+            for columna in gestion.COLUMNAS_NUMERICAS}
+
+
+def _distribucion(estadisticas):
+    return {columna: (estadisticas[columna]["mediana"], estadisticas[columna]["percentiles"])
+            for columna in gestion.COLUMNAS_NUMERICAS}
+
+
+def test_estadisticas_al_reiniciar_no_cargan_el_catalogo(archivo_paises):
+    primera = gestion.consultar_estadisticas()
+    gestion.invalidar_catalogo()                    # como al reiniciar el programa
+    gestion._resumen["firma"] = None
+
+    segunda = gestion.consultar_estadisticas()
+    assert gestion._catalogo["paises"] is None
+    assert segunda == primera
+    assert _distribucion(segunda) == _distribucion_completa()
+
+
+def test_distribucion_se_actualiza_con_los_cambios(archivo_paises):
+    gestion.consultar_estadisticas()
+    gestion.actualizar_pais("Fiyi", 2000000000, 18274)
+    gestion.agregar_pais_a_archivo("Peru", 34000000, 1285216, "America")
+
+    estadisticas = gestion.consultar_estadisticas()
+    assert _distribucion(estadisticas) == _distribucion_completa()
+    assert estadisticas["pais_mayor_poblacion"][gestion.COL_NOMBRE_PAIS] == "Fiyi"
+    gestion.obtener_resumen_estadisticas(verificar=True)
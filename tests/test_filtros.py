@@ -0,0 +1,53 @@
+# Pruebas de los filtros por rangos con los índices ordenados del catálogo.
+# ------------------------------------------------------------
+
+import random
+
+import GestionDatosPaises as gestion
+
+
+def _escribir_catalogo_aleatorio(ruta, cantidad, semilla=1):
+    generador = random.Random(semilla)
+    continentes = [continente.capitalize() for continente in gestion.CONTINENTES_VALIDOS]
+    with open(ruta, mode="w", encoding=gestion.ENCODING) as archivo:
+        archivo.write("NOMBRE,POBLACION,SUPERFICIE,CONTINENTE\n")
+        for numero in range(cantidad):
+            # valores chicos para que haya muchos empates
+            archivo.write(f"Pais {numero},{generador.randint(1, 50)},{generador.randint(1, 50)},"
+                          f"{generador.choice(continentes)}\n")
+
+
+def _rango_aleatorio(generador):
+    desde = generador.choice([None, generador.randint(0, 50)])
+    hasta = generador.choice([None, generador.randint(0, 50)])
+    return None if desde is None and hasta is None else (desde, hasta)
+
+
+def test_filtros_con_indices_igual_que_recorrido_lineal(archivo_paises):
+    _escribir_catalogo_aleatorio(archivo_paises, 500)
+    paises = gestion.obtener_paises()
+    copia = list(paises)                            # otra lista: recorre todos los países
+    generador = random.Random(2)
+    for _ in range(300):
+        poblacion = _rango_aleatorio(generador)
+        superficie = _rango_aleatorio(generador)
+        continente = generador.choice([None, "europa", "ASIA", "Antartida"])
+        esperado = gestion.filtrar_paises_por_rangos(copia, poblacion, superficie, continente)
+        assert gestion.filtrar_paises_por_rangos(paises, poblacion, superficie, continente) == esperado
+
+
+def test_indices_ordenados_despues_de_modificar(archivo_paises):
+    _escribir_catalogo_aleatorio(archivo_paises, 200)
+    paises = gestion.obtener_paises()
+    gestion.filtrar_paises_por_rangos(paises, poblacion=(10, 20))   # construye los índices
+    gestion.actualizar_pais("Pais 7", 1000, 1000)
+    gestion.agregar_pais_a_archivo("Nuevo", 1000, 5, "Asia")
+
+    paises = gestion.obtener_paises()
+    for columna in gestion.COLUMNAS_NUMERICAS:
+        valores, posiciones = gestion._indice("indices_ordenados")[columna]
+        assert valores == sorted(pais[columna] for pais in paises)
+        assert [paises[posicion][columna] for posicion in posiciones] == valores
+        assert list(zip(valores, posiciones)) == sorted(zip(valores, posiciones))   # empates por posición
+    encontrados = gestion.filtrar_paises_por_rangos(paises, poblacion=(1000, None))
+    assert [pais[gestion.COL_NOMBRE_PAIS] for pais in encontrados] == ["Pais 7", "Nuevo"]
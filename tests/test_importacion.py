@@ -0,0 +1,121 @@
+# Pruebas de la importación masiva (importar_paises y --importar).
+# ------------------------------------------------------------
+
+import json
+import os
+
+import pytest
+
+import GestionDatosPaises as gestion
+
+
+def _nombres_en_catalogo():
+    return [pais[gestion.COL_NOMBRE_PAIS] for pais in gestion.obtener_paises()]
+
+
+def test_importa_csv(archivo_paises, tmp_path):
+    origen = tmp_path / "nuevos.csv"
+    origen.write_text("NOMBRE,POBLACION,SUPERFICIE,CONTINENTE\n"
+                      "peru,34000000,1285216,america\n"
+                      "Italia,59000000,301340,Europa\n", encoding=gestion.ENCODING)
+    resultado = gestion.importar_paises(str(origen))
+
+    assert resultado == {"importados": 2, "rechazados": []}
+    assert _nombres_en_catalogo()[-2:] == ["Peru", "Italia"]     # mismo formato que el ingreso manual
+    gestion.invalidar_catalogo()                                 # también quedaron en el archivo
+    assert _nombres_en_catalogo()[-2:] == ["Peru", "Italia"]
+
+
+def test_importa_json_lines(archivo_paises, tmp_path):
+    origen = tmp_path / "nuevos.jsonl"
+    filas = [{"NOMBRE": "Peru", "POBLACION": 34000000, "SUPERFICIE": 1285216, "CONTINENTE": "America"},
+             {"NOMBRE": "Italia", "POBLACION": "59000000", "SUPERFICIE": "301340", "CONTINENTE": "Europa"}]
+    origen.write_text("\n".join(json.dumps(fila) for fila in filas) + "\n\n{no es json}\n",
+                      encoding=gestion.ENCODING)
+    resultado = gestion.importar_paises(str(origen))
+
+    assert resultado["importados"] == 2
+    assert [rechazo["fila"] for rechazo in resultado["rechazados"]] == [4]
+    assert resultado["rechazados"][0]["motivo"].startswith("JSON inválido")
+
+
+def test_rechaza_duplicados_del_catalogo_y_del_archivo(archivo_paises):
+    resultado = gestion.importar_paises([
+        {"NOMBRE": "JAPON", "POBLACION": 1, "SUPERFICIE": 1, "CONTINENTE": "Asia"},    # ya está (Japón)
+        {"NOMBRE": "Peru", "POBLACION": 1, "SUPERFICIE": 1, "CONTINENTE": "America"},
+        {"NOMBRE": "perú", "POBLACION": 2, "SUPERFICIE": 2, "CONTINENTE": "America"},  # repetido en la importación
+    ])
+    assert resultado["importados"] == 1
+    assert [rechazo["fila"] for rechazo in resultado["rechazados"]] == [1, 3]
+    assert all("ya existe" in rechazo["motivo"] for rechazo in resultado["rechazados"])
+    assert _nombres_en_catalogo().count("Peru") == 1
+
+
+@pytest.mark.parametrize("fila", [
+    {"NOMBRE": "", "POBLACION": 1, "SUPERFICIE": 1, "CONTINENTE": "Asia"},
+    {"NOMBRE": "Peru", "POBLACION": 0, "SUPERFICIE": 1, "CONTINENTE": "America"},
+    {"NOMBRE": "Peru", "POBLACION": "muchos", "SUPERFICIE": 1, "CONTINENTE": "America"},
+    {"NOMBRE": "Peru", "POBLACION": 1, "SUPERFICIE": -5, "CONTINENTE": "America"},
+    {"NOMBRE": "Peru", "POBLACION": 1, "SUPERFICIE": 1, "CONTINENTE": "Atlantida"},
+    ["Peru", 1, 1, "America"],
+])
+def test_rechaza_filas_invalidas(archivo_paises, fila):
+    tamanio = os.path.getsize(archivo_paises)
+    resultado = gestion.importar_paises([fila])
+    assert resultado["importados"] == 0
+    assert len(resultado["rechazados"]) == 1
+    assert os.path.getsize(archivo_paises) == tamanio            # no se escribe nada
+
+
+def test_falla_al_escribir_deja_el_archivo_como_estaba(archivo_paises, monkeypatch):
+    contenido = archivo_paises.read_bytes()
+    catalogo = _nombres_en_catalogo()
+    fsync_original = os.fsync
+    llamadas = []
+
+    def fsync_que_falla(descriptor):
+        llamadas.append(descriptor)
+        if len(llamadas) == 2:                  # la primera es la del tamaño anotado; la segunda, la del CSV
+            raise OSError("disco lleno")
+        fsync_original(descriptor)
+    monkeypatch.setattr(os, "fsync", fsync_que_falla)
+
+    with pytest.raises(OSError):
+        gestion.importar_paises([{"NOMBRE": "Peru", "POBLACION": 1, "SUPERFICIE": 1, "CONTINENTE": "America"}])
+    monkeypatch.setattr(os, "fsync", fsync_original)
+
+    assert archivo_paises.read_bytes() == contenido
+    assert not os.path.exists(gestion._ruta_alta_pendiente())
+    assert _nombres_en_catalogo() == catalogo
+
+
+def test_alta_cortada_se_deshace_al_leer(archivo_paises):
+    # simula un corte a mitad de la escritura: quedó anotado el tamaño y una fila cortada
+    tamanio = os.path.getsize(archivo_paises)
+    with open(gestion._ruta_alta_pendiente(), mode="w", encoding=gestion.ENCODING) as pendiente:
+        pendiente.write(f"{os.stat(archivo_paises).st_ino},{tamanio}")
+    with open(archivo_paises, mode="ab") as archivo:
+        archivo.write(b"Peru,34000000,1285216,America\nItalia,590")
+
+    assert len(gestion.obtener_paises()) == 10
+    assert os.path.getsize(archivo_paises) == tamanio
+    assert not os.path.exists(gestion._ruta_alta_pendiente())
+
+
+def test_alta_sobre_archivo_sin_salto_de_linea_final(archivo_paises):
+    archivo_paises.write_bytes(archivo_paises.read_bytes().rstrip(b"\n"))   # editado a mano
+    gestion.agregar_pais_a_archivo("Peru", 34000000, 1285216, "America")
+    gestion.invalidar_catalogo()
+    assert _nombres_en_catalogo()[-2:] == ["Fiyi", "Peru"]
+
+
+def test_importar_desde_la_linea_de_comandos(archivo_paises, tmp_path, capsys):
+    assert gestion.main(["--importar", str(tmp_path / "no_existe.csv")]) == 2
+    assert "no se encontró" in capsys.readouterr().out
+
+    archivo_paises.write_text("NOMBRE,POBLACION,SUPERFICIE,CONTINENTE\nChile,muchos,1,America\n",
+                              encoding=gestion.ENCODING)
+    origen = tmp_path / "nuevos.csv"
+    origen.write_text("NOMBRE,POBLACION,SUPERFICIE,CONTINENTE\nPeru,1,1,America\n", encoding=gestion.ENCODING)
+    assert gestion.main(["--importar", str(origen)]) == 2         # catálogo con datos mal formateados
+    assert "No se pudo importar" in capsys.readouterr().out
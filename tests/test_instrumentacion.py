@@ -0,0 +1,67 @@
+# Pruebas de la instrumentación (métricas por función e histogramas).
+# ------------------------------------------------------------
+
+import time
+
+import pytest
+
+import GestionDatosPaises as gestion
+from GestionDatosPaises import buscar_pais   # referencia tomada antes de activar la instrumentación
+
+
+@pytest.fixture
+def instrumentacion(archivo_paises):
+    gestion._instrumentacion["metricas"].clear()
+    gestion.activar_instrumentacion()
+    yield gestion
+    gestion.desactivar_instrumentacion()
+    gestion._instrumentacion["metricas"].clear()
+
+
+def test_histogramas_se_llenan(instrumentacion, archivo_paises):
+    tamanio_inicial = archivo_paises.stat().st_size
+    paises = gestion.obtener_paises()
+    for nombre in ("Chile", "Japon", "Atlantida"):
+        buscar_pais(paises, nombre)
+    asiaticos = list(gestion.iterar_paises_desde_archivo(continente="Asia"))
+
+    metricas = gestion.metricas_instrumentacion()
+    assert metricas["buscar_pais"]["llamadas"] == 3
+    assert sum(metricas["buscar_pais"]["histograma_us"].values()) == 3
+    assert metricas["buscar_pais"]["filas"] == 2                  # "Atlantida" no existe
+    assert metricas["iterar_paises_desde_archivo"]["filas"] == len(asiaticos) == 2
+    assert metricas["_leer_paises"]["bytes"] == tamanio_inicial
+    for metrica in metricas.values():
+        assert metrica["segundos_minimo"] <= metrica["segundos_promedio"] <= metrica["segundos_maximo"]
+
+    gestion.agregar_pais_a_archivo("Peru", 34000000, 1285216, "America")
+    escritura = gestion.metricas_instrumentacion()["_agregar_paises_a_archivo"]
+    assert (escritura["llamadas"], escritura["filas"]) == (1, 1)
+    assert escritura["bytes"] == archivo_paises.stat().st_size - tamanio_inicial
+
+
+def test_desactivada_no_mide(archivo_paises):
+    gestion._instrumentacion["metricas"].clear()
+    buscar_pais(gestion.obtener_paises(), "Chile")
+    assert gestion.metricas_instrumentacion() == {}
+    assert gestion.buscar_pais.__name__ == "buscar_pais"
+
+
+def test_funciones_registradas():
+    assert gestion.FUNCIONES_INSTRUMENTADAS["buscar_pais"] == "consulta"
+    assert gestion.FUNCIONES_INSTRUMENTADAS["_registrar_cambio"] == "escritura"
+    assert gestion.FUNCIONES_INSTRUMENTADAS["iterar_paises_desde_archivo"] == "lectura"
+
+
+def test_listado_cuenta_los_paises_mostrados_sin_la_espera(instrumentacion, monkeypatch, capsys):
+    respuestas = iter(["", "q"])                # sigue en la primera página y corta en la segunda
+
+    def input_lento(mensaje=""):
+        time.sleep(0.05)                        # el usuario tarda en responder
+        return next(respuestas, "")
+    monkeypatch.setattr("builtins.input", input_lento)
+
+    gestion.mostrar_listado_paises(gestion.obtener_paises(), tamanio_pagina=4)
+    listado = gestion.metricas_instrumentacion()["mostrar_listado_paises"]
+    assert listado["filas"] == 8                    # dos páginas de 4; la tercera no se mostró
+    assert listado["segundos_total"] < 0.05         # las tres esperas pasaron por leer_teclado
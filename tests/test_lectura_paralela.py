@@ -0,0 +1,64 @@
+# Pruebas de la lectura en paralelo de archivos grandes.
+# ------------------------------------------------------------
+
+import pytest
+
+import GestionDatosPaises as gestion
+
+
+@pytest.fixture
+def archivo_grande(archivo_paises, monkeypatch):
+    """ Catálogo de varios miles de filas con tramos chicos, para que se reparta entre procesos. """
+    with open(archivo_paises, mode="w", encoding=gestion.ENCODING, newline="") as archivo:
+        archivo.write("NOMBRE,POBLACION,SUPERFICIE,CONTINENTE\n")
+        for numero in range(3000):
+            nombre = f'"Isla {numero}, Sur"' if numero % 7 == 0 else f"País {numero}"   # comillas y acentos
+            archivo.write(f"{nombre},{numero * 13 % 1000 + 1},{numero % 97 + 1},Oceania\n")
+    monkeypatch.setattr(gestion, "TAMANIO_MINIMO_TRAMO", 4096)
+    return archivo_paises
+
+
+def _leer_en_paralelo(monkeypatch, columnar=True, procesos=3):
+    monkeypatch.setattr(gestion, "UMBRAL_LECTURA_PARALELA", 0)
+    monkeypatch.setattr(gestion, "PROCESOS_LECTURA", procesos)
+    paises = gestion._leer_paises(columnar)
+    monkeypatch.setattr(gestion, "UMBRAL_LECTURA_PARALELA", float("inf"))   # vuelve a la lectura secuencial
+    return paises
+
+
+@pytest.fixture
+def sin_procesos(monkeypatch):
+    """ Hace fallar cualquier intento de repartir la lectura entre procesos. """
+    def falla(*args, **kwargs):
+        raise AssertionError("no debía leer en paralelo")
+    monkeypatch.setattr(gestion, "ProcessPoolExecutor", falla)
+
+
+def test_paralela_columnar_igual_que_secuencial(archivo_grande, monkeypatch):
+    secuencial = gestion._leer_paises(columnar=False)
+    assert len(secuencial) == 3000
+    paralela = _leer_en_paralelo(monkeypatch)
+    assert [dict(pais) for pais in paralela] == secuencial
+
+
+def test_diccionarios_siempre_en_un_proceso(archivo_grande, monkeypatch, sin_procesos):
+    secuencial = gestion._leer_paises(columnar=False)
+    assert _leer_en_paralelo(monkeypatch, columnar=False) == secuencial
+
+
+def test_un_solo_nucleo_lee_en_un_proceso(archivo_grande, monkeypatch, sin_procesos):
+    monkeypatch.setattr(gestion.os, "cpu_count", lambda: 1)
+    paises = _leer_en_paralelo(monkeypatch, procesos=None)
+    assert len(paises) == 3000
+
+
+def test_paralela_informa_la_misma_fila_con_error(archivo_grande, monkeypatch):
+    lineas = archivo_grande.read_text(encoding=gestion.ENCODING).split("\n")
+    lineas[2500] = "Roto,muchos,1,Oceania"
+    archivo_grande.write_text("\n".join(lineas), encoding=gestion.ENCODING)
+
+    with pytest.raises(ValueError) as secuencial:
+        gestion._leer_paises()
+    with pytest.raises(ValueError) as paralela:
+        _leer_en_paralelo(monkeypatch)
+    assert str(secuencial.value).split(":")[0] == str(paralela.value).split(":")[0] == "fila 2501"
@@ -0,0 +1,54 @@
+# Pruebas de primeros_paises (top-K y páginas) contra el ordenamiento completo.
+# ------------------------------------------------------------
+
+import random
+
+import GestionDatosPaises as gestion
+
+from tests.test_filtros import _escribir_catalogo_aleatorio
+
+
+def _pais_aleatorio(generador):
+    return {
+        gestion.COL_NOMBRE_PAIS: generador.choice([None, f"Pais {generador.randint(1, 30)}"]),
+        gestion.COL_POBLACION: generador.choice([None, generador.randint(1, 20)]),
+        gestion.COL_SUPERFICIE: generador.randint(1, 20),
+        gestion.COL_CONTINENTE: generador.choice(["America", "Europa", "Asia"]),
+    }
+
+
+def _criterios_aleatorios(generador):
+    columnas = generador.sample(gestion.COLUMNAS, generador.randint(1, 3))
+    return [(columna, generador.random() < 0.5) for columna in columnas]
+
+
+def test_primeros_paises_igual_que_orden_completo():
+    generador = random.Random(3)
+    for _ in range(500):
+        paises = [_pais_aleatorio(generador) for _ in range(generador.randint(0, 80))]
+        criterios = _criterios_aleatorios(generador)
+        desde = generador.randint(0, 90)
+        cantidad = generador.randint(0, 30)
+        esperado = gestion.ordenar_lista_paises(paises, criterios)[desde:desde + cantidad]
+        obtenido = gestion.primeros_paises(paises, criterios, cantidad, desde)
+        assert [id(pais) for pais in obtenido] == [id(pais) for pais in esperado], criterios
+
+
+def test_pagina_profunda_usa_orden_completo():
+    generador = random.Random(4)
+    paises = [_pais_aleatorio(generador) for _ in range(1000)]
+    criterios = [(gestion.COL_SUPERFICIE, True), (gestion.COL_POBLACION, False)]
+    for desde in (0, 50, 95, 500, 990):                # de montículo a orden completo
+        esperado = gestion.ordenar_lista_paises(paises, criterios)[desde:desde + 20]
+        assert gestion.primeros_paises(paises, criterios, 20, desde) == esperado
+
+
+def test_primeros_paises_con_indice_del_catalogo(archivo_paises):
+    _escribir_catalogo_aleatorio(archivo_paises, 300)
+    paises = gestion.obtener_paises()
+    for columna in gestion.COLUMNAS_NUMERICAS:
+        for desc in (False, True):
+            for desde in (0, 17, 290):
+                esperado = gestion.ordenar_lista_paises(paises, [(columna, desc)])[desde:desde + 25]
+                obtenido = gestion.primeros_paises(paises, [(columna, desc)], 25, desde)
+                assert [id(pais) for pais in obtenido] == [id(pais) for pais in esperado]
@@ -0,0 +1,51 @@
+# Pruebas del registro de cambios (*.cambios.log) y su recuperación tras un corte.
+# ------------------------------------------------------------
+
+import GestionDatosPaises as gestion
+
+
+def test_los_cambios_se_aplican_al_recargar(archivo_paises):
+    gestion.obtener_paises()
+    gestion.actualizar_pais("Chile", 20000000, 756102)
+    gestion.invalidar_catalogo()
+    chile = gestion.buscar_pais(gestion.obtener_paises(), "Chile")
+    assert chile[gestion.COL_POBLACION] == 20000000
+
+
+def test_registro_cortado_al_final_se_ignora(archivo_paises):
+    gestion.obtener_paises()
+    gestion.actualizar_pais("Chile", 20000000, 756102)
+    # simula un corte en medio de la escritura: el último registro quedó sin salto de línea
+    with open(gestion._ruta_registro_cambios(), mode="ab") as archivo:
+        archivo.write(b"Chile,12345678,27")
+
+    assert gestion._leer_registro_cambios() == {"chile": (20000000, 756102)}
+    gestion.invalidar_catalogo()
+    chile = gestion.buscar_pais(gestion.obtener_paises(), "Chile")
+    assert (chile[gestion.COL_POBLACION], chile[gestion.COL_SUPERFICIE]) == (20000000, 756102)
+
+
+def test_caracter_cortado_al_final_no_impide_leer(archivo_paises):
+    gestion.obtener_paises()
+    gestion.actualizar_pais("España", 49000000, 505990)
+    with open(gestion._ruta_registro_cambios(), mode="ab") as archivo:
+        archivo.write("España".encode(gestion.ENCODING)[:2])   # corte en medio de la "ñ"
+
+    assert gestion._leer_registro_cambios() == {"espana": (49000000, 505990)}
+
+
+def test_nuevo_cambio_despues_de_un_corte(archivo_paises):
+    gestion.obtener_paises()
+    gestion.actualizar_pais("Chile", 20000000, 756102)
+    with open(gestion._ruta_registro_cambios(), mode="ab") as archivo:
+        archivo.write(b"Chile,12345678,27")
+
+    gestion.actualizar_pais("Kenia", 55000000, 580367)    # se agrega sin pegarse al registro cortado
+    assert gestion._leer_registro_cambios() == {"chile": (20000000, 756102),
+                                                "kenia": (55000000, 580367)}
+
+
+def test_registro_de_otro_archivo_se_ignora(archivo_paises):
+    with open(gestion._ruta_registro_cambios(), mode="w", encoding=gestion.ENCODING) as archivo:
+        archivo.write("#INODO,0\r\nChile,1,1\r\n")
+    assert gestion._leer_registro_cambios() == {}
@@ -0,0 +1,74 @@
+# Pruebas del servidor HTTP/JSON (servidor_paises.py).
+# ------------------------------------------------------------
+
+import asyncio
+import json
+from http import HTTPStatus
+
+import GestionDatosPaises as gestion
+import servidor_paises as servidor
+
+
+def _respuesta(destino):
+    estado, cuerpo = servidor.responder(destino)
+    return estado, json.loads(cuerpo.decode(gestion.ENCODING))
+
+
+def test_busqueda_corta_sin_coincidencias(archivo_paises):
+    estado, datos = _respuesta("/paises?nombre=q")
+    assert estado == HTTPStatus.OK
+    assert datos["total"] == 0
+
+
+def test_busqueda_exacta_y_con_error_de_tipeo(archivo_paises):
+    _, exacta = _respuesta("/paises?nombre=Chile")
+    _, aproximada = _respuesta("/paises?nombre=Fracia")
+    assert [pais["NOMBRE"] for pais in exacta["paises"]] == ["Chile"]
+    assert [pais["NOMBRE"] for pais in aproximada["paises"]] == ["Francia"]
+
+
+def test_pais_por_nombre(archivo_paises):
+    estado, datos = _respuesta("/paises/Jap%C3%B3n")
+    assert (estado, datos["NOMBRE"]) == (HTTPStatus.OK, "Japón")
+    estado, datos = _respuesta("/paises/Atlantida")
+    assert estado == HTTPStatus.NOT_FOUND
+
+
+def test_parametros_invalidos(archivo_paises):
+    assert servidor.resolver("/paises", {"limite": "x"})[0] == HTTPStatus.BAD_REQUEST
+    assert servidor.resolver("/paises", {"orden": "CAPITAL"})[0] == HTTPStatus.BAD_REQUEST
+    assert servidor.resolver("/paises", {"poblacion_min": "9", "poblacion_max": "1"})[0] == HTTPStatus.BAD_REQUEST
+    assert servidor.resolver("/inexistente", {})[0] == HTTPStatus.NOT_FOUND
+
+
+async def _pedir(destinos):
+    """ Levanta el servidor en un puerto libre y envía los pedidos por una sola conexión. """
+    servicio = await asyncio.start_server(servidor.atender_conexion, "127.0.0.1", 0)
+    puerto = servicio.sockets[0].getsockname()[1]
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    respuestas = []
+    for destino in destinos:
+        escritor.write(f"GET {destino} HTTP/1.1\r\nHost: prueba\r\n\r\n".encode("latin-1"))
+        await escritor.drain()
+        estado = int((await lector.readline()).split()[1])
+        largo = 0
+        while (linea := await lector.readline()) not in (b"\r\n", b""):
+            nombre, _, valor = linea.decode("latin-1").partition(":")
+            if nombre.lower() == "content-length":
+                largo = int(valor)
+        respuestas.append((estado, json.loads(await lector.readexactly(largo))))
+    escritor.close()
+    await escritor.wait_closed()
+    servicio.close()
+    await servicio.wait_closed()
+    return respuestas
+
+
+def test_error_inesperado_responde_500_y_mantiene_la_conexion(archivo_paises, monkeypatch):
+    def falla():
+        raise OSError("no se puede leer el catálogo")
+    monkeypatch.setattr(gestion, "consultar_estadisticas", falla)
+
+    respuestas = asyncio.run(_pedir(["/estadisticas", "/paises?nombre=chile"]))
+    assert respuestas[0] == (500, {"error": "no se puede leer el catálogo"})
+    assert respuestas[1][0] == 200 and respuestas[1][1]["total"] == 1
@@ -0,0 +1,65 @@
+# Pruebas de la instantánea binaria (*.snapshot.bin) y de la carga sin índices.
+# ------------------------------------------------------------
+
+import os
+
+import GestionDatosPaises as gestion
+
+
+def _filas(paises):
+    return [dict(pais) for pais in paises]
+
+
+def test_instantanea_igual_al_csv(archivo_paises):
+    desde_csv = _filas(gestion.leer_paises_desde_archivo())
+    gestion.leer_paises_con_snapshot()              # crea la instantánea
+    assert _filas(gestion.cargar_snapshot()) == desde_csv
+
+
+def test_instantanea_danada_se_rechaza(archivo_paises):
+    gestion.leer_paises_con_snapshot()
+    ruta = gestion._ruta_snapshot()
+    with open(ruta, mode="r+b") as archivo:         # cambia un byte del contenido (no del encabezado)
+        archivo.seek(gestion.ENCABEZADO_SNAPSHOT.size + 3)
+        byte = archivo.read(1)
+        archivo.seek(-1, os.SEEK_CUR)
+        archivo.write(bytes([byte[0] ^ 0xFF]))
+
+    assert gestion.cargar_snapshot() is None
+    paises = gestion.leer_paises_con_snapshot()     # vuelve a leer el CSV y rehace la instantánea
+    assert _filas(paises) == _filas(gestion.leer_paises_desde_archivo())
+    assert gestion.cargar_snapshot() is not None
+
+
+def test_instantanea_truncada_se_rechaza(archivo_paises):
+    gestion.leer_paises_con_snapshot()
+    with open(gestion._ruta_snapshot(), mode="r+b") as archivo:
+        archivo.truncate(gestion.ENCABEZADO_SNAPSHOT.size - 1)
+    assert gestion.cargar_snapshot() is None
+
+
+def test_instantanea_vieja_se_rechaza(archivo_paises):
+    gestion.leer_paises_con_snapshot()
+    with open(archivo_paises, mode="a", encoding=gestion.ENCODING) as archivo:
+        archivo.write("Peru,34000000,1285216,America\n")
+    assert gestion.cargar_snapshot() is None
+
+
+def test_carga_desde_instantanea_no_construye_indices(archivo_paises, monkeypatch):
+    monkeypatch.setattr(gestion, "USAR_SNAPSHOT", True)
+    gestion.leer_paises_con_snapshot()
+    paises = gestion.obtener_paises()
+    assert all(gestion._catalogo[nombre] is None for nombre in gestion.INDICES_CATALOGO)
+
+    assert gestion.buscar_pais(paises, "japon")[gestion.COL_POBLACION] == 125000000
+    assert gestion._catalogo["indice_nombres"] is not None
+    assert gestion._catalogo["indices_ordenados"] is None
+
+
+def test_actualizar_sin_indices_construidos(archivo_paises, monkeypatch):
+    monkeypatch.setattr(gestion, "USAR_SNAPSHOT", True)
+    gestion.leer_paises_con_snapshot()
+    gestion.obtener_paises()
+    gestion.actualizar_pais("Fiyi", 950000, 18274)
+    fiyi = gestion.filtrar_paises_por_rangos(gestion.obtener_paises(), poblacion=(900001, 1000000))
+    assert [pais[gestion.COL_NOMBRE_PAIS] for pais in fiyi] == ["Fiyi"]
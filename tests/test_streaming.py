@@ -0,0 +1,83 @@
+# Pruebas de la lectura fila por fila (iterar_paises_desde_archivo, MODO_STREAMING)
+# y de los listados paginados.
+# ------------------------------------------------------------
+
+import random
+
+import GestionDatosPaises as gestion
+from tests.test_filtros import _escribir_catalogo_aleatorio, _rango_aleatorio
+
+
+def test_streaming_igual_que_en_memoria(archivo_paises):
+    _escribir_catalogo_aleatorio(archivo_paises, 400)
+    paises = gestion.obtener_paises()
+    generador = random.Random(6)
+    for _ in range(150):
+        poblacion = _rango_aleatorio(generador)
+        superficie = _rango_aleatorio(generador)
+        continente = generador.choice([None, "europa", "ASIA", "Antartida"])
+        esperado = gestion.filtrar_paises_por_rangos(paises, poblacion, superficie, continente)
+        obtenido = list(gestion.iterar_paises_desde_archivo(poblacion, superficie, continente))
+        assert obtenido == esperado
+
+
+def test_streaming_aplica_el_registro_de_cambios(archivo_paises):
+    gestion.actualizar_pais("Fiyi", 200000000, 18274)      # queda en el registro, no en el CSV
+    grandes = list(gestion.iterar_paises_desde_archivo(poblacion=(150000000, None)))
+    assert [pais[gestion.COL_NOMBRE_PAIS] for pais in grandes] == ["India", "Fiyi"]
+    assert grandes == gestion.filtrar_paises_por_rangos(gestion.obtener_paises(), poblacion=(150000000, None))
+
+
+def test_filtrar_catalogo_en_modo_streaming(archivo_paises, monkeypatch):
+    en_memoria = gestion.filtrar_catalogo(superficie=(500000, None), continente="Africa")
+    monkeypatch.setattr(gestion, "MODO_STREAMING", True)
+    resultado = gestion.filtrar_catalogo(superficie=(500000, None), continente="Africa")
+    assert not isinstance(resultado, list)                  # generador: no arma la lista completa
+    assert list(resultado) == en_memoria
+
+
+def test_streaming_no_incluye_filas_agregadas_durante_el_recorrido(archivo_paises):
+    recorrido = gestion.iterar_paises_desde_archivo()
+    primero = next(recorrido)
+    gestion.agregar_pais_a_archivo("Peru", 34000000, 1285216, "America")
+    resto = list(recorrido)
+    assert [primero] + resto == gestion.obtener_paises()[:10]
+
+
+def test_streaming_informa_datos_mal_formateados(archivo_paises, capsys):
+    with open(archivo_paises, mode="a", encoding=gestion.ENCODING) as archivo:
+        archivo.write("Peru,muchos,1285216,America\n")
+    assert len(list(gestion.iterar_paises_desde_archivo())) == 10
+    assert "Error de formato" in capsys.readouterr().out
+
+
+def test_recorrido_ordenado_igual_que_ordenar(archivo_paises):
+    _escribir_catalogo_aleatorio(archivo_paises, 300)
+    paises = gestion.obtener_paises()
+    for criterios in ([(gestion.COL_POBLACION, False)], [(gestion.COL_SUPERFICIE, True)],
+                      [(gestion.COL_NOMBRE_PAIS, True)],
+                      [(gestion.COL_CONTINENTE, False), (gestion.COL_POBLACION, True)]):
+        esperado = gestion.ordenar_lista_paises(list(paises), criterios)
+        assert list(gestion.iterar_catalogo_ordenado(criterios)) == esperado
+
+
+def test_listado_paginado_solo_consume_lo_que_muestra(archivo_paises, monkeypatch, capsys):
+    pedidos = []
+    monkeypatch.setattr("builtins.input", lambda mensaje="": pedidos.append(mensaje) or "q")
+    consumidos = []
+
+    def paises():
+        for pais in gestion.iterar_paises_desde_archivo():
+            consumidos.append(pais)
+            yield pais
+
+    assert gestion.mostrar_listado_paises(paises(), tamanio_pagina=3) == 3
+    assert len(consumidos) == 4                    # la página mostrada y el primero de la siguiente
+    assert len(pedidos) == 2                       # "ver más" y la pausa final
+
+
+def test_listado_no_pregunta_si_no_quedan_paises(archivo_paises, monkeypatch, capsys):
+    pedidos = []
+    monkeypatch.setattr("builtins.input", lambda mensaje="": pedidos.append(mensaje) or "")
+    assert gestion.mostrar_listado_paises(gestion.obtener_paises(), tamanio_pagina=5) == 10
+    assert len(pedidos) == 2                       # un "ver más" entre las dos páginas y la pausa final